@@ -0,0 +1 @@
+"""Alpha Station Kern - Daten-Engine ohne Streamlit-Abhängigkeit"""
@@ -0,0 +1,455 @@
+"""Claude-Analyse: Prompt-Bausteine mit Prompt-Caching + Streaming
+
+Statischer Teil (System-Prompt inkl. Markt-Expertise, Report-Vorlage inkl.
+Katalysatoren) steht vorne und endet mit einem Cache-Breakpoint - nur die
+Live-Daten dahinter ändern sich pro Report. Der Client wird übergeben, das
+Modul selbst braucht weder anthropic noch Streamlit.
+Bulk-Screening bewertet die ganze Trefferliste in wenigen Requests.
+"""
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from alpha_core.report_cache import fingerprint, get_report, put_report
+
+MODEL = "claude-sonnet-4-20250514"
+REPORT_MAX_TOKENS = 2500
+QUICK_MAX_TOKENS = 800
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# =============================================================================
+# STATISCHE PROMPT-TEILE (pro Markt)
+# =============================================================================
+KATALYSATOREN_TEXT = {
+    "Krypto": """6. KOMMENDE KATALYSATOREN (KRYPTO-SPEZIFISCH)
+   - Token Unlocks / Vesting Schedules (wann werden Tokens freigeschaltet?)
+   - Protokoll-Upgrades / Hard Forks / Soft Forks
+   - Mainnet Launches / Testnet Updates
+   - Halvings (bei PoW Coins)
+   - Token Burns / Buybacks
+   - Neue Exchange Listings
+   - Partnership Announcements
+   - Staking/Yield Änderungen
+   - Regulatorische Entwicklungen (ETF-Entscheidungen, Gesetzgebung)
+   - Makro: Fed-Entscheidungen, Risk-On/Risk-Off Sentiment
+   - Wann ist das nächste wichtige Datum für diesen Coin?""",
+    "Aktien": """6. KOMMENDE KATALYSATOREN (AKTIEN-SPEZIFISCH)
+   
+   EARNINGS & FINANCIALS:
+   - Nächster Earnings Report (Datum, Erwartungen)
+   - Guidance Updates
+   - Dividenden-Termine (Ex-Date, Payment Date)
+   - Aktienrückkauf-Programme
+   
+   SEKTOR-SPEZIFISCH:
+   
+   Biotech/Pharma:
+   - FDA-Entscheidungen (PDUFA Dates)
+   - Klinische Studien (Phase 1/2/3 Readouts)
+   - AdCom Meetings
+   - Patent-Abläufe
+   
+   Tech:
+   - Produkt-Launches
+   - Developer Conferences
+   - Nutzerzahlen / MAU Reports
+   
+   Retail:
+   - Same-Store-Sales Reports
+   - Holiday Season Performance
+   
+   Energie:
+   - OPEC Meetings
+   - Inventory Reports
+   
+   ALLGEMEIN:
+   - Insider-Käufe/Verkäufe
+   - Institutionelle Bewegungen (13F Filings)
+   - Analysten-Rating Änderungen
+   - Index-Aufnahmen/Entfernungen (S&P 500, etc.)
+   - Stock Splits
+   - Spin-Offs / M&A Gerüchte
+   
+   MAKRO:
+   - Fed Meetings / Zinsentscheidungen
+   - CPI / Inflationsdaten
+   - Arbeitsmarktdaten
+   
+   - Wann ist das nächste wichtige Datum für diese Aktie?""",
+}
+
+SYSTEM_EXTRA = {
+    "Krypto": """
+KRYPTO-EXPERTISE:
+- Du kennst typische Krypto-Katalysatoren: Halvings, Upgrades, Token Burns, Unlocks, Forks
+- Du weisst dass Krypto 24/7 handelt und volatiler ist
+- Du berücksichtigst On-Chain Metriken wenn relevant
+- Du kennst die wichtigsten Protokolle und deren Upgrade-Zyklen""",
+    "Aktien": """
+AKTIEN-EXPERTISE:
+- Du kennst Earnings-Zyklen und typische Reaktionen
+- Bei Biotech/Pharma kennst du FDA-Prozesse und klinische Studien-Phasen
+- Du weisst dass Pre-Market und After-Hours wichtig sind
+- Du berücksichtigst Sektor-Rotation und Marktbreite
+- Du kennst die Bedeutung von Insider-Transaktionen und institutionellem Ownership""",
+}
+
+SYSTEM_PROMPT = """Du bist ALPHA TERMINAL - ein präzises, professionelles Trading-Analyse-System mit Expertise in Fibonacci und Elliott Wave.
+
+DEINE EIGENSCHAFTEN:
+- Du lieferst messerscharfe, konkrete Analysen
+- Du nennst IMMER exakte Preise und Zahlen
+- Du bist Experte für Fibonacci Retracements und Extensions
+- Du kannst Elliott Waves identifizieren und Kursziele ableiten
+- Du bist direkt und ohne Umschweife
+- Du gibst klare Handlungsempfehlungen
+- Du recherchierst aus deinem Wissen bekannte Termine und Events
+{system_extra}
+
+FIBONACCI EXPERTISE:
+- Du kennst alle wichtigen Fib-Levels: 23.6%, 38.2%, 50%, 61.8%, 78.6%
+- Du kennst Fib-Extensions: 127.2%, 161.8%, 200%, 261.8%
+- Du weisst dass 61.8% das "Golden Ratio" ist und oft starke Reaktionen zeigt
+- Du nutzt Fib-Levels für Entry, Stop-Loss und Take-Profit
+
+ELLIOTT WAVE EXPERTISE:
+- Du kennst die 5-Wellen Impuls-Struktur (1-2-3-4-5)
+- Du kennst die 3-Wellen Korrektur-Struktur (A-B-C)
+- Welle 3 ist typischerweise die längste und stärkste
+- Welle 4 retraced typischerweise zum 38.2% Fib der Welle 3
+- Du gibst eine Einschätzung welche Welle gerade läuft
+
+FORMATIERUNG:
+- Nutze klare Überschriften
+- Nutze Bullet Points für Übersichtlichkeit
+- Hebe wichtige Zahlen hervor
+- Liste am Ende alle wichtigen Preise zum Einzeichnen auf
+
+VERBOTEN:
+- Keine Disclaimers über "keine Anlageberatung"
+- Keine Ausreden über fehlende Daten
+- Keine vagen Aussagen - immer konkret"""
+
+# Aufgaben + Zusammenfassung - Strategie/Datum stehen bei den Live-Daten, damit die Vorlage statisch bleibt
+REPORT_TEMPLATE = """ALPHA STATION PRO - VOLLSTÄNDIGER TRADING REPORT
+
+═══════════════════════════════════════════════════
+DEINE AUFGABEN (VOLLSTÄNDIGER REPORT):
+═══════════════════════════════════════════════════
+
+1. STRATEGIE-ANALYSE
+   - Bewerte das Setup für die Strategie aus den Live-Daten (STRATEGIE)
+   - Passt das Asset zur gewählten Strategie? Warum/warum nicht?
+
+2. FIBONACCI-ANALYSE
+   - Analysiere die gegebenen Fibonacci-Levels
+   - Wo steht der Preis im Verhältnis zu den Fib-Levels?
+   - Welches Fib-Level ist das wichtigste für diesen Trade?
+   - Bei welchem Fib-Level erwarten wir Reaktion?
+   - Gib konkrete Preise an: "Fib 61.8% bei $XX ist Key-Level"
+
+3. KONSOLIDIERUNGSZONEN-ANALYSE
+   - Analysiere die High-Activity Zonen wo viel gehandelt wurde
+   - Liegt der aktuelle Preis in/nahe einer Konsolidierungszone?
+   - Welche Zone ist am wichtigsten als S/R?
+   - Erkläre warum diese Zonen als Support/Resistance fungieren können
+   - Beispiel: "Zone $1.78-$1.92 war 40% der Zeit aktiv = starke Support-Zone"
+
+4. ELLIOTT WAVE ANALYSE
+   - In welcher Elliott Wave befinden wir uns wahrscheinlich?
+   - Welle 1, 2, 3, 4 oder 5 (Impuls) oder A, B, C (Korrektur)?
+   - Begründe deine Einschätzung basierend auf der Preisbewegung
+   - Was ist das wahrscheinliche Kursziel basierend auf Elliott Wave?
+   - Beispiel: "Wir sind in Welle 3, typisches Ziel ist 161.8% Extension bei $XX"
+
+5. ENTRY-STRATEGIE
+   - Exakter Einstiegspunkt (Preis)
+   - Entry-Typ: Market Order / Limit Order / Stop-Entry?
+   - Optimaler Einstiegszeitpunkt (sofort, bei Pullback, bei Breakout?)
+   - Nutze Fibonacci-Level oder Konsolidierungszone für Entry
+
+6. STOP-LOSS & TAKE-PROFIT (MIT FIBONACCI + ZONEN)
+   - Stop-Loss: Unter welchem Fib-Level oder welcher Zone? Konkreter Preis
+   - Take-Profit 1: Welches Fib-Level oder Zone? Konkreter Preis
+   - Take-Profit 2: Welches Fib-Extension Level? Konkreter Preis
+   - Risk/Reward Ratio
+
+7. NEWS & SENTIMENT
+   - Analyse der aktuellen News (falls vorhanden)
+   - Sentiment-Einschätzung: Bullish / Bearish / Neutral
+
+{katalysatoren_text}
+
+9. RISIKO-FAKTOREN
+   - Was könnte schiefgehen?
+   - Welche Warnsignale gibt es?
+   - Sektor-spezifische Risiken
+
+10. FINAL VERDICT
+   - Rating: X/100
+   - Empfehlung: STRONG LONG / LONG / ABWARTEN / SHORT / STRONG SHORT
+   - Konfidenz: Hoch / Mittel / Niedrig
+   - Positionsgröße-Empfehlung: Klein (1-2%) / Normal (2-5%) / Aggressiv (5-10%)
+   - Zeithorizont: Intraday / Swing (Tage) / Position (Wochen)
+
+═══════════════════════════════════════════════════
+ZUSAMMENFASSUNG ZUM EINZEICHNEN:
+Am Ende liste diese Levels klar auf, damit der User sie im Chart einzeichnen kann:
+- Entry: $XX
+- Stop-Loss: $XX
+- TP1: $XX (Fib XX%)
+- TP2: $XX (Fib XX%)
+- Key Fib Levels: $XX (23.6%), $XX (38.2%), $XX (50%), $XX (61.8%), $XX (78.6%)
+═══════════════════════════════════════════════════
+
+REGELN: Keine Disclaimers, keine Ausreden, keine Höflichkeitsfloskeln.
+Du bist ein Trading-Terminal. Die Daten sind Fakten. Liefere konkrete Zahlen.
+═══════════════════════════════════════════════════"""
+
+QUICK_SYSTEM_PROMPT = "Du bist ein präzises Trading-Terminal. Kurz und knackig."
+
+
+# =============================================================================
+# DYNAMISCHE PROMPT-TEILE
+# =============================================================================
+def build_sr_text(sr, fib):
+    """S/R + Fibonacci + Konsolidierungszonen als Prompt-Abschnitt"""
+    sr_text = f"""
+SUPPORT & RESISTANCE (aus Swing Highs/Lows + Fibonacci):
+Support-Zonen: {', '.join([f'${s}' for s in sr['support']])}
+Resistance-Zonen: {', '.join([f'${r}' for r in sr['resistance']])}
+"""
+
+    # Fibonacci Details hinzufügen wenn vorhanden
+    if fib:
+        sr_text += f"""
+FIBONACCI LEVELS (basierend auf Periode High/Low):
+• Periode High: ${fib.get('period_high', 'N/A')}
+• Periode Low: ${fib.get('period_low', 'N/A')}
+• Fib 23.6%: ${fib.get('fib_236', 'N/A')}
+• Fib 38.2%: ${fib.get('fib_382', 'N/A')}
+• Fib 50.0%: ${fib.get('fib_500', 'N/A')}
+• Fib 61.8% (Golden Ratio): ${fib.get('fib_618', 'N/A')}
+• Fib 78.6%: ${fib.get('fib_786', 'N/A')}
+• Fib Extension 127.2%: ${fib.get('fib_1272', 'N/A')}
+• Fib Extension 161.8%: ${fib.get('fib_1618', 'N/A')}
+"""
+
+        # Konsolidierungszonen hinzufügen
+        if fib.get('consolidation_zones'):
+            sr_text += f"""
+KONSOLIDIERUNGSZONEN (High Activity - wo viel gehandelt wurde):
+"""
+            for i, zone in enumerate(fib['consolidation_zones'], 1):
+                sr_text += f"• Zone {i}: ${zone['low']} - ${zone['high']} ({zone['days']} Kerzen = {zone['pct_time']}% der Zeit)\n"
+            sr_text += """
+Diese Zonen sind wichtig weil:
+- Viele Orders/Positionen wurden hier eröffnet
+- Oft fungieren sie als Support/Resistance
+- Preis tendiert dazu, in diese Zonen zurückzukehren
+"""
+    return sr_text
+
+
+def build_report_data(d, market_type, strategy, sr_text, news_txt, current_date=None):
+    """Live-Daten-Block des Reports (der einzige Teil, der sich pro Aufruf ändert)"""
+    asset_name = d.get('Name', d['Ticker'])
+    current_date = current_date or datetime.now().strftime("%d.%m.%Y")
+    return f"""═══════════════════════════════════════════════════
+ASSET: {d['Ticker']} ({asset_name})
+MARKT: {market_type}
+DATUM: {current_date}
+STRATEGIE: {strategy}
+═══════════════════════════════════════════════════
+
+LIVE-DATEN:
+• Aktueller Preis: ${d['Preis']}
+• 24h Änderung: {d['Chg%']}%
+• RVOL (Volumen-Ratio): {d['RVOL']}x
+• Close Position: {d.get('ClosePos', 0.5)} (0=Tagestief, 1=Tageshoch)
+• Alpha-Score: {d['Alpha']}
+
+{sr_text}
+
+AKTUELLE NEWS:
+{news_txt}"""
+
+
+def build_report_request(d, market_type, strategy, sr_text, news_txt):
+    """System-Blöcke + Messages für den vollständigen Report (statischer Präfix gecacht)"""
+    system = [{"type": "text", "text": SYSTEM_PROMPT.format(system_extra=SYSTEM_EXTRA[market_type])}]
+    template = REPORT_TEMPLATE.format(katalysatoren_text=KATALYSATOREN_TEXT[market_type])
+    content = [
+        # Breakpoint am Ende der Vorlage cacht System-Prompt + Vorlage zusammen
+        {"type": "text", "text": template, "cache_control": CACHE_CONTROL},
+        {"type": "text", "text": build_report_data(d, market_type, strategy, sr_text, news_txt)},
+    ]
+    return system, [{"role": "user", "content": content}]
+
+
+def build_quick_request(result, market_type):
+    """System + Messages für die Schnell-Analyse im Such-Tab"""
+    prompt = f"""SCHNELL-ANALYSE für {result['Ticker']}
+
+DATEN:
+- Preis: ${result['Preis']}
+- 24h Change: {result['Chg%']}%
+- RVOL: {result['RVOL']}x
+- Alpha-Score: {result['Alpha']}
+- Markt: {market_type}
+
+AUFGABEN:
+1. Kurze technische Einschätzung (2-3 Sätze)
+2. Key Support & Resistance Levels
+3. Empfehlung: LONG / SHORT / ABWARTEN
+4. Rating: X/100
+
+Keine Disclaimers. Direkt und knapp."""
+    return QUICK_SYSTEM_PROMPT, [{"role": "user", "content": prompt}]
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+def stream_analysis(client, system, messages, max_tokens=REPORT_MAX_TOKENS, on_done=None):
+    """Liefert den Antworttext stückweise; on_done(final_message) danach (z.B. für Usage/Cache-Treffer)"""
+    with client.messages.stream(model=MODEL, max_tokens=max_tokens, system=system, messages=messages) as stream:
+        for text in stream.text_stream:
+            yield text
+        if on_done is not None:
+            on_done(stream.get_final_message())
+
+
+# =============================================================================
+# BULK-SCREENING (GANZE TREFFERLISTE)
+# =============================================================================
+SCREEN_CHUNK_SIZE = 25   # Zeilen pro Request
+SCREEN_WORKERS = 4       # parallele Requests
+SCREEN_COLUMNS = ["Ticker", "CoinID", "Preis", "Chg%", "RVOL", "Vortag%", "ClosePos", "Alpha", "Gap%", "S-Dist%", "R-Dist%"]
+
+SCREEN_SYSTEM_PROMPT = """Du bist ALPHA TERMINAL im Screening-Modus. Du bewertest viele Scan-Treffer auf einmal.
+
+EINGABE: Eine Tabelle (Pipe-getrennt) mit Live-Daten pro Ticker:
+- Preis, Chg% (Tagesänderung), RVOL (Volumen-Ratio), Vortag% (Vortagesänderung)
+- ClosePos (0=Tagestief, 1=Tageshoch), Alpha (Scanner-Score), Gap%
+- S-Dist% / R-Dist%: Abstand zum nächsten Support / zur nächsten Resistance (leer = unbekannt)
+- CoinID (nur Krypto): eindeutige ID - mehrere Coins können dasselbe Ticker-Symbol haben
+
+AUFGABE:
+- Bewerte jeden Ticker für die angegebene Strategie mit einem Score 0-100
+- Verdict: STRONG LONG / LONG / ABWARTEN / SHORT / STRONG SHORT
+- Note: max. 12 Wörter Begründung (z.B. "RVOL 4x, Close am Hoch, 2% bis Resistance")
+
+AUSGABE: NUR ein JSON-Array, ein Objekt pro Ticker, keine weiteren Worte:
+[{"ticker": "XYZ", "id": "xyz-coin", "score": 75, "verdict": "LONG", "note": "..."}]
+"id" = Wert der Spalte CoinID (ohne CoinID-Spalte weglassen).
+
+REGELN: Jede Zeile der Eingabe genau einmal. Keine Disclaimers. Konkrete Zahlen in der Note."""
+
+
+def _screen_value(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def build_screen_request(rows, market_type, strategy):
+    """System + Messages für einen Screening-Chunk (System-Prompt gecacht)"""
+    columns = [c for c in SCREEN_COLUMNS if any(c in row for row in rows)]
+    table = "\n".join(
+        ["|".join(columns)] + ["|".join(_screen_value(row.get(c)) for c in columns) for row in rows]
+    )
+    system = [{"type": "text", "text": SCREEN_SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}]
+    prompt = f"MARKT: {market_type}\nSTRATEGIE: {strategy}\n\n{table}"
+    return system, [{"role": "user", "content": prompt}]
+
+
+def screen_key(row):
+    """Schlüssel einer Zeile für das Screening: CoinID bei Krypto, sonst Ticker"""
+    return row.get("CoinID") or str(row.get("Ticker", "")).upper()
+
+
+def parse_screening(text):
+    """JSON-Array aus der Antwort -> {CoinID oder Ticker: {"AI-Score", "AI-Verdict", "AI-Note"}}"""
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+
+    screening = {}
+    for item in items:
+        if not isinstance(item, dict) or not (item.get("ticker") or item.get("id")):
+            continue
+        try:
+            score = float(item.get("score"))
+        except (TypeError, ValueError):
+            score = None
+        key = str(item["id"]) if item.get("id") else str(item["ticker"]).upper()
+        screening[key] = {
+            "AI-Score": score,
+            "AI-Verdict": str(item.get("verdict", "")).upper(),
+            "AI-Note": str(item.get("note", "")),
+        }
+    return screening
+
+
+def _screen_chunk(client, rows, market_type, strategy):
+    """Ein Chunk - identische Zeilen kommen aus dem Report-Cache"""
+    compact = [{c: row.get(c) for c in SCREEN_COLUMNS if c in row} for row in rows]
+    fp = fingerprint("screen", None, market_type, None, strategy, extra=compact)
+    cached = get_report(fp)
+    if cached:
+        return parse_screening(cached["text"])
+
+    system, messages = build_screen_request(rows, market_type, strategy)
+    message = client.messages.create(
+        model=MODEL, max_tokens=200 + 60 * len(rows), system=system, messages=messages
+    )
+    text = "".join(block.text for block in message.content if getattr(block, "type", "") == "text")
+    screening = parse_screening(text)
+    if screening:
+        put_report(fp, text, "screen", None, market_type, strategy=strategy)
+    return screening
+
+
+def screen_results(client, rows, market_type, strategy, chunk_size=SCREEN_CHUNK_SIZE,
+                   max_workers=SCREEN_WORKERS, on_progress=None):
+    """Bewertet die ganze Trefferliste in Chunks, max_workers Requests gleichzeitig
+
+    on_progress(done_chunks, total_chunks) nach jedem fertigen Chunk.
+    Fehlgeschlagene Chunks werden übersprungen (Ticker bleiben ohne AI-Score).
+    """
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    screening = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_screen_chunk, client, chunk, market_type, strategy) for chunk in chunks]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                screening.update(future.result())
+            except Exception:
+                pass
+            if on_progress is not None:
+                on_progress(done, len(chunks))
+    return screening
+
+
+def merge_screening(rows, screening):
+    """Hängt AI-Score/Verdict/Note an die Scan-Ergebnisse, sortiert nach AI-Score
+
+    Krypto über die CoinID; fehlt die ID in der Antwort, zählt der Ticker nur,
+    wenn er in der Liste eindeutig ist (sonst bekämen gleichnamige Coins dieselbe Bewertung).
+    """
+    ticker_count = Counter(str(row.get("Ticker", "")).upper() for row in rows)
+    merged = []
+    for row in rows:
+        ticker = str(row.get("Ticker", "")).upper()
+        found = screening.get(screen_key(row))
+        if found is None and row.get("CoinID") and ticker_count[ticker] == 1:
+            found = screening.get(ticker)
+        merged.append({**row, **(found or {})})
+    return sorted(merged, key=lambda r: r.get("AI-Score") if r.get("AI-Score") is not None else -1, reverse=True)
@@ -0,0 +1,306 @@
+"""Backtest der STRATEGIES über den lokalen Tageskerzen-Verlauf (alpha_core.history)
+
+    python -m alpha_core.backtest                                  # alle Range-Strategien, alle Aktien
+    python -m alpha_core.backtest --strategy "Bull Flag" --horizons 1,5,20 --start 2024-01-01
+    python -m alpha_core.backtest --symbols AAPL,MSFT,NVDA --workers 1 --out backtest.csv
+    python -m alpha_core.backtest --backfill 2015-01-01 --start 2016-01-01   # Verlauf vorher nachladen
+
+Jede Kerze wird wie ein Snapshot zum Tagesschluss behandelt: Tag = day, Kerze davor =
+prevDay. Die Kennzahlen (Change %, Vortag %, RVOL, Gap %, Wicks, Close Position) kommen
+aus derselben Funktion wie im Live-Scan (stock_metrics_from_raw), die Filter aus
+compile_filters/filter_mask - ein Backtest-Treffer ist genau ein Scan-Treffer von damals.
+Einstieg zum Schlusskurs des Signaltags, Forward-Return nach h Kerzen.
+
+Alle Symbole eines Blocks liegen hintereinander in einem Array (Kerzen + Symbol-Nummer),
+Vortag und Forward-Returns sind verschobene Spalten innerhalb desselben Symbols - keine
+Schleife über Tage oder Symbole. Blöcke laufen parallel in Worker-Prozessen, jeder liest
+seine Dateien selbst (memory-mapped); zurück kommen nur die Returns der Treffer.
+
+Kerzen ohne Volumen (Krypto-Verlauf von CoinGecko /ohlc) werden übersprungen: RVOL wäre
+nicht definiert. Praktisch deckt der Backtest damit den Aktien-Verlauf ab.
+
+Der Scanner füllt den Verlauf nur STOCK_BACKFILL_DAYS zurück; längere Zeiträume lädt
+--backfill vorher von Polygon nach.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from alpha_core.cli import EXIT_EMPTY, EXIT_ERROR, EXIT_OK, EXIT_USAGE
+from alpha_core.filters import compile_filters, filter_mask
+from alpha_core.history import COLUMNS, HISTORY_DIR, STOCK_INTERVAL, read_history, top_up_stock
+from alpha_core.metrics import stock_metrics_from_raw
+from alpha_core.scan import range_strategies
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS
+
+HORIZONS = (1, 3, 5, 10)
+CHUNK_SYMBOLS = 500     # Symbole pro Worker-Block (~375k Kerzen bei 3 Jahren)
+BACKFILL_WORKERS = 8    # parallele Polygon-Abrufe beim Backfill
+SUMMARY_COLUMNS = ["Strategie", "Horizont", "Signale", "Symbole", "Ø %", "Median %", "Trefferquote %",
+                   "Baseline Ø %", "Edge %"]
+
+
+# =============================================================================
+# DATEN
+# =============================================================================
+def available_symbols(market="Aktien", interval=STOCK_INTERVAL):
+    """Alle Symbole mit lokalem Verlauf (Dateinamen ohne .f64)"""
+    directory = os.path.join(HISTORY_DIR, market, interval)
+    try:
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".f64"))
+    except OSError:
+        return []
+
+
+def backfill(symbols, since, poly_key, workers=BACKFILL_WORKERS):
+    """Tageskerzen der Symbole ab since (date oder "YYYY-MM-DD") nachladen -> (aufgefüllt, Fehler)
+
+    Symbole, deren Verlauf schon bis since zurückreicht, kosten keinen Abruf.
+    """
+    if isinstance(since, str):
+        since = datetime.strptime(since, "%Y-%m-%d").date()
+
+    def fill(symbol):
+        try:
+            return bool(top_up_stock(symbol, poly_key, since=since))
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fill, symbols))
+    return sum(r is True for r in results), sum(r is None for r in results)
+
+
+def load_panel(symbols, market="Aktien", interval=STOCK_INTERVAL, start_ms=None):
+    """Verlauf mehrerer Symbole hintereinander -> (Symbol-Nummer pro Kerze, (n, 6)-Kerzen)"""
+    parts, codes = [], []
+    for code, symbol in enumerate(symbols):
+        candles = read_history(market, symbol, interval, start_ms)
+        if len(candles):
+            parts.append(np.asarray(candles))
+            codes.append(np.full(len(candles), code, dtype=np.int32))
+    if not parts:
+        return np.empty(0, dtype=np.int32), np.empty((0, len(COLUMNS)))
+    return np.concatenate(codes), np.concatenate(parts)
+
+
+# =============================================================================
+# KENNZAHLEN + RETURNS
+# =============================================================================
+def _shift(values, sym, k):
+    """values[i + k] innerhalb desselben Symbols, sonst NaN (k > 0: Zukunft, k < 0: Vergangenheit)"""
+    out = np.full(len(values), np.nan)
+    if k > 0 and k < len(values):
+        same = sym[k:] == sym[:-k]
+        out[:-k] = np.where(same, values[k:], np.nan)
+    elif k < 0 and -k < len(values):
+        same = sym[:k] == sym[-k:]
+        out[-k:] = np.where(same, values[:k], np.nan)
+    return out
+
+
+def panel_metrics(sym, candles):
+    """Kennzahlen pro Kerze wie im Live-Scan -> (DataFrame, Maske gültiger Signaltage)
+
+    Gültig: Vortags-Kerze vorhanden, Volumen an beiden Tagen, alle Kennzahlen endlich.
+    """
+    t, o, h, l, c, v = candles.T
+    prev = [_shift(col, sym, -1) for col in (o, h, l, c, v)]
+    zeros = np.zeros(len(sym))
+    # Spalten wie _flatten_stock: day, prevDay, lastTrade/min (leer), todaysChangePerc (aus prevDay)
+    raw = np.column_stack([o, h, l, c, v] + [np.nan_to_num(p) for p in prev] + [zeros, zeros, zeros, np.full(len(sym), np.nan)])
+    metrics = stock_metrics_from_raw(sym, raw)
+
+    values = metrics.drop(columns="Ticker").to_numpy()
+    valid = np.isfinite(values).all(axis=1) & (metrics["Preis"].to_numpy() > 0)
+    valid &= np.isfinite(prev[3]) & (prev[3] > 0) & (v > 0) & (prev[4] > 0)
+    return metrics, valid
+
+
+def forward_returns(sym, close, horizons=HORIZONS):
+    """Return in % vom Schlusskurs nach h Kerzen desselben Symbols -> (n, len(horizons))"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.column_stack([(_shift(close, sym, h) / close - 1) * 100 for h in horizons])
+
+
+# =============================================================================
+# AUSWERTUNG
+# =============================================================================
+def evaluate_panel(sym, candles, strategies, horizons=HORIZONS, additional_filters=DEFAULT_ADDITIONAL_FILTERS,
+                   start_ms=None, end_ms=None):
+    """Ein Block -> Teilergebnis {"bars", "baseline": (n, Summe) pro Horizont, "signals": {Name: (Symbole, Returns)}}"""
+    metrics, valid = panel_metrics(sym, candles)
+    if start_ms is not None:
+        valid &= candles[:, 0] >= start_ms
+    if end_ms is not None:
+        valid &= candles[:, 0] < end_ms  # exklusiv: Beginn des Tages nach dem letzten Signaltag
+    returns = forward_returns(sym, candles[:, 4], horizons)
+
+    base = returns[valid]
+    finite = np.isfinite(base)
+    partial = {
+        "bars": int(valid.sum()),
+        "baseline": (finite.sum(axis=0), np.where(finite, base, 0).sum(axis=0)),
+        "signals": {},
+    }
+    for name, filters in strategies.items():
+        match = valid & filter_mask(metrics, compile_filters(filters, additional_filters))
+        partial["signals"][name] = (sym[match], returns[match])
+    return partial
+
+
+def _run_chunk(job):
+    sym, candles = load_panel(job["symbols"], job["market"], job["interval"], job["load_ms"])
+    partial = evaluate_panel(sym, candles, job["strategies"], job["horizons"], job["additional_filters"],
+                             job["start_ms"], job["end_ms"])
+    # Symbol-Nummern des Blocks -> Namen (nur für die Anzahl verschiedener Symbole gebraucht)
+    names = np.asarray(job["symbols"], dtype=object)
+    partial["signals"] = {n: (names[s], r) for n, (s, r) in partial["signals"].items()}
+    return partial
+
+
+def summarize(partials, strategies, horizons=HORIZONS):
+    """Teilergebnisse zusammenführen -> eine Zeile pro (Strategie, Horizont)"""
+    count = sum(p["baseline"][0] for p in partials)
+    total = sum(p["baseline"][1] for p in partials)
+    base_mean = np.divide(total, count, out=np.full(len(horizons), np.nan), where=np.asarray(count) > 0)
+
+    rows = []
+    for name in strategies:
+        symbols = np.concatenate([p["signals"][name][0] for p in partials]) if partials else np.empty(0)
+        returns = np.concatenate([p["signals"][name][1] for p in partials]) if partials else np.empty((0, len(horizons)))
+        for j, horizon in enumerate(horizons):
+            r = returns[:, j]
+            keep = np.isfinite(r)
+            r = r[keep]
+            mean = float(r.mean()) if len(r) else np.nan
+            rows.append({
+                "Strategie": name,
+                "Horizont": horizon,
+                "Signale": int(len(r)),
+                "Symbole": int(len(set(symbols[keep]))),
+                "Ø %": round(mean, 3),
+                "Median %": round(float(np.median(r)), 3) if len(r) else np.nan,
+                "Trefferquote %": round(float((r > 0).mean()) * 100, 1) if len(r) else np.nan,
+                "Baseline Ø %": round(float(base_mean[j]), 3),
+                "Edge %": round(mean - float(base_mean[j]), 3),
+            })
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def run_backtest(strategies=None, symbols=None, market="Aktien", interval=STOCK_INTERVAL, horizons=HORIZONS,
+                 additional_filters=DEFAULT_ADDITIONAL_FILTERS, start=None, end=None, workers=None,
+                 chunk_size=CHUNK_SYMBOLS):
+    """Backtest über den lokalen Verlauf -> (Zusammenfassung, Anzahl ausgewerteter Kerzen)
+
+    strategies: {Name: Filter} (Standard: alle Range-Strategien des Marktes)
+    symbols: Standard alle Symbole mit Verlauf; start/end: date, datetime oder "YYYY-MM-DD" (Signaltage in UTC, end inklusive)
+    workers: Prozesse (1 = im aktuellen Prozess, None = CPU-Anzahl)
+    """
+    strategies = strategies or range_strategies(market)
+    symbols = symbols or available_symbols(market, interval)
+    start_ms, end_ms = _to_ms(start), _to_ms(end, end=True)
+    # Ein paar Kerzen vor start laden, damit der erste Signaltag einen Vortag hat
+    load_ms = start_ms - 7 * 24 * 60 * 60 * 1000 if start_ms is not None else None
+
+    jobs = [
+        {"symbols": symbols[i:i + chunk_size], "market": market, "interval": interval, "load_ms": load_ms,
+         "strategies": strategies, "horizons": tuple(horizons), "additional_filters": additional_filters,
+         "start_ms": start_ms, "end_ms": end_ms}
+        for i in range(0, len(symbols), chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        partials = [_run_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_chunk, jobs))
+    return summarize(partials, strategies, horizons), sum(p["bars"] for p in partials)
+
+
+def _to_ms(value, end=False):
+    """Grenze in ms (UTC) - Tage ("YYYY-MM-DD"/date) zählen ganz, end ist exklusiv
+
+    Polygon stempelt Tageskerzen auf Mitternacht New York (04:00/05:00 UTC desselben
+    Tages) - jede Kerze liegt damit im UTC-Tag ihres Handelstags. Ein Tag als end ->
+    Beginn des folgenden UTC-Tags, sonst fiele der letzte Signaltag heraus; lokale
+    Zeitzonen spielen keine Rolle. Naive datetimes gelten als UTC.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d").date()
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day, tzinfo=timezone.utc) + timedelta(days=1 if end else 0)
+        return value.timestamp() * 1000
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp() * 1000 + (1 if end else 0)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m alpha_core.backtest")
+    parser.add_argument("--strategy", action="append", metavar="NAME", help="Strategie (mehrfach möglich, Standard: alle)")
+    parser.add_argument("--symbols", help="Kommagetrennte Ticker (Standard: alle mit lokalem Verlauf)")
+    parser.add_argument("--horizons", default=",".join(map(str, HORIZONS)), help="Forward-Horizonte in Kerzen")
+    parser.add_argument("--start", help="Erster Signaltag YYYY-MM-DD")
+    parser.add_argument("--end", help="Letzter Signaltag YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=None, help="Prozesse (Standard: CPU-Anzahl)")
+    parser.add_argument("--out", help="Zusammenfassung als CSV schreiben")
+    parser.add_argument("--backfill", metavar="YYYY-MM-DD",
+                        help="Vorher Tageskerzen ab diesem Tag von Polygon nachladen (--symbols bzw. alle mit Verlauf)")
+    parser.add_argument("--poly-key", default=os.environ.get("POLYGON_KEY"), help="Polygon-Key für --backfill")
+    args = parser.parse_args(argv)
+
+    strategies = range_strategies("Aktien")
+    if args.strategy:
+        unknown = [n for n in args.strategy if n not in strategies]
+        if unknown:
+            print(f"Unbekannte Strategie: {', '.join(unknown)}", file=sys.stderr)
+            return EXIT_USAGE
+        strategies = {n: strategies[n] for n in args.strategy}
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] if args.symbols else None
+    horizons = [int(h) for h in args.horizons.split(",") if h.strip()]
+
+    if args.backfill:
+        try:
+            since = datetime.strptime(args.backfill, "%Y-%m-%d").date()
+        except ValueError:
+            print(f"Ungültiges Datum für --backfill: {args.backfill}", file=sys.stderr)
+            return EXIT_USAGE
+        if not args.poly_key:
+            print("--backfill braucht --poly-key oder POLYGON_KEY", file=sys.stderr)
+            return EXIT_USAGE
+        universe = symbols or available_symbols()
+        if not universe:
+            print(f"Keine Symbole für --backfill (--symbols angeben oder Verlauf in {HISTORY_DIR})", file=sys.stderr)
+            return EXIT_USAGE
+        filled, failed = backfill(universe, since, args.poly_key)
+        print(f"Backfill ab {since}: {filled}/{len(universe)} Symbole aufgefüllt, {failed} Fehler", file=sys.stderr)
+        if failed == len(universe):
+            return EXIT_ERROR
+
+    summary, bars = run_backtest(strategies, symbols, horizons=horizons, start=args.start, end=args.end,
+                                 workers=args.workers)
+    if not bars:
+        print(f"Kein lokaler Verlauf in {HISTORY_DIR}", file=sys.stderr)
+        return EXIT_EMPTY
+    print(f"{bars:,} Signaltage ausgewertet", file=sys.stderr)
+    if args.out:
+        summary.to_csv(args.out, index=False)
+        print(args.out)
+    else:
+        print(summary.to_string(index=False))
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Headless-Scan für Cron und Pipelines: python -m alpha_core ...
+
+    python -m alpha_core --market Krypto --strategy "Volume Surge"
+    python -m alpha_core --market Aktien --all --format parquet --out /data/scans
+    python -m alpha_core --list
+
+Eine Datei pro Lauf (<out>/scan_<markt>_<zeit>.jsonl|parquet), eine Zeile pro Treffer
+mit Spalten Strategie, Markt, Scan-Zeit. Der Pfad geht auf stdout, Zusammenfassung und
+Fehler auf stderr. Streamlit, plotly und anthropic werden nie geladen; numpy/pandas
+und die Engine erst nach dem Parsen der Argumente.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from alpha_core.strategies import INSIDER_STRATEGIES, STRATEGIES, supports_market
+
+OUTPUT_DIR = os.environ.get("ALPHA_OUTPUT_DIR", "scans")
+FORMATS = ["jsonl", "parquet"]
+MARKETS = {"krypto": "Krypto", "crypto": "Krypto", "aktien": "Aktien", "stocks": "Aktien"}
+
+# Exit-Codes
+EXIT_OK = 0
+EXIT_ERROR = 1          # API-/Laufzeitfehler
+EXIT_USAGE = 2          # Falsche Argumente, fehlender/ungültiger Key (401/403), fehlendes Paket (argparse nutzt ebenfalls 2)
+EXIT_RATE_LIMITED = 3   # Upstream 429 auch nach Retries
+EXIT_EMPTY = 4          # Keine Treffer (nur mit --fail-on-empty)
+
+
+def _market(value):
+    try:
+        return MARKETS[value.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"Markt muss Krypto oder Aktien sein, nicht {value!r}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m alpha_core", description="Alpha Station Scan ohne Browser")
+    parser.add_argument("--market", type=_market, default="Krypto", help="Krypto oder Aktien (Standard: Krypto)")
+    picked = parser.add_mutually_exclusive_group()
+    picked.add_argument("--strategy", action="append", metavar="NAME", help="Strategie aus STRATEGIES (mehrfach möglich)")
+    picked.add_argument("--all", action="store_true", help="Alle Strategien des Marktes")
+    parser.add_argument("--list", action="store_true", help="Strategien auflisten und beenden")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--out", default=OUTPUT_DIR, help=f"Ausgabeverzeichnis (Standard: $ALPHA_OUTPUT_DIR oder {OUTPUT_DIR})")
+    parser.add_argument("--top", type=int, default=0, help="Nur die besten N pro Strategie nach Alpha (0 = alle)")
+    parser.add_argument("--max-coins", type=int, default=None, help="Größe des Krypto-Universums")
+    parser.add_argument("--with-sr", action="store_true", help="S/R-Abstände (S-Dist%%/R-Dist%%) für die Treffer berechnen")
+    parser.add_argument("--poly-key", default=os.environ.get("POLYGON_KEY"), help="Standard: $POLYGON_KEY")
+    parser.add_argument("--finnhub-key", default=os.environ.get("FINNHUB_KEY"), help="Standard: $FINNHUB_KEY")
+    parser.add_argument("--fail-on-empty", action="store_true", help=f"Exit {EXIT_EMPTY}, wenn keine Strategie Treffer hat")
+    return parser
+
+
+def list_strategies(out=sys.stdout):
+    for name, strategy in STRATEGIES.items():
+        markets = "Aktien" if strategy.get("stocks_only") else "Krypto, Aktien"
+        print(f"{name:<20} [{markets}] {strategy['description']}", file=out)
+
+
+def _pick_strategies(args):
+    """Gewählte Strategien -> (range, insider) - Fehlertext statt Exception"""
+    names = args.strategy or [n for n in STRATEGIES if supports_market(n, args.market)]
+    unknown = [n for n in names if n not in STRATEGIES]
+    if unknown:
+        return None, None, f"Unbekannte Strategie: {', '.join(unknown)} (--list zeigt alle)"
+    wrong_market = [n for n in names if not supports_market(n, args.market)]
+    if wrong_market:
+        return None, None, f"Nur für Aktien: {', '.join(wrong_market)}"
+    insider = [n for n in names if n in INSIDER_STRATEGIES]
+    if insider and not args.finnhub_key:
+        if args.strategy:
+            return None, None, "FINNHUB_KEY fehlt für Insider-Strategien (--finnhub-key)"
+        insider = []  # --all ohne Key: Insider still auslassen
+        print("Hinweis: Insider-Strategien ohne FINNHUB_KEY übersprungen", file=sys.stderr)
+    return [n for n in names if n not in INSIDER_STRATEGIES], insider, None
+
+
+def run(args):
+    """Scan + Datei schreiben -> (Exit-Code, Pfad oder None)"""
+    range_names, insider_names, error = _pick_strategies(args)
+    if error:
+        print(error, file=sys.stderr)
+        return EXIT_USAGE, None
+    if args.market == "Aktien" and range_names and not args.poly_key:
+        print("POLYGON_KEY fehlt (--poly-key)", file=sys.stderr)
+        return EXIT_USAGE, None
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("Parquet braucht pyarrow: pip install pyarrow", file=sys.stderr)
+            return EXIT_USAGE, None
+
+    from alpha_core.insider import fetch_insider_signals
+    from alpha_core.scan import AuthError, RateLimited, partial_warning, scan_all_strategies, top_results
+
+    scanned_at = datetime.now(timezone.utc)
+    per_strategy, failed_pages = {}, []
+    try:
+        if range_names:
+            found, _ = scan_all_strategies(
+                args.market, poly_key=args.poly_key, max_coins=args.max_coins,
+                strategies={n: STRATEGIES[n]["filters"] for n in range_names}, failed_pages=failed_pages
+            )
+            per_strategy.update({n: res[0] for n, res in found.items()})
+        for name in insider_names:
+            per_strategy[name] = fetch_insider_signals(args.finnhub_key, STRATEGIES[name]["filters"]["Insider"])
+    except RateLimited as e:
+        print(f"Rate Limit: {e}", file=sys.stderr)
+        return EXIT_RATE_LIMITED, None
+    except AuthError as e:
+        # Ungültiger/fehlender Key ist ein Konfigurationsfehler, kein Laufzeitfehler
+        print(f"Zugriff verweigert: {e}", file=sys.stderr)
+        return EXIT_USAGE, None
+    except Exception as e:
+        print(f"Scan fehlgeschlagen: {e}", file=sys.stderr)
+        return EXIT_ERROR, None
+    if failed_pages:
+        print(f"Warnung: {partial_warning(failed_pages)}", file=sys.stderr)
+
+    rows = []
+    for name, results in per_strategy.items():
+        if args.top:
+            results = top_results(results, args.top)
+        if args.with_sr and results and name not in INSIDER_STRATEGIES:
+            from alpha_core.sr import batch_sr_levels, with_sr_distances
+            # Eigener Prozess mit eigenem Limiter: alle Treffer dürfen nachladen (dauert bei Krypto entsprechend)
+            levels = batch_sr_levels(results, args.market, poly_key=args.poly_key, max_fetch=len(results))
+            results = with_sr_distances(results, levels)
+        rows += [{"Strategie": name, "Markt": args.market, "ScanZeit": scanned_at.isoformat(), **r} for r in results]
+        print(f"{name}: {len(results)} Treffer", file=sys.stderr)
+
+    path = write_results(rows, args.out, args.market, scanned_at, args.format)
+    if not rows and args.fail_on_empty:
+        return EXIT_EMPTY, path
+    return EXIT_OK, path
+
+
+def write_results(rows, out_dir, market_type, scanned_at, fmt="jsonl"):
+    """Schreibt atomar (tmp + rename), damit Pipelines nie halbe Dateien lesen"""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"scan_{market_type.lower()}_{scanned_at.strftime('%Y%m%d-%H%M%S')}.{fmt}")
+    tmp = path + ".tmp"
+    if fmt == "parquet":
+        import pandas as pd
+        pd.DataFrame(rows).to_parquet(tmp, index=False)
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.list:
+        list_strategies()
+        return EXIT_OK
+    code, path = run(args)
+    if path:
+        print(path)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Mehrfach-Suche: Liste gemischter Symbole (Aktien + Krypto) -> eine Vergleichstabelle
+
+Statt eines Einzel-Abrufs pro Symbol:
+- Markt und CoinGecko-ID kommen aus dem lokalen Symbol-Index (Fallback: Search API, parallel)
+- Kurse in gebündelten Abrufen wie bei der Watchlist (Polygon tickers=..., CoinGecko ids=...)
+- S/R-Abstände über batch_sr_levels (parallel, Memo/Cache)
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from alpha_core.lookup import crypto_market_row, find_coin_id, stock_snapshot_row
+from alpha_core.sr import batch_sr_levels, with_sr_distances
+from alpha_core.symbols import resolve
+from alpha_core.watchlist import fetch_raw
+
+MAX_SYMBOLS = 50
+RESOLVE_WORKERS = 8
+COMPARE_COLUMNS = ["Ticker", "Markt", "Name", "Preis", "Chg%", "RVOL", "Alpha", "ClosePos", "S-Dist%", "R-Dist%"]
+
+_SPLIT = re.compile(r"[\s,;]+")
+
+
+def parse_symbol_list(text, default_market="Aktien"):
+    """Freitext -> [(Symbol, Markt)] in Eingabe-Reihenfolge, ohne Doppelte
+
+    Markt: "BTC-USD" / "X:BTC" ist immer Krypto, sonst der Markt, in dem der Symbol-Index
+    das Symbol kennt (bei beiden: default_market), unbekannt -> default_market.
+    """
+    other = "Krypto" if default_market == "Aktien" else "Aktien"
+    pairs, seen = [], set()
+    for raw in _SPLIT.split((text or "").upper()):
+        if not raw or raw in ("-USD", "X:"):
+            continue
+        if raw.endswith("-USD"):
+            symbol, market = raw.removesuffix("-USD"), "Krypto"
+        elif raw.startswith("X:"):
+            symbol, market = raw.removeprefix("X:").removesuffix("USD"), "Krypto"
+        elif resolve(raw, default_market) or not resolve(raw, other):
+            symbol, market = raw, default_market
+        else:
+            symbol, market = raw, other
+        if (symbol, market) not in seen:
+            seen.add((symbol, market))
+            pairs.append((symbol, market))
+    return pairs[:MAX_SYMBOLS]
+
+
+def _coin_ids(symbols):
+    """Symbol -> CoinGecko-ID; Index-Treffer sofort, der Rest parallel über die Search API"""
+    ids = {}
+    for symbol in symbols:
+        indexed = resolve(symbol, "Krypto")
+        if indexed:
+            ids[symbol] = indexed["id"]
+    missing = [s for s in symbols if s not in ids]
+
+    def lookup(symbol):
+        try:
+            return find_coin_id(symbol)
+        except Exception:
+            return None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+            ids.update({s: coin_id for s, coin_id in zip(missing, pool.map(lookup, missing)) if coin_id})
+    return ids
+
+
+def compare_symbols(pairs, poly_key=None, timeframe="4H", with_sr=True):
+    """[(Symbol, Markt)] -> (Zeilen in Eingabe-Reihenfolge, nicht gefundene Symbole)"""
+    coin_ids = _coin_ids([s for s, m in pairs if m == "Krypto"])
+    entries = [{"ticker": s, "market": m, "coin_id": coin_ids.get(s) if m == "Krypto" else None}
+               for s, m in pairs if m == "Aktien" or s in coin_ids]
+    stock_objs, coin_objs = fetch_raw(entries, poly_key)
+
+    found = {}
+    for t in stock_objs:
+        row = stock_snapshot_row(t)
+        if row:
+            found[("Aktien", row["Ticker"])] = row
+    by_id = {coin_id: symbol for symbol, coin_id in coin_ids.items()}
+    for c in coin_objs:
+        if c.get("id") in by_id and c.get("current_price"):
+            found[("Krypto", by_id[c["id"]])] = crypto_market_row(c)
+
+    rows, missing = [], []
+    for symbol, market in pairs:
+        row = found.get((market, symbol))
+        if row:
+            rows.append({**row, "Markt": market})
+        else:
+            missing.append(symbol)
+
+    if with_sr and rows:
+        enriched = {}
+        for market in ("Aktien", "Krypto"):
+            subset = [r for r in rows if r["Markt"] == market]
+            if subset:
+                levels = batch_sr_levels(subset, market, timeframe=timeframe, poly_key=poly_key)
+                enriched.update({(market, r["Ticker"]): r for r in with_sr_distances(subset, levels)})
+        rows = [enriched[(r["Markt"], r["Ticker"])] for r in rows]
+    return rows, missing
+
+
+def compare_table(rows):
+    """Zeilen -> DataFrame mit den Vergleichsspalten"""
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    return df.reindex(columns=COMPARE_COLUMNS)
@@ -0,0 +1,172 @@
+"""Inkrementeller Aktien-Rescan: nur geänderte Ticker neu berechnen + Diff der Treffer
+
+Der Scan-Zustand hält Rohmatrix, Kennzahlen, Filter-Maske und Ergebnis-Dicts des
+letzten Snapshots. Beim nächsten Snapshot werden nur Ticker neu geflacht und
+bewertet, deren Polygon-Zeitstempel "updated" sich geändert hat (fehlt er: deren
+day/lastTrade/min/prevDay/todaysChangePerc).
+"""
+import numpy as np
+import pandas as pd
+
+from alpha_core.filters import compile_filters, filter_mask
+from alpha_core.metrics import _flatten_stock, _stock_candidates, _to_matrix, stock_metrics_from_raw, stock_results
+
+RAW_WIDTH = 14
+METRIC_COLUMNS = ["Preis", "Change %", "Vortag %", "RVOL", "Close Position", "Gap %", "Upper Wick %", "Lower Wick %"]
+
+
+def _change_key(t):
+    """Alles, was in _flatten_stock einfließt - Vergleich der Dicts läuft in C"""
+    return (t.get("day"), t.get("lastTrade"), t.get("min"), t.get("prevDay"), t.get("todaysChangePerc"))
+
+
+def _change_keys(tickers):
+    """Polygon-Zeitstempel "updated" (ns) als int-Array - sonst die Felder selbst als Tupel"""
+    stamps = [t.get("updated") for t in tickers]
+    try:
+        if None not in stamps:
+            return np.array(stamps, dtype=np.int64).reshape(len(stamps))
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return [_change_key(t) for t in tickers]
+
+
+def _key_at(keys, i):
+    return int(keys[i]) if isinstance(keys, np.ndarray) else keys[i]
+
+
+def _empty_scan_state():
+    return {
+        "names": [],
+        "index": {},
+        "keys": np.zeros(0, dtype=np.int64),
+        "raw": np.empty((0, RAW_WIDTH)),
+        "values": np.empty((0, len(METRIC_COLUMNS))),
+        "clauses": None,
+        "match": np.zeros(0, dtype=bool),
+        "candidates": np.zeros(0, dtype=bool),
+        "no_price": np.zeros(0, dtype=bool),
+        "rows": [],  # Ergebnis-Dict pro Zeile, None wenn kein Treffer
+    }
+
+
+def _metrics_frame(names, values):
+    frame = pd.DataFrame(values, columns=METRIC_COLUMNS)
+    frame.insert(0, "Ticker", names)
+    return frame
+
+
+def build_scan_state(tickers, filters, additional_filters):
+    """Erster Scan: alles berechnen (wie scan_stock_snapshot), Zustand für Rescans aufbauen"""
+    state, _ = rescan(_empty_scan_state(), tickers, filters, additional_filters)
+    return state
+
+
+def rescan(state, tickers, filters, additional_filters):
+    """Neuer Snapshot -> (neuer Zustand, diff)
+
+    diff: entered / exited (Ergebnis-Dicts), moved (dicts mit prev/now für Treffer,
+    deren Werte sich geändert haben), changed (neu berechnete Zeilen), total.
+    """
+    clauses = compile_filters(filters, additional_filters)
+    same_filters = clauses == state["clauses"]
+
+    # Welche Zeilen lassen sich aus dem alten Zustand übernehmen?
+    n = len(tickers)
+    names = [t.get("ticker", "") for t in tickers]
+    if names == state["names"]:
+        old_rows = np.arange(n)
+    else:
+        index = state["index"]
+        old_rows = np.array([index.get(name, -1) for name in names], dtype=int).reshape(n)
+    keys = _change_keys(tickers)
+    known = old_rows >= 0
+    same = np.zeros(n, dtype=bool)
+    old_keys = state["keys"]
+    if isinstance(keys, np.ndarray) and isinstance(old_keys, np.ndarray):
+        same[known] = keys[known] == old_keys[old_rows[known]]
+    else:
+        for i in np.flatnonzero(known).tolist():
+            same[i] = _key_at(keys, i) == _key_at(old_keys, old_rows[i])
+    old_rows[~same] = -1
+    changed = np.flatnonzero(~same)
+    reused = np.flatnonzero(same)
+
+    # Kennzahlen sind zeilenweise unabhängig - nur geänderte Zeilen flachen + neu berechnen
+    raw = np.empty((n, RAW_WIDTH))
+    values = np.empty((n, len(METRIC_COLUMNS)))
+    candidates = np.zeros(n, dtype=bool)
+    no_price = np.zeros(n, dtype=bool)
+    raw[reused] = state["raw"][old_rows[reused]]
+    values[reused] = state["values"][old_rows[reused]]
+    candidates[reused] = state["candidates"][old_rows[reused]]
+    no_price[reused] = state["no_price"][old_rows[reused]]
+
+    changed_metrics = None
+    if len(changed):
+        raw[changed] = _to_matrix([_flatten_stock(tickers[i]) for i in changed], RAW_WIDTH)
+        changed_metrics = stock_metrics_from_raw([names[i] for i in changed], raw[changed])
+        values[changed] = changed_metrics[METRIC_COLUMNS].to_numpy()
+        candidates[changed], no_price[changed] = _stock_candidates(changed_metrics)
+
+    rows = [state["rows"][r] if r >= 0 else None for r in old_rows.tolist()]
+    if same_filters:
+        # Unveränderte Zeilen behalten Treffer-Status und Ergebnis-Dict
+        match = np.zeros(n, dtype=bool)
+        match[reused] = state["match"][old_rows[reused]]
+        if len(changed):
+            match[changed] = candidates[changed] & filter_mask(changed_metrics, clauses)
+            hits = np.flatnonzero(match[changed])
+            for i, result in zip(changed[hits], stock_results(changed_metrics.iloc[hits])):
+                rows[i] = result
+    else:
+        metrics = _metrics_frame(names, values)
+        match = candidates & filter_mask(metrics, clauses)
+        hits = np.flatnonzero(match)
+        rows = [None] * n
+        for i, result in zip(hits, stock_results(metrics.iloc[hits])):
+            rows[i] = result
+
+    new_state = {
+        "names": names,
+        "index": state["index"] if names == state["names"] else {name: i for i, name in enumerate(names)},
+        "keys": keys,
+        "raw": raw,
+        "values": values,
+        "clauses": clauses,
+        "match": match,
+        "candidates": candidates,
+        "no_price": no_price,
+        "rows": rows,
+    }
+    touched = changed if same_filters else np.arange(n)
+    return new_state, _diff(state, new_state, touched, len(changed))
+
+
+def _diff(old, new, touched, changed):
+    """Vergleich nur über berührte Zeilen + verschwundene Ticker"""
+    entered, exited, moved = [], [], []
+    old_index = old["index"]
+    for i in touched.tolist():
+        now = new["rows"][i] if new["match"][i] else None
+        row = old_index.get(new["names"][i])
+        prev = old["rows"][row] if row is not None and old["match"][row] else None
+        if now is not None and prev is None:
+            entered.append(now)
+        elif now is None and prev is not None:
+            exited.append(prev)
+        elif now is not None and now != prev:
+            moved.append({"Ticker": new["names"][i], "prev": prev, "now": now})
+
+    if new["names"] != old["names"]:
+        present = new["index"]
+        exited += [old["rows"][i] for i in np.flatnonzero(old["match"]) if old["names"][i] not in present]
+
+    return {"entered": entered, "exited": exited, "moved": moved, "changed": changed, "total": len(new["names"])}
+
+
+def state_results(state):
+    """Treffer des Zustands im Format von scan_stock_snapshot -> (results, skipped_no_price, skipped_filter)"""
+    match = state["match"]
+    results = [state["rows"][i] for i in np.flatnonzero(match)]
+    return results, int(state["no_price"].sum()), int(state["candidates"].sum() - match.sum())
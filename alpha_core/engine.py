@@ -0,0 +1,65 @@
+"""Einstieg für Nicht-UI-Aufrufer: Scans mit expliziten Parametern, auch in Worker-Prozessen
+
+Alles hier ist frei von Streamlit und Session-State - Strategie, Filter und Keys werden
+übergeben. Die Funktionen sind modulweit definiert und damit für ProcessPoolExecutor
+pickelbar.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from alpha_core.insider import fetch_insider_signals
+from alpha_core.lookup import lookup_symbol
+from alpha_core.scan import scan_market
+from alpha_core.sr import calculate_sr_levels
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, INSIDER_STRATEGIES, STRATEGIES
+
+
+def resolve_filters(strategy=None, filters=None, additional_filters=None):
+    """Filter einer Strategie (wie "Strategie laden"), explizite Filter haben Vorrang"""
+    if filters is None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unbekannte Strategie: {strategy}")
+        filters = STRATEGIES[strategy]["filters"].copy()
+    if additional_filters is None:
+        additional_filters = DEFAULT_ADDITIONAL_FILTERS.copy()
+    return filters, additional_filters
+
+
+def run_scan(market_type, strategy=None, filters=None, additional_filters=None,
+             poly_key=None, finnhub_key=None, max_coins=None, on_progress=None):
+    """Ein Scan -> (results, skipped_no_price, skipped_filter)
+
+    Insider-Strategien laufen über Finnhub (nur Aktien), alle anderen über scan_market.
+    """
+    filters, additional_filters = resolve_filters(strategy, filters, additional_filters)
+    if strategy in INSIDER_STRATEGIES or "Insider" in filters:
+        return fetch_insider_signals(finnhub_key, filters["Insider"], on_progress), 0, 0
+    return scan_market(market_type, filters, additional_filters, poly_key=poly_key, max_coins=max_coins)
+
+
+def _run_job(job):
+    return run_scan(**job)
+
+
+def run_scans_parallel(jobs, max_workers=None):
+    """Mehrere Scans in Worker-Prozessen -> Ergebnisse in Reihenfolge der jobs
+
+    jobs: dicts mit den Parametern von run_scan (ohne on_progress). Jeder Prozess hat
+    eigenen HTTP-Cache und eigene Limiter - für viele Jobs auf derselben API lieber
+    scan_all_strategies (ein Abruf für alle Strategien) nehmen.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_run_job, jobs))
+
+
+def sr_for_symbol(symbol, market_type, timeframe="4H", poly_key=None, price=None, coin_id=None):
+    """S/R + Fibonacci für einen Ticker -> ((supports, resistances), fib_info)
+
+    Ohne price wird der aktuelle Preis per Einzel-Suche geholt.
+    """
+    if price is None:
+        found = lookup_symbol(symbol, market_type, poly_key)
+        if not found:
+            return ([], []), {}
+        price, coin_id = found["Preis"], coin_id or found.get("CoinID")
+    return calculate_sr_levels(price, ticker=symbol, market_type=market_type, timeframe=timeframe,
+                               poly_key=poly_key, coin_id=coin_id)
@@ -0,0 +1,81 @@
+"""Filter-Compiler: Strategie-Filter + Zusatzfilter -> Bereichs-Klauseln über die Kennzahlen-Tabelle"""
+import numpy as np
+
+# Kleinste Zahl > 0: macht aus "x > 0" die inklusive Klausel "x >= _POSITIVE"
+_POSITIVE = np.nextafter(0.0, 1.0)
+
+# Stichprobengröße für die Selektivitäts-Schätzung
+_SAMPLE_ROWS = 512
+
+# Numerische Spalten der Kennzahlen-Tabellen (build_stock_metrics / build_crypto_metrics)
+FILTER_COLUMNS = ("Preis", "Change %", "Vortag %", "RVOL", "Close Position", "Gap %", "Upper Wick %", "Lower Wick %")
+
+
+def compile_filters(filters, additional_filters):
+    """Übersetzt filters + additional_filters in Klauseln [(Spalte, min, max), ...]
+
+    Mehrere Bedingungen auf derselben Spalte werden zu einem Bereich verschmolzen
+    (z.B. "Preis" aus der Strategie + preis_min/preis_max aus den Zusatzfiltern).
+    Bereichs-Filter auf einer unbekannten Spalte -> ValueError (statt KeyError beim Auswerten).
+    """
+    f = filters
+    af = additional_filters or {}
+    ranges = {}
+
+    def add(column, lo, hi):
+        old_lo, old_hi = ranges.get(column, (-np.inf, np.inf))
+        ranges[column] = (max(old_lo, lo), min(old_hi, hi))
+
+    for column, values in f.items():
+        # Nicht-Bereichs-Filter (z.B. "Insider": "BUY") laufen über eigene Fetcher
+        if not (isinstance(values, (tuple, list)) and len(values) == 2):
+            continue
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Unbekannte Filter-Spalte '{column}' (erlaubt: {', '.join(FILTER_COLUMNS)})")
+        lo, hi = values
+        if column == "RVOL":
+            if af.get("rvol_override_min"): lo = af["rvol_override_min"]
+            if af.get("rvol_override_max"): hi = af["rvol_override_max"]
+        add(column, lo, hi)
+
+    if af.get("preis_min", 0) > 0: add("Preis", af["preis_min"], np.inf)
+    if af.get("preis_max", 100000) < 100000: add("Preis", -np.inf, af["preis_max"])
+    if af.get("nur_gewinner"): add("Change %", _POSITIVE, np.inf)
+    if af.get("nur_verlierer"): add("Change %", -np.inf, -_POSITIVE)
+
+    return [(column, lo, hi) for column, (lo, hi) in ranges.items()]
+
+
+def _order_clauses(clauses, columns):
+    """Sortiert Klauseln: leere Bereiche zuerst, dann nach geschätzter Trefferquote"""
+    n = len(next(iter(columns.values()))) if columns else 0
+    step = max(1, n // _SAMPLE_ROWS)
+
+    def pass_rate(clause):
+        column, lo, hi = clause
+        if lo > hi:
+            return -1.0
+        sample = columns[column][::step]
+        if sample.size == 0:
+            return 0.0
+        return float(((sample >= lo) & (sample <= hi)).mean())
+
+    return sorted(clauses, key=pass_rate)
+
+
+def filter_mask(metrics, clauses):
+    """Wertet kompilierte Klauseln als Bool-Maske aus (selektivste zuerst, Abbruch bei 0 Treffern)"""
+    n = len(metrics)
+    columns = {column: metrics[column].to_numpy() for column, _, _ in clauses}
+
+    # Jede Klausel prüft nur noch die Zeilen, die alle vorherigen überlebt haben
+    survivors = np.arange(n)
+    for column, lo, hi in _order_clauses(clauses, columns):
+        values = columns[column][survivors]
+        survivors = survivors[(values >= lo) & (values <= hi)]
+        if survivors.size == 0:
+            break
+
+    mask = np.zeros(n, dtype=bool)
+    mask[survivors] = True
+    return mask
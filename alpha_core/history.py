@@ -0,0 +1,319 @@
+"""Lokaler OHLC-Verlauf: append-only Dateien pro (Markt, Symbol, Intervall), memory-mapped gelesen
+
+Format: rohe float64-Datensätze mit 6 Spalten (t, o, h, l, c, v) ohne Header,
+t in Millisekunden. Krypto (CoinGecko /ohlc) hat kein Volumen -> v = NaN.
+Beim Nachladen werden nur Kerzen ab dem letzten gespeicherten Zeitstempel geholt;
+die letzte (laufende) Kerze darf dabei überschrieben werden. Die Erstbefüllung läuft
+mit der langen Endpoint-TTL, das Nachladen mit der kurzen (*_open), damit die laufende
+Kerze nicht stundenlang auf dem Stand des ersten Abrufs stehen bleibt.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from alpha_core.http_cache import ENDPOINT_TTL, cached_get
+from alpha_core.rate_limit import COINGECKO_LIMITER
+
+HISTORY_DIR = os.environ.get("ALPHA_HISTORY_DIR", os.path.join(os.path.expanduser("~"), ".alpha_station", "history"))
+
+COLUMNS = ("t", "o", "h", "l", "c", "v")
+RECORD_BYTES = len(COLUMNS) * 8
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Aktien: Polygon Tageskerzen, Erstbefüllung 2 Jahre
+STOCK_INTERVAL = "1d"
+STOCK_BACKFILL_DAYS = 730
+
+# CoinGecko wählt die Kerzengröße selbst anhand von days -> ein Intervall pro Bucket
+# Intervall -> erlaubte days-Werte aufsteigend (der größte ist die Erstbefüllung)
+CRYPTO_INTERVALS = {
+    "30m": (1,),
+    "4h": (7, 14, 30),
+    "4d": (90, 180, 365),
+}
+
+# Offene memmaps (je ein Dateideskriptor) - LRU, bei großen Universen sonst unbegrenzt
+MAX_MAPS = 256
+
+_locks = {}
+_locks_guard = threading.Lock()
+_maps = OrderedDict()  # Pfad -> (Dateigröße, memmap)
+_maps_lock = threading.Lock()
+_refreshed = {}     # Pfad -> Zeitpunkt des letzten Nachladens (monotonic)
+
+
+# =============================================================================
+# DATEIEN
+# =============================================================================
+def history_path(market, symbol, interval):
+    """Datei für (Markt, Symbol, Intervall) - Symbol dateisystemtauglich gemacht"""
+    safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+    return os.path.join(HISTORY_DIR, market, interval, f"{safe_symbol}.f64")
+
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def _to_records(candles):
+    """Kerzen-Listen ([t, o, h, l, c] oder mit v) -> (n, 6) float64"""
+    records = np.full((len(candles), len(COLUMNS)), np.nan)
+    for i, candle in enumerate(candles):
+        values = candle[:len(COLUMNS)]
+        records[i, :len(values)] = values
+    return records
+
+
+def read_history(market, symbol, interval, since_ms=None):
+    """Gespeicherte Kerzen als (n, 6)-Array (memory-mapped, nur lesen) - leer, wenn nichts da ist"""
+    path = history_path(market, symbol, interval)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return np.empty((0, len(COLUMNS)))
+
+    # Abgebrochene Schreibvorgänge: unvollständigen Datensatz am Ende ignorieren
+    rows = size // RECORD_BYTES
+    if rows == 0:
+        return np.empty((0, len(COLUMNS)))
+
+    with _maps_lock:
+        cached = _maps.get(path)
+        if cached is not None and cached[0] == size:
+            _maps.move_to_end(path)
+            candles = cached[1]
+        else:
+            candles = np.memmap(path, dtype=np.float64, mode="r", shape=(rows, len(COLUMNS)))
+            _maps[path] = (size, candles)
+            _maps.move_to_end(path)
+            while len(_maps) > MAX_MAPS:
+                _maps.popitem(last=False)
+
+    if since_ms is not None:
+        candles = candles[np.searchsorted(candles[:, 0], since_ms, side="left"):]
+    return candles
+
+
+def _drop_map(path):
+    with _maps_lock:
+        _maps.pop(path, None)
+
+
+def last_timestamp(market, symbol, interval):
+    """Zeitstempel der letzten gespeicherten Kerze (ms) oder None"""
+    candles = read_history(market, symbol, interval)
+    return float(candles[-1, 0]) if len(candles) else None
+
+
+def append_candles(market, symbol, interval, candles):
+    """Hängt neuere Kerzen an - gleiche letzte Kerze wird überschrieben, ältere ignoriert
+
+    Gibt die Anzahl neu angehängter Kerzen zurück.
+    """
+    records = _to_records(candles)
+    if not len(records):
+        return 0
+    records = records[np.argsort(records[:, 0], kind="stable")]
+
+    path = history_path(market, symbol, interval)
+    with _lock_for(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) % RECORD_BYTES:
+            # Abgebrochener Schreibvorgang: Rest abschneiden, sonst verrutschen alle neuen Datensätze
+            os.truncate(path, os.path.getsize(path) // RECORD_BYTES * RECORD_BYTES)
+        last_t = last_timestamp(market, symbol, interval)
+
+        if last_t is not None:
+            # Laufende Kerze aktualisieren (letzte Version aus dem Abruf gewinnt)
+            same = records[records[:, 0] == last_t]
+            if len(same):
+                rows = os.path.getsize(path) // RECORD_BYTES
+                with open(path, "r+b") as f:
+                    f.seek((rows - 1) * RECORD_BYTES)
+                    f.write(same[-1].tobytes())
+                    f.truncate(rows * RECORD_BYTES)
+            records = records[records[:, 0] > last_t]
+
+        if len(records):
+            # Doppelte Zeitstempel im Abruf: letzte Version behalten
+            keep = np.append(records[1:, 0] != records[:-1, 0], True)
+            records = records[keep]
+            with open(path, "ab") as f:
+                f.write(np.ascontiguousarray(records).tobytes())
+        _drop_map(path)
+    return len(records)
+
+
+def replace_candles(market, symbol, interval, candles):
+    """Ersetzt den gesamten Verlauf (tmp + rename) - für Lücken, die sich nicht mehr schließen lassen"""
+    records = _to_records(candles)
+    records = records[np.argsort(records[:, 0], kind="stable")]
+    keep = np.append(records[1:, 0] != records[:-1, 0], True) if len(records) else np.empty(0, dtype=bool)
+    records = records[keep]
+
+    path = history_path(market, symbol, interval)
+    with _lock_for(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(np.ascontiguousarray(records).tobytes())
+        os.replace(tmp, path)
+        _drop_map(path)
+    return len(records)
+
+
+def _due(path, endpoint):
+    """Nachladen nur, wenn seit dem letzten Mal die Endpoint-TTL abgelaufen ist"""
+    last = _refreshed.get(path)
+    return last is None or time.monotonic() - last >= ENDPOINT_TTL[endpoint]
+
+
+# =============================================================================
+# NETZWERK
+# =============================================================================
+def fetch_crypto_ohlc(coin_id, days, endpoint="ohlc"):
+    """CoinGecko OHLC: [[t, o, h, l, c], ...] oder None"""
+    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc"
+    params = {"vs_currency": "usd", "days": days}
+    resp = cached_get(url, params=params, endpoint=endpoint, timeout=15, limiter=COINGECKO_LIMITER, retries=2)
+    if resp.status_code == 200:
+        return resp.json() or None
+    return None
+
+
+def fetch_stock_aggs(ticker, start_date, end_date, poly_key, endpoint="aggs"):
+    """Polygon Tageskerzen: [[t, o, h, l, c, v], ...] oder None"""
+    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{end_date}"
+    params = {"apiKey": poly_key, "limit": 50000}
+    resp = cached_get(url, params=params, endpoint=endpoint, timeout=15)
+    if resp.status_code == 200:
+        results = resp.json().get("results", [])
+        if results:
+            return [[r["t"], r["o"], r["h"], r["l"], r["c"], r.get("v", np.nan)] for r in results]
+    return None
+
+
+# =============================================================================
+# NACHLADEN + LESEN
+# =============================================================================
+def crypto_interval(days):
+    """CoinGecko-Kerzengröße für einen days-Wert (1-2: 30m, bis 30: 4h, sonst 4d)"""
+    if days <= 2:
+        return "30m"
+    if days <= 30:
+        return "4h"
+    return "4d"
+
+
+def top_up_crypto(coin_id, interval):
+    """Holt nur den fehlenden Zeitraum seit der letzten gespeicherten Kerze
+
+    Ist die Lücke größer als der größte days-Wert des Buckets, kann CoinGecko sie in
+    dieser Kerzengröße nicht mehr liefern: dann wird der Verlauf mit dem vollen
+    Zeitraum neu geschrieben statt ein dauerhaftes Loch anzuhängen.
+    """
+    path = history_path("Krypto", coin_id, interval)
+    allowed = CRYPTO_INTERVALS[interval]
+    last_t = last_timestamp("Krypto", coin_id, interval)
+    gap_days = None if last_t is None else (time.time() * 1000 - last_t) / DAY_MS
+    full = gap_days is None or gap_days > allowed[-1]
+    endpoint = "ohlc" if full else "ohlc_open"
+    if not _due(path, endpoint):
+        return 0
+
+    days = allowed[-1] if full else next(d for d in allowed if d >= gap_days)
+    candles = fetch_crypto_ohlc(coin_id, days, endpoint)
+    _refreshed[path] = time.monotonic()
+    if not candles:
+        return 0
+    if last_t is not None and full:
+        return replace_candles("Krypto", coin_id, interval, candles)
+    return append_candles("Krypto", coin_id, interval, candles)
+
+
+def _utc_date(ms):
+    """Kalendertag eines Kerzen-Zeitstempels (ms)
+
+    Polygon stempelt Tageskerzen auf Mitternacht New York (04:00/05:00 UTC desselben
+    Tages) - in UTC ist das immer der Handelstag, in der lokalen Zeit des Hosts
+    (westlich von New York) schon der Vortag.
+    """
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).date()
+
+
+def _utc_today():
+    return datetime.now(timezone.utc).date()
+
+
+def top_up_stock(ticker, poly_key, since=None):
+    """Holt Tageskerzen ab dem Tag der letzten gespeicherten Kerze (inkl., laufender Tag)
+
+    since (date): Verlauf bis zu diesem Tag zurück auffüllen, falls er später beginnt
+    (Backtest-Backfill, sonst nur STOCK_BACKFILL_DAYS). Läuft unabhängig von der TTL.
+    """
+    path = history_path("Aktien", ticker, STOCK_INTERVAL)
+    today = _utc_today()
+    if since is not None:
+        stored = read_history("Aktien", ticker, STOCK_INTERVAL)
+        if len(stored) and _utc_date(stored[0, 0]) <= since:
+            return 0
+        candles = fetch_stock_aggs(ticker, since.isoformat(), today.isoformat(), poly_key)
+        _refreshed[path] = time.monotonic()
+        if not candles:
+            return 0
+        # Bestand + Abruf, bei gleichen Tagen gewinnt der Abruf
+        return replace_candles("Aktien", ticker, STOCK_INTERVAL, np.concatenate([stored, _to_records(candles)]))
+
+    last_t = last_timestamp("Aktien", ticker, STOCK_INTERVAL)
+    endpoint = "aggs" if last_t is None else "aggs_open"
+    if not _due(path, endpoint):
+        return 0
+
+    start = today - timedelta(days=STOCK_BACKFILL_DAYS) if last_t is None else _utc_date(last_t)
+    candles = fetch_stock_aggs(ticker, start.isoformat(), today.isoformat(), poly_key, endpoint)
+    _refreshed[path] = time.monotonic()
+    return append_candles("Aktien", ticker, STOCK_INTERVAL, candles) if candles else 0
+
+
+def load_crypto_history(coin_id, days, refresh=True):
+    """Kerzen der letzten days Tage aus dem lokalen Verlauf (vorher nachgeladen)
+
+    refresh=False: nur der lokale Bestand, kein Abruf (schont das CoinGecko-Limit).
+    """
+    interval = crypto_interval(days)
+    if refresh:
+        try:
+            top_up_crypto(coin_id, interval)
+        except Exception:
+            pass  # Offline / API-Fehler: mit dem vorhandenen Bestand weiterarbeiten
+    since_ms = time.time() * 1000 - days * DAY_MS
+    candles = read_history("Krypto", coin_id, interval, since_ms)
+    if refresh and not len(candles) and last_timestamp("Krypto", coin_id, interval) is None:
+        # Verzeichnis nicht beschreibbar: direkt aus dem (gecachten) Abruf
+        fetched = fetch_crypto_ohlc(coin_id, days)
+        candles = _to_records(fetched) if fetched else candles
+    return candles
+
+
+def load_stock_history(ticker, days, poly_key):
+    """Tageskerzen ab (heute - days) aus dem lokalen Verlauf (vorher nachgeladen)"""
+    try:
+        top_up_stock(ticker, poly_key)
+    except Exception:
+        pass  # Offline / API-Fehler: mit dem vorhandenen Bestand weiterarbeiten
+    # UTC-Mitternacht des Starttags liegt vor dessen Kerze (Mitternacht New York)
+    today = _utc_today()
+    start = today - timedelta(days=days)
+    start_ms = datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp() * 1000
+    candles = read_history("Aktien", ticker, STOCK_INTERVAL, start_ms)
+    if not len(candles) and last_timestamp("Aktien", ticker, STOCK_INTERVAL) is None:
+        # Verzeichnis nicht beschreibbar: direkt aus dem (gecachten) Abruf
+        fetched = fetch_stock_aggs(ticker, start.isoformat(), today.isoformat(), poly_key)
+        candles = _to_records(fetched) if fetched else candles
+    return candles
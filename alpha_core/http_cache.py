@@ -0,0 +1,147 @@
+"""Prozessweiter TTL/LRU-Cache für alle REST-Aufrufe (CoinGecko, Polygon, Finnhub)
+
+Payloads liegen gepickelt im Cache: jeder json()-Aufruf liefert eine eigene Kopie,
+Aufrufer können sie verändern, ohne andere Threads/Sessions zu stören. Gleichzeitige
+Misses auf denselben Schlüssel lösen nur einen Netzwerk-Abruf aus.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from alpha_core.http_session import get_session
+from alpha_core.rate_limit import retry_delay
+
+# TTL pro Endpoint-Klasse in Sekunden
+ENDPOINT_TTL = {
+    "snapshot": 30,             # Polygon Snapshot (ganzer Markt / einzelner Ticker)
+    "markets": 60,              # CoinGecko /coins/markets
+    "price": 30,                # CoinGecko /simple/price (Watchlist-Kurse)
+    "coin_detail": 60,          # CoinGecko /coins/{id}
+    "news": 10 * 60,            # Polygon /v2/reference/news
+    "ohlc": 30 * 60,            # CoinGecko /coins/{id}/ohlc (Erstbefüllung)
+    "ohlc_open": 5 * 60,        # CoinGecko OHLC-Nachladen inkl. laufender Kerze
+    "aggs": 3 * 60 * 60,        # Polygon Daily Aggs (Erstbefüllung)
+    "aggs_open": 60,            # Polygon Aggs ab letzter Kerze inkl. laufendem Tag
+    "insider": 6 * 60 * 60,     # Finnhub Insider-Transaktionen
+    "search": 3 * 24 * 60 * 60, # CoinGecko /search
+    "reference": 60 * 60,       # CoinGecko /coins/list, Polygon Reference (Symbol-Index)
+}
+
+MAX_ENTRIES = 512
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (expires_at, CachedResponse)
+_inflight = {}            # key -> {"done": Event, "resp": Antwort des laufenden Abrufs}
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "by_endpoint": {}}
+
+
+class CachedResponse:
+    """Minimaler Response-Ersatz: status_code + JSON als Pickle, json() liefert jedes Mal eine Kopie"""
+    __slots__ = ("status_code", "_blob")
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def json(self):
+        return pickle.loads(self._blob)
+
+
+class FreshResponse:
+    """Antwort für den Thread, der selbst geholt hat - das frisch geparste JSON gehört nur ihm"""
+    __slots__ = ("status_code", "_payload")
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _count(endpoint, kind):
+    _stats[kind] += 1
+    per_endpoint = _stats["by_endpoint"].setdefault(endpoint, {"hits": 0, "misses": 0})
+    per_endpoint[kind] += 1
+
+
+def cached_get(url, params=None, endpoint="snapshot", timeout=15, limiter=None, retries=0):
+    """GET über die geteilte Session mit Cache - nur 200er werden gespeichert, alles andere geht direkt durch
+
+    limiter (z.B. TokenBucket) wird nur bei echten Netzwerk-Aufrufen belastet.
+    Bei 429 wird bis zu retries-mal mit Backoff wiederholt. Weitere Misses auf denselben
+    Schlüssel warten auf den laufenden Abruf und bekommen dessen Ergebnis.
+    """
+    ttl = ENDPOINT_TTL[endpoint]
+    key = (url, tuple(sorted((params or {}).items())))
+
+    while True:
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                _entries.move_to_end(key)
+                _count(endpoint, "hits")
+                return entry[1]
+            flight = _inflight.get(key)
+            if flight is None:
+                # Dieser Thread holt, alle weiteren Misses auf den Schlüssel warten
+                flight = _inflight[key] = {"done": threading.Event(), "resp": None}
+                _count(endpoint, "misses")
+                break
+        flight["done"].wait()
+        if flight["resp"] is not None and flight["resp"].status_code != 200:
+            return flight["resp"]
+        # 200 -> Treffer im nächsten Durchlauf; Exception beim Abruf -> dieser Thread versucht es selbst
+
+    resp = None
+    try:
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            resp = get_session().get(url, params=params, timeout=timeout)
+            if resp.status_code != 429 or attempt == retries:
+                break
+            # Vorrat verwerfen, damit alle Worker gemeinsam abbremsen
+            if limiter is not None:
+                limiter.drain()
+            time.sleep(retry_delay(resp, attempt))
+
+        if resp.status_code != 200:
+            return resp
+
+        payload = resp.json()
+        cached = CachedResponse(resp.status_code, payload)
+        with _lock:
+            _entries[key] = (time.monotonic() + ttl, cached)
+            _entries.move_to_end(key)
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+                _stats["evictions"] += 1
+        return FreshResponse(cached.status_code, payload)
+    except Exception:
+        resp = None  # Wartende holen dann selbst
+        raise
+    finally:
+        with _lock:
+            del _inflight[key]
+        flight["resp"] = resp
+        flight["done"].set()
+
+
+def cache_stats():
+    """Hit/Miss-Zähler (gesamt + pro Endpoint) und aktuelle Größe"""
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "evictions": _stats["evictions"],
+            "size": len(_entries),
+            "by_endpoint": {k: dict(v) for k, v in _stats["by_endpoint"].items()},
+        }
+
+
+def cache_clear():
+    """Leert den Cache (Zähler bleiben erhalten)"""
+    with _lock:
+        _entries.clear()
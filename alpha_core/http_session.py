@@ -0,0 +1,39 @@
+"""Geteilte requests.Session mit Connection-Pooling (einmal pro Server-Prozess)"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Verbindungen pro Host - so viele wie dort parallel angefragt wird
+HOST_POOL_SIZES = {
+    "https://api.coingecko.com": 8,
+    "https://api.polygon.io": 16,
+    "https://finnhub.io": 8,
+}
+DEFAULT_POOL_SIZE = 4
+
+_session = None
+_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    # Fallback für alle übrigen Hosts, längster Präfix gewinnt
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_POOL_SIZE))
+    for prefix, size in HOST_POOL_SIZES.items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+    return session
+
+
+def get_session():
+    """Liefert die prozessweite Session (Module überleben Streamlit-Reruns)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
@@ -0,0 +1,123 @@
+"""Finnhub Insider-Transaktionen: paralleler Fetcher mit Rate-Limit + Aggregation"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from alpha_core.http_cache import cached_get
+from alpha_core.rate_limit import FINNHUB_LIMITER
+
+INSIDER_URL = "https://finnhub.io/api/v1/stock/insider-transactions"
+
+# Da Finnhub kein "alle" unterstützt, holen wir beliebte Ticker
+POPULAR_TICKERS = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "AMD", "INTC",
+    "JPM", "BAC", "WFC", "GS", "MS", "V", "MA", "PYPL",
+    "JNJ", "PFE", "UNH", "MRK", "ABBV", "LLY", "BMY",
+    "XOM", "CVX", "COP", "SLB", "OXY",
+    "DIS", "NFLX", "CMCSA", "T", "VZ",
+    "WMT", "COST", "TGT", "HD", "LOW",
+    "BA", "CAT", "GE", "MMM", "HON",
+    "KO", "PEP", "MCD", "SBUX", "NKE",
+    "CRM", "ORCL", "IBM", "CSCO", "ADBE", "NOW", "SNOW", "PLTR",
+    "SQ", "SHOP", "COIN", "HOOD", "SOFI",
+    "RIVN", "LCID", "NIO", "F", "GM",
+    "MRNA", "BNTX", "REGN", "VRTX", "BIIB"
+]
+
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+
+
+def fetch_ticker_insider(ticker, finnhub_key):
+    """Holt die Insider-Transaktionen eines Tickers (Backoff bei 429)"""
+    params = {"symbol": ticker, "token": finnhub_key}
+    resp = cached_get(INSIDER_URL, params=params, endpoint="insider", timeout=5,
+                      limiter=FINNHUB_LIMITER, retries=MAX_RETRIES)
+    if resp.status_code == 200:
+        return resp.json().get("data", []) or []
+    return []
+
+
+def summarize_insider(ticker, transactions, transaction_type="BUY"):
+    """Aggregiert die letzten 20 Transaktionen - Signal-Dict oder None"""
+    buy_value = 0
+    sell_value = 0
+    buy_count = 0
+    sell_count = 0
+    recent_transactions = []
+
+    for t in transactions[:20]:  # Letzte 20 Transaktionen
+        trans_type = t.get("transactionType", "")
+        shares = abs(t.get("share", 0) or 0)
+        price = t.get("transactionPrice", 0) or 0
+        value = shares * price
+        name = t.get("name", "Unknown")
+        date = t.get("transactionDate", "")
+
+        # P-Purchase, S-Sale, A-Grant/Award
+        if "P" in trans_type or "Buy" in trans_type.lower():
+            buy_value += value
+            buy_count += 1
+            recent_transactions.append({"type": "BUY", "name": name, "shares": shares, "value": value, "date": date})
+        elif "S" in trans_type or "Sale" in trans_type.lower():
+            sell_value += value
+            sell_count += 1
+            recent_transactions.append({"type": "SELL", "name": name, "shares": shares, "value": value, "date": date})
+
+    # Filter nach gewünschtem Typ
+    if transaction_type == "BUY" and buy_count > 0 and buy_value > 10000:
+        alpha = int(buy_value / 10000)  # Alpha basiert auf Kaufvolumen
+    elif transaction_type == "SELL" and sell_count > 0 and sell_value > 50000:
+        alpha = int(sell_value / 10000)
+    else:
+        return None
+
+    return {
+        "Ticker": ticker,
+        "Name": "",
+        "InsiderType": transaction_type,
+        "BuyCount": buy_count,
+        "BuyValue": buy_value,
+        "SellCount": sell_count,
+        "SellValue": sell_value,
+        "NetValue": buy_value - sell_value,
+        "Transactions": recent_transactions[:5],
+        "Alpha": alpha,
+    }
+
+
+def rank_insider_signals(signals, transaction_type="BUY", limit=30):
+    """Sortiert nach Kauf- bzw. Verkaufsvolumen"""
+    key = "BuyValue" if transaction_type == "BUY" else "SellValue"
+    return sorted(signals, key=lambda x: x[key], reverse=True)[:limit]
+
+
+def iter_insider_signals(finnhub_key, transaction_type="BUY", tickers=None, max_workers=MAX_WORKERS):
+    """Liefert (ticker, signal_or_None) in Ankunftsreihenfolge - parallel, im Finnhub-Limit"""
+    tickers = POPULAR_TICKERS if tickers is None else tickers
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(fetch_ticker_insider, t, finnhub_key): t for t in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                transactions = future.result()
+            except Exception:
+                transactions = []  # Einzelne Ticker-Fehler überspringen
+            yield ticker, summarize_insider(ticker, transactions, transaction_type) if transactions else None
+    finally:
+        # Bricht der Aufrufer ab, nicht auf die restlichen Requests warten
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_insider_signals(finnhub_key, transaction_type="BUY", on_progress=None, tickers=None):
+    """Alle Ticker abfragen, Signale ranken
+
+    on_progress(done, total, teil_ergebnisse) wird nach jedem Ticker aufgerufen.
+    """
+    tickers = POPULAR_TICKERS if tickers is None else tickers
+    signals = []
+    for done, (ticker, signal) in enumerate(iter_insider_signals(finnhub_key, transaction_type, tickers), 1):
+        if signal:
+            signals.append(signal)
+        if on_progress:
+            on_progress(done, len(tickers), rank_insider_signals(signals, transaction_type))
+    return rank_insider_signals(signals, transaction_type)
@@ -0,0 +1,189 @@
+"""Einzel-Ticker: Suche (CoinGecko / Polygon), Kennzahlen und News ohne Streamlit"""
+from alpha_core.http_cache import cached_get
+from alpha_core.scan import COINGECKO_MARKETS_URL
+from alpha_core.symbols import resolve
+
+COINGECKO_SEARCH_URL = "https://api.coingecko.com/api/v3/search"
+COINGECKO_COIN_URL = "https://api.coingecko.com/api/v3/coins/{coin_id}"
+POLYGON_TICKER_URL = "https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers/{ticker}"
+POLYGON_NEWS_URL = "https://api.polygon.io/v2/reference/news"
+
+
+def calculate_close_position(high, low, close):
+    if high == low or high is None or low is None:
+        return 0.5
+    return (close - low) / (high - low)
+
+
+def calculate_alpha_score(rvol, vortag_pct, change_pct):
+    return round((rvol * 12) + (abs(vortag_pct) * 10) + (abs(change_pct) * 8), 2)
+
+
+# =============================================================================
+# KRYPTO
+# =============================================================================
+def find_coin_id(symbol):
+    """CoinGecko-ID zu einem Symbol: lokaler Symbol-Index, sonst Search API, sonst Top 250"""
+    symbol = symbol.upper()
+    indexed = resolve(symbol, "Krypto")
+    if indexed:
+        return indexed["id"]
+
+    search_resp = cached_get(f"{COINGECKO_SEARCH_URL}?query={symbol.lower()}", endpoint="search", timeout=15)
+
+    if search_resp.status_code == 200:
+        coins_found = search_resp.json().get("coins", [])
+        # Finde den besten Match
+        for c in coins_found:
+            if c.get("symbol", "").upper() == symbol:
+                return c.get("id")
+        # Fallback: Erster Treffer
+        if coins_found:
+            return coins_found[0].get("id")
+
+    # Falls Search nicht klappt, in Markets suchen
+    params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": 250, "page": 1}
+    markets_resp = cached_get(COINGECKO_MARKETS_URL, params=params, endpoint="markets", timeout=30)
+    if markets_resp.status_code == 200:
+        for coin in markets_resp.json():
+            if coin.get("symbol", "").upper() == symbol:
+                return coin.get("id")
+    return None
+
+
+def lookup_crypto(symbol, coin_id=None):
+    """Kennzahlen eines Coins im Format der Suchergebnisse oder None"""
+    coin_id = coin_id or find_coin_id(symbol)
+    if not coin_id:
+        return None
+
+    params = {"localization": "false", "tickers": "false", "community_data": "false", "developer_data": "false"}
+    detail_resp = cached_get(COINGECKO_COIN_URL.format(coin_id=coin_id), params=params, endpoint="coin_detail", timeout=15)
+    if detail_resp.status_code != 200:
+        return None
+
+    coin = detail_resp.json()
+    market_data = coin.get("market_data", {})
+
+    price = market_data.get("current_price", {}).get("usd", 0)
+    return _crypto_row(
+        coin_id, coin.get("symbol", ""), coin.get("name", ""), price,
+        change=market_data.get("price_change_percentage_24h", 0) or 0,
+        vol=market_data.get("total_volume", {}).get("usd", 0),
+        mcap=market_data.get("market_cap", {}).get("usd", 1),
+        high=market_data.get("high_24h", {}).get("usd", price),
+        low=market_data.get("low_24h", {}).get("usd", price),
+    )
+
+
+def crypto_market_row(coin):
+    """Coin-Objekt aus /coins/markets -> gleiches Format wie lookup_crypto"""
+    price = coin.get("current_price") or 0
+    return _crypto_row(
+        coin.get("id"), coin.get("symbol", ""), coin.get("name", ""), price,
+        change=coin.get("price_change_percentage_24h") or 0,
+        vol=coin.get("total_volume") or 0,
+        mcap=coin.get("market_cap") or 1,
+        high=coin.get("high_24h") or price,
+        low=coin.get("low_24h") or price,
+    )
+
+
+def _crypto_row(coin_id, symbol, name, price, change, vol, mcap, high, low):
+    rvol = round((vol / mcap) * 500, 2) if mcap > 0 else 1.0
+    rvol = max(0.1, min(rvol, 100))
+    close_pos = calculate_close_position(high, low, price)
+    alpha = calculate_alpha_score(rvol, change, change)
+
+    return {
+        "Ticker": symbol.upper(),
+        "Name": name,
+        "CoinID": coin_id,
+        "Preis": round(price, 6),
+        "Chg%": round(change, 2),
+        "RVOL": rvol,
+        "Vortag%": round(change, 2),
+        "ClosePos": round(close_pos, 2),
+        "Alpha": alpha,
+        "High24h": high,
+        "Low24h": low,
+        "Volume": vol,
+        "MarketCap": mcap
+    }
+
+
+# =============================================================================
+# AKTIEN
+# =============================================================================
+def lookup_stock(symbol, poly_key):
+    """Kennzahlen einer Aktie aus dem Polygon Einzel-Snapshot oder None"""
+    symbol = symbol.upper()
+    resp = cached_get(POLYGON_TICKER_URL.format(ticker=symbol), params={"apiKey": poly_key}, endpoint="snapshot", timeout=15)
+    if resp.status_code != 200:
+        return None
+
+    ticker_data = resp.json().get("ticker", {})
+    if not ticker_data:
+        return None
+    return stock_snapshot_row(ticker_data, symbol)
+
+
+def stock_snapshot_row(ticker_data, symbol=None):
+    """Ticker-Objekt aus dem Polygon Snapshot -> gleiches Format wie lookup_stock oder None"""
+    symbol = symbol or ticker_data.get("ticker")
+    day = ticker_data.get("day", {}) or {}
+    prev = ticker_data.get("prevDay", {}) or {}
+    last = ticker_data.get("lastTrade", {}) or {}
+
+    price = day.get("c") or last.get("p") or prev.get("c") or 0
+    if price <= 0:
+        return None
+
+    high = day.get("h", price)
+    low = day.get("l", price)
+
+    change = ticker_data.get("todaysChangePerc", 0) or 0
+
+    vol = day.get("v", 0)
+    prev_vol = prev.get("v", 1)
+    rvol = round(vol / prev_vol, 2) if prev_vol > 0 else 1.0
+
+    prev_open = prev.get("o", 0)
+    prev_close = prev.get("c", 0)
+    vortag = round(((prev_close - prev_open) / prev_open) * 100, 2) if prev_open > 0 else 0
+
+    close_pos = calculate_close_position(high, low, price)
+    alpha = calculate_alpha_score(rvol, vortag, change)
+
+    return {
+        "Ticker": symbol,
+        "Name": symbol,
+        "Preis": round(price, 4),
+        "Chg%": round(change, 2),
+        "RVOL": rvol,
+        "Vortag%": vortag,
+        "ClosePos": round(close_pos, 2),
+        "Alpha": alpha,
+        "High24h": high,
+        "Low24h": low,
+        "Volume": vol
+    }
+
+
+def lookup_symbol(symbol, market_type, poly_key=None):
+    """Einzel-Suche für beide Märkte"""
+    if market_type == "Krypto":
+        return lookup_crypto(symbol)
+    return lookup_stock(symbol, poly_key)
+
+
+def fetch_news_text(ticker, poly_key, limit=3):
+    """Polygon-News als Stichpunkte für den Prompt ("Keine News." wenn leer/Fehler)"""
+    try:
+        resp = cached_get(f"{POLYGON_NEWS_URL}?ticker={ticker}&limit={limit}&apiKey={poly_key}", endpoint="news", timeout=10)
+        news_items = resp.json().get("results", [])
+    except Exception:
+        news_items = []
+    if not news_items:
+        return "Keine News."
+    return "\n".join([f"- {n.get('title', 'N/A')}" for n in news_items])
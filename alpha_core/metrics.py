@@ -0,0 +1,337 @@
+"""Spaltenbasierte Scan-Engine: Snapshot -> Kennzahlen-Tabelle -> Ergebnis-Dicts"""
+import numpy as np
+import pandas as pd
+
+from alpha_core.filters import compile_filters, filter_mask
+
+
+# =============================================================================
+# ARRAY HELPER
+# =============================================================================
+def round_exact(values, ndigits):
+    """np.round mit exakt derselben Rundung wie Pythons round()"""
+    values = np.asarray(values, dtype=float)
+    out = np.round(values, ndigits)
+    # np.round skaliert mit Fließkomma-Fehler - nur Werte nahe .5 nachrunden
+    scaled = values * 10.0 ** ndigits
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in near_half:
+        out[i] = round(float(values[i]), ndigits)
+    return out
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_matrix(rows, width):
+    """Liste gleich langer Tupel -> float-Matrix (kaputte Einzelwerte -> NaN)"""
+    try:
+        return np.array(rows, dtype=float).reshape(len(rows), width)
+    except (TypeError, ValueError):
+        return np.array([[_to_float(v) for v in row] for row in rows], dtype=float).reshape(len(rows), width)
+
+
+def _first_nonzero(*columns):
+    """Vektorisiertes `a or b or c`: erster Wert != 0 pro Zeile"""
+    result = columns[-1]
+    for col in reversed(columns[:-1]):
+        result = np.where(col != 0, col, result)
+    return result
+
+
+# =============================================================================
+# AKTIEN (POLYGON SNAPSHOT)
+# =============================================================================
+def _flatten_stock(t):
+    """Ein Snapshot-Eintrag -> flaches Tupel (Reihenfolge siehe build_stock_metrics)"""
+    day = t.get("day", {}) or {}
+    prev = t.get("prevDay", {}) or {}
+    last = t.get("lastTrade", {}) or {}
+    minute_data = t.get("min", {}) or {}
+    change = t.get("todaysChangePerc")
+    return (
+        day.get("o") or 0.0, day.get("h") or 0.0, day.get("l") or 0.0, day.get("c") or 0.0, day.get("v") or 0.0,
+        prev.get("o") or 0.0, prev.get("h") or 0.0, prev.get("l") or 0.0, prev.get("c") or 0.0, prev.get("v") or 0.0,
+        last.get("p") or 0.0, minute_data.get("c") or 0.0, minute_data.get("v") or 0.0,
+        np.nan if change is None else change,
+    )
+
+
+def build_stock_metrics(tickers):
+    """Wandelt den Polygon-Snapshot einmalig in eine Kennzahlen-Tabelle um"""
+    raw = _to_matrix([_flatten_stock(t) for t in tickers], 14)
+    return stock_metrics_from_raw([t.get("ticker", "") for t in tickers], raw)
+
+
+def stock_metrics_from_raw(names, raw):
+    """Kennzahlen aus der flachen Rohmatrix (Zeilen wie _flatten_stock)"""
+    (day_open, day_high, day_low, day_close, day_vol,
+     prev_open, prev_high, prev_low, prev_close, prev_vol,
+     last_price, min_close, min_vol, change) = raw.T
+
+    price = _first_nonzero(day_close, last_price, min_close, prev_close)
+
+    # OHLC Daten
+    open_price = _first_nonzero(day_open, price)
+    high = _first_nonzero(day_high, price)
+    low = _first_nonzero(day_low, price)
+    close = _first_nonzero(day_close, price)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # GAP: Open über Previous High (Gap Up) bzw. unter Previous Low (Gap Down)
+        has_prev_range = (prev_high > 0) & (prev_low > 0)
+        gap_pct = np.where(
+            has_prev_range & (open_price > prev_high), ((open_price - prev_high) / prev_high) * 100,
+            np.where(has_prev_range & (open_price < prev_low), ((open_price - prev_low) / prev_low) * 100, 0.0)
+        )
+
+        # WICKS relativ zur Kerzen-Range
+        candle_range = np.where(high > low, high - low, 0.0001)
+        upper_wick_pct = ((high - np.maximum(open_price, close)) / candle_range) * 100
+        lower_wick_pct = ((np.minimum(open_price, close) - low) / candle_range) * 100
+
+        # Change: Polygon-Wert, sonst aus Previous Close ableiten
+        derived_change = np.where(prev_close > 0, ((price - prev_close) / prev_close) * 100, 0.0)
+        change = np.where(np.isnan(change), derived_change, change)
+
+        vol = _first_nonzero(day_vol, min_vol)
+        rvol = np.where((prev_vol > 0) & (vol > 0), round_exact(vol / prev_vol, 2), 1.0)
+        rvol = np.minimum(rvol, 999.0)
+
+        vortag_chg = np.where(prev_open > 0, round_exact(((prev_close - prev_open) / prev_open) * 100, 2), 0.0)
+
+        close_pos = np.where(high == low, 0.5, (close - low) / (high - low))
+
+    return pd.DataFrame({
+        "Ticker": names,
+        "Preis": price,
+        "Change %": change,
+        "Vortag %": vortag_chg,
+        "RVOL": rvol,
+        "Close Position": close_pos,
+        "Gap %": gap_pct,
+        "Upper Wick %": upper_wick_pct,
+        "Lower Wick %": lower_wick_pct,
+    })
+
+
+def stock_results(metrics):
+    """Baut die Ergebnis-Dicts (gleiches Format wie bisher) für die Treffer-Zeilen"""
+    rvol = metrics["RVOL"].to_numpy()
+    vortag_chg = metrics["Vortag %"].to_numpy()
+    change = metrics["Change %"].to_numpy()
+    alpha = round_exact((rvol * 12) + (np.abs(vortag_chg) * 10) + (np.abs(change) * 8), 2)
+
+    columns = zip(
+        metrics["Ticker"].tolist(),
+        round_exact(metrics["Preis"], 4).tolist(),
+        round_exact(change, 2).tolist(),
+        rvol.tolist(),
+        vortag_chg.tolist(),
+        round_exact(metrics["Close Position"], 2).tolist(),
+        alpha.tolist(),
+        round_exact(metrics["Gap %"], 2).tolist(),
+        round_exact(metrics["Upper Wick %"], 1).tolist(),
+        round_exact(metrics["Lower Wick %"], 1).tolist(),
+    )
+    return [
+        {
+            "Ticker": ticker, "Name": "",
+            "Preis": price, "Chg%": chg,
+            "RVOL": rv, "Vortag%": vortag,
+            "ClosePos": close_pos, "Alpha": a,
+            "Gap%": gap,
+            "UpperWick%": upper_wick,
+            "LowerWick%": lower_wick,
+        }
+        for ticker, price, chg, rv, vortag, close_pos, a, gap, upper_wick, lower_wick in columns
+    ]
+
+
+def _stock_candidates(metrics):
+    """(scanbare Zeilen, Zeilen ohne Preis)"""
+    # Zeilen mit kaputten Werten wurden früher per except übersprungen
+    valid = np.isfinite(metrics.drop(columns="Ticker").to_numpy()).all(axis=1)
+    no_price = metrics["Preis"].to_numpy() <= 0
+    return valid & ~no_price, no_price
+
+
+def scan_stock_snapshot(tickers, filters, additional_filters):
+    """Kompletter Aktien-Scan über den Snapshot -> (results, skipped_no_price, skipped_filter)"""
+    metrics = build_stock_metrics(tickers)
+    candidates, no_price = _stock_candidates(metrics)
+
+    match = candidates & filter_mask(metrics, compile_filters(filters, additional_filters))
+    skipped_filter = int(candidates.sum() - match.sum())
+
+    return stock_results(metrics[match]), int(no_price.sum()), skipped_filter
+
+
+# =============================================================================
+# KRYPTO (COINGECKO MARKETS)
+# =============================================================================
+def _flatten_coin(coin):
+    """Ein /coins/markets-Eintrag -> flaches Tupel (Reihenfolge siehe build_crypto_metrics)"""
+    return (
+        coin.get("current_price") or 0.0,
+        coin.get("price_change_percentage_24h") or 0.0,
+        coin.get("price_change_percentage_7d_in_currency") or 0.0,
+        coin.get("high_24h") or 0.0,
+        coin.get("low_24h") or 0.0,
+        coin.get("total_volume") or 0.0,
+        coin.get("market_cap") or 1.0,
+    )
+
+
+def build_crypto_metrics(coins):
+    """Wandelt die CoinGecko-Markets-Liste einmalig in eine Kennzahlen-Tabelle um"""
+    raw = _to_matrix([_flatten_coin(c) for c in coins], 7)
+    price, change_24h, change_7d, high_24h, low_24h, vol_24h, market_cap = raw.T
+
+    high_24h = _first_nonzero(high_24h, price)
+    low_24h = _first_nonzero(low_24h, price)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # VORTAG: aus 7d-Durchschnitt approximiert (CoinGecko liefert keinen Vortag)
+        avg_daily_7d = change_7d / 7
+        vortag_chg = np.where(
+            np.abs(change_24h) > np.abs(avg_daily_7d) * 3,
+            round_exact(avg_daily_7d, 2),  # Heute ist ein Ausreißer - Vortag war wahrscheinlich ruhiger
+            round_exact(avg_daily_7d * 1.5, 2)
+        )
+        vortag_chg = np.where((change_7d != 0) & (change_24h != 0), vortag_chg, 0.0)
+
+        # Approximation: Open = Price / (1 + change/100)
+        open_price = np.where(change_24h != -100, price / (1 + change_24h / 100), price)
+
+        candle_range = np.where(high_24h > low_24h, high_24h - low_24h, 0.0001)
+        upper_wick_pct = ((high_24h - np.maximum(open_price, price)) / candle_range) * 100
+        lower_wick_pct = ((np.minimum(open_price, price) - low_24h) / candle_range) * 100
+
+        # RVOL (Krypto-spezifisch): Volumen relativ zur Market Cap
+        rvol = np.clip(round_exact(((vol_24h / market_cap) * 100) * 5, 2), 0.1, 100)
+        rvol = np.where(market_cap > 0, rvol, 1.0)
+
+        close_pos = np.where(high_24h == low_24h, 0.5, (price - low_24h) / (high_24h - low_24h))
+
+    return pd.DataFrame({
+        "Ticker": [(c.get("symbol", "") or "").upper() for c in coins],
+        "Name": [(c.get("name", "") or "")[:15] for c in coins],
+        "CoinID": [c.get("id", "") or "" for c in coins],
+        "Preis": price,
+        "Change %": change_24h,
+        "Vortag %": vortag_chg,
+        "RVOL": rvol,
+        "Close Position": close_pos,
+        # Krypto handelt 24/7 - keine echten Gaps, NaN matcht keinen Gap-Filter
+        "Gap %": np.full(len(coins), np.nan),
+        "Upper Wick %": upper_wick_pct,
+        "Lower Wick %": lower_wick_pct,
+    })
+
+
+def crypto_results(metrics):
+    """Baut die Krypto-Ergebnis-Dicts (gleiches Format wie bisher) für die Treffer-Zeilen"""
+    rvol = metrics["RVOL"].to_numpy()
+    vortag_chg = metrics["Vortag %"].to_numpy()
+    change = metrics["Change %"].to_numpy()
+    alpha = round_exact((rvol * 12) + (np.abs(vortag_chg) * 10) + (np.abs(change) * 8), 2)
+
+    columns = zip(
+        metrics["Ticker"].tolist(),
+        metrics["Name"].tolist(),
+        metrics["CoinID"].tolist(),
+        round_exact(metrics["Preis"], 6).tolist(),
+        round_exact(change, 2).tolist(),
+        rvol.tolist(),
+        round_exact(vortag_chg, 2).tolist(),
+        round_exact(metrics["Close Position"], 2).tolist(),
+        alpha.tolist(),
+        round_exact(metrics["Upper Wick %"], 1).tolist(),
+        round_exact(metrics["Lower Wick %"], 1).tolist(),
+    )
+    return [
+        {
+            "Ticker": ticker,
+            "Name": name,
+            "Preis": price,
+            "Chg%": chg,
+            "RVOL": rv,
+            "Vortag%": vortag,
+            "ClosePos": close_pos,
+            "Alpha": a,
+            "UpperWick%": upper_wick,
+            "LowerWick%": lower_wick,
+            "Gap%": 0,  # Immer 0 bei Krypto (keine echten Gaps)
+            "CoinID": coin_id,
+        }
+        for ticker, name, coin_id, price, chg, rv, vortag, close_pos, a, upper_wick, lower_wick in columns
+    ]
+
+
+def _crypto_candidates(metrics):
+    numeric = metrics.drop(columns=["Ticker", "Name", "CoinID", "Gap %"]).to_numpy()
+    return np.isfinite(numeric).all(axis=1) & (metrics["Preis"].to_numpy() > 0)
+
+
+def scan_crypto_markets(coins, filters, additional_filters):
+    """Kompletter Krypto-Scan über /coins/markets -> (results, 0, skipped_filter)"""
+    metrics = build_crypto_metrics(coins)
+    candidates = _crypto_candidates(metrics)
+
+    match = candidates & filter_mask(metrics, compile_filters(filters, additional_filters))
+    skipped_filter = int(candidates.sum() - match.sum())
+
+    return crypto_results(metrics[match]), 0, skipped_filter
+
+
+# =============================================================================
+# MULTI-STRATEGIE (EIN DURCHLAUF)
+# =============================================================================
+def _scan_many(metrics, candidates, skipped_no_price, strategies, additional_filters, to_results):
+    """Kennzahlen liegen schon vor - pro Strategie nur noch die Filter-Maske
+
+    Ergebnis-Dicts werden einmal für alle Zeilen mit mindestens einem Treffer gebaut.
+    """
+    masks = {
+        name: candidates & filter_mask(metrics, compile_filters(filters, additional_filters))
+        for name, filters in strategies.items()
+    }
+    hit_rows = np.flatnonzero(np.logical_or.reduce(list(masks.values()))) if masks else np.array([], dtype=int)
+    rows = to_results(metrics.iloc[hit_rows])
+    position = np.full(len(metrics), -1)
+    position[hit_rows] = np.arange(len(hit_rows))
+
+    per_strategy = {}
+    for name, match in masks.items():
+        results = [rows[i] for i in position[match]]
+        per_strategy[name] = (results, skipped_no_price, int(candidates.sum() - match.sum()))
+
+    matrix = pd.DataFrame({name: match[hit_rows] for name, match in masks.items()})
+    matrix.insert(0, "Ticker", metrics["Ticker"].to_numpy()[hit_rows])
+    if "CoinID" in metrics:
+        # Krypto-Symbole sind nicht eindeutig - die ID identifiziert die Zeile
+        matrix.insert(1, "CoinID", metrics["CoinID"].to_numpy()[hit_rows])
+    matrix["Treffer"] = matrix[list(masks)].sum(axis=1).astype(int)
+    return per_strategy, matrix
+
+
+def scan_stock_strategies(tickers, strategies, additional_filters):
+    """Alle Strategien über einen Snapshot -> (per_strategy, matrix)
+
+    strategies: {Name: Filter-Dict} (nur Range-Filter). per_strategy[Name] hat das
+    Format von scan_stock_snapshot, matrix ist Ticker x Strategie (bool) + Treffer.
+    """
+    metrics = build_stock_metrics(tickers)
+    candidates, no_price = _stock_candidates(metrics)
+    return _scan_many(metrics, candidates, int(no_price.sum()), strategies, additional_filters, stock_results)
+
+
+def scan_crypto_strategies(coins, strategies, additional_filters):
+    """Wie scan_stock_strategies, für CoinGecko /coins/markets"""
+    metrics = build_crypto_metrics(coins)
+    return _scan_many(metrics, _crypto_candidates(metrics), 0, strategies, additional_filters, crypto_results)
@@ -0,0 +1,238 @@
+"""Watchlist-Monitor: S/R-Kreuzungen und neue Strategie-Treffer als Alerts
+
+Läuft als Job im Hintergrund-Scanner (einmal pro Minute) oder headless:
+
+    python -m alpha_core.monitor            # Endlosschleife im MONITOR_INTERVAL
+    python -m alpha_core.monitor --once     # ein Durchlauf (Cron)
+
+Pro Durchlauf werden die Watchlist-Symbole gebündelt geholt (alpha_core.watchlist.fetch_raw).
+Ausgewertet werden nur Symbole, deren Kurs-Zeitstempel sich seit dem letzten Durchlauf
+geändert hat: Strategie-Filter auf genau diese Teilmenge. S/R nur für Symbole mit neuem
+Preis, parallel über batch_sr_levels; bei Krypto laden pro Durchlauf höchstens
+MONITOR_SR_FETCH Coins nach (CoinGecko-Limit), der Rest nutzt den lokalen Verlauf.
+Der erste Durchlauf pro Symbol setzt nur den Ausgangszustand, Alerts gibt es ab dem zweiten.
+
+Senken: JSON-Lines-Datei (ALPHA_ALERT_FILE) und optional ein Webhook (ALPHA_ALERT_WEBHOOK,
+POST {"alerts": [...]}).
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from alpha_core.http_session import get_session
+from alpha_core.metrics import scan_crypto_strategies, scan_stock_strategies
+from alpha_core.scan import range_strategies
+from alpha_core.sr import batch_sr_levels
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS
+from alpha_core.watchlist import entry_key, fetch_raw, load_watchlist
+
+MONITOR_INTERVAL = 60
+MONITOR_TIMEFRAME = os.environ.get("ALPHA_MONITOR_TIMEFRAME", "4H")
+ALERT_FILE = os.environ.get("ALPHA_ALERT_FILE", os.path.join(os.path.expanduser("~"), ".alpha_station", "alerts.jsonl"))
+ALERT_WEBHOOK = os.environ.get("ALPHA_ALERT_WEBHOOK")
+RECENT_ALERTS = 200
+MONITOR_SR_FETCH = 5    # Krypto-OHLC-Abrufe pro Durchlauf (von 30/min, die sich alle teilen)
+
+_lock = threading.Lock()
+_seen = {}                          # (Markt, Ticker) -> {"stamp", "price", "levels", "strategies"}
+_recent = deque(maxlen=RECENT_ALERTS)
+
+
+# =============================================================================
+# SENKEN
+# =============================================================================
+def emit_alerts(alerts, alert_file=None, webhook=None):
+    """Alerts in Speicher, Datei und Webhook - Fehler einer Senke stoppen die anderen nicht"""
+    if not alerts:
+        return
+    alert_file = alert_file or ALERT_FILE
+    webhook = webhook or ALERT_WEBHOOK
+    with _lock:
+        _recent.extend(alerts)
+        try:
+            os.makedirs(os.path.dirname(alert_file) or ".", exist_ok=True)
+            with open(alert_file, "a", encoding="utf-8") as f:
+                for alert in alerts:
+                    f.write(json.dumps(alert, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            pass
+    if webhook:
+        try:
+            get_session().post(webhook, json={"alerts": alerts}, timeout=5)
+        except Exception:
+            pass
+
+
+def recent_alerts(limit=50):
+    """Neueste Alerts zuerst - nach einem Neustart aus dem Ende der Alert-Datei"""
+    with _lock:
+        if not _recent:
+            try:
+                with open(ALERT_FILE, encoding="utf-8") as f:
+                    _recent.extend(json.loads(line) for line in deque(f, maxlen=RECENT_ALERTS) if line.strip())
+            except (OSError, ValueError):
+                pass
+        return list(_recent)[::-1][:limit]
+
+
+# =============================================================================
+# AUSWERTUNG
+# =============================================================================
+def _stock_quote(t):
+    day = t.get("day", {}) or {}
+    price = day.get("c") or (t.get("lastTrade", {}) or {}).get("p") or (t.get("min", {}) or {}).get("c") \
+        or (t.get("prevDay", {}) or {}).get("c")
+    return t.get("updated") or price, price
+
+
+def _matched(matrix, strategy_names, key="Ticker"):
+    """Ticker (Krypto: CoinID) -> Menge der Strategien mit Treffer (aus der Strategie-Matrix)"""
+    return {
+        row[key]: {name for name in strategy_names if row[name]}
+        for row in matrix.to_dict("records")
+    }
+
+
+def _alert(kind, market_type, ticker, price, message, **extra):
+    return {"time": datetime.now().isoformat(timespec="seconds"), "type": kind, "market": market_type,
+            "ticker": ticker, "price": price, "message": message, **extra}
+
+
+def _crossings(market_type, ticker, prev_price, price, levels):
+    """Level zwischen altem und neuem Preis -> ein Alert pro gekreuztem Level"""
+    alerts = []
+    low, high = sorted((prev_price, price))
+    for kind, level in levels:
+        if not (low < level <= high):
+            continue
+        direction = "up" if price > prev_price else "down"
+        label = "Widerstand" if kind == "resistance" else "Support"
+        arrow = "⬆️ über" if direction == "up" else "⬇️ unter"
+        alerts.append(_alert("sr_cross", market_type, ticker, price,
+                             f"{ticker} {arrow} {label} ${level:,.4f} (${price:,.4f})",
+                             level=level, level_kind=kind, direction=direction))
+    return alerts
+
+
+def _sr_levels(market_type, changed, poly_key, timeframe):
+    """S/R für Symbole mit neuem Preis -> {Symbol: [(Art, Level)]}; fehlt ein Symbol, bleiben die alten Levels
+
+    changed: [(Ticker, Preis, CoinID)], Symbol ist CoinID oder Ticker (wie in der Watchlist).
+    Symbole ohne bisherige Levels laden zuerst nach, damit bei gedeckelten Abrufen jeder
+    Durchlauf andere Coins holt.
+    """
+    moved = [(t, p, c) for t, p, c in changed
+             if p and (_seen.get((market_type, c or t)) or {}).get("price") != p]
+    moved.sort(key=lambda s: bool((_seen.get((market_type, s[2] or s[0])) or {}).get("levels")))
+    rows = [{"Ticker": t, "Preis": p, "CoinID": c} for t, p, c in moved]
+    max_fetch = MONITOR_SR_FETCH if market_type == "Krypto" else None
+    levels = {}
+    for row, ((supports, resistances), fib_info) in zip(
+            rows, batch_sr_levels(rows, market_type, timeframe=timeframe, poly_key=poly_key, max_fetch=max_fetch)):
+        # Ohne Verlauf sind die Levels nur ±x% vom Preis und wandern mit - keine Kreuzungen
+        if fib_info:
+            levels[row["CoinID"] or row["Ticker"]] = [("support", s) for s in supports] + [("resistance", r) for r in resistances]
+    return levels
+
+
+def _evaluate_symbol(market_type, ticker, stamp, price, strategies_now, levels, symbol=None):
+    """Neuer Kurs eines Symbols -> Alerts; Zustand wird fortgeschrieben
+
+    levels None: keine neuen S/R-Levels in diesem Durchlauf, die bisherigen gelten weiter.
+    symbol: Zustands-Schlüssel, falls nicht der Ticker (Krypto: CoinGecko-ID).
+    """
+    key = (market_type, symbol or ticker)
+    prev = _seen.get(key)
+    if levels is None:
+        levels = prev["levels"] if prev else []
+    alerts = []
+    if prev is not None and price and prev["price"]:
+        # Levels von vor der Bewegung (fehlten sie damals: die aktuellen)
+        alerts += _crossings(market_type, ticker, prev["price"], price, prev["levels"] or levels)
+        for name in sorted(strategies_now - prev["strategies"]):
+            alerts.append(_alert("strategy_entry", market_type, ticker, price,
+                                 f"{ticker} erfüllt jetzt {name} (${price:,.4f})", strategy=name))
+    _seen[key] = {"stamp": stamp, "price": price, "levels": levels, "strategies": strategies_now}
+    return alerts
+
+
+def evaluate(entries, poly_key=None, strategies=None, additional_filters=DEFAULT_ADDITIONAL_FILTERS,
+             timeframe=MONITOR_TIMEFRAME):
+    """Ein Durchlauf über die Watchlist -> (alerts, stats)
+
+    strategies: {Markt: {Name: Filter}} (Standard: alle Range-Strategien des Marktes).
+    """
+    strategies = strategies or {m: range_strategies(m) for m in ("Krypto", "Aktien")}
+    stock_objs, coin_objs = fetch_raw(entries, poly_key)
+    watched = {entry_key(e) for e in entries}
+    coin_tickers = {e.get("coin_id"): e["ticker"] for e in entries if e["market"] == "Krypto"}
+
+    # Nur Symbole mit neuem Kurs-Zeitstempel weiter auswerten
+    changed_stocks = [t for t in stock_objs
+                      if _seen.get(("Aktien", t.get("ticker")), {}).get("stamp") != _stock_quote(t)[0]]
+    changed_coins = [c for c in coin_objs
+                     if _seen.get(("Krypto", c.get("id")), {}).get("stamp")
+                     != (c.get("last_updated"), c.get("current_price"))]
+
+    alerts = []
+    if changed_stocks:
+        _, matrix = scan_stock_strategies(changed_stocks, strategies["Aktien"], additional_filters)
+        matched = _matched(matrix, strategies["Aktien"])
+        levels = _sr_levels("Aktien", [(t.get("ticker"), _stock_quote(t)[1], None) for t in changed_stocks],
+                            poly_key, timeframe)
+        for t in changed_stocks:
+            stamp, price = _stock_quote(t)
+            ticker = t.get("ticker")
+            alerts += _evaluate_symbol("Aktien", ticker, stamp, price, matched.get(ticker, set()), levels.get(ticker))
+    if changed_coins:
+        _, matrix = scan_crypto_strategies(changed_coins, strategies["Krypto"], additional_filters)
+        matched = _matched(matrix, strategies["Krypto"], key="CoinID")
+        coin_rows = [(coin_tickers.get(c.get("id")) or (c.get("symbol") or "").upper(), c) for c in changed_coins]
+        levels = _sr_levels("Krypto", [(ticker, c.get("current_price"), c.get("id")) for ticker, c in coin_rows],
+                            None, timeframe)
+        for ticker, c in coin_rows:
+            stamp = (c.get("last_updated"), c.get("current_price"))
+            alerts += _evaluate_symbol("Krypto", ticker, stamp, c.get("current_price"),
+                                       matched.get(c.get("id"), set()), levels.get(c.get("id")), symbol=c.get("id"))
+
+    # Entfernte Einträge vergessen
+    for key in [k for k in _seen if k not in watched]:
+        del _seen[key]
+
+    stats = {"symbols": len(stock_objs) + len(coin_objs), "evaluated": len(changed_stocks) + len(changed_coins),
+             "alerts": len(alerts)}
+    return alerts, stats
+
+
+def run_monitor_cycle(poly_key=None):
+    """Watchlist laden, auswerten, Alerts ausgeben -> stats"""
+    entries = load_watchlist()
+    if not entries:
+        return {"symbols": 0, "evaluated": 0, "alerts": 0}
+    alerts, stats = evaluate(entries, poly_key)
+    emit_alerts(alerts)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m alpha_core.monitor")
+    parser.add_argument("--once", action="store_true", help="Ein Durchlauf statt Endlosschleife")
+    parser.add_argument("--interval", type=float, default=MONITOR_INTERVAL)
+    parser.add_argument("--poly-key", default=os.environ.get("POLYGON_KEY"))
+    args = parser.parse_args(argv)
+
+    while True:
+        stats = run_monitor_cycle(args.poly_key)
+        print(f"{datetime.now():%H:%M:%S} {stats['evaluated']}/{stats['symbols']} ausgewertet, {stats['alerts']} Alerts",
+              flush=True)
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
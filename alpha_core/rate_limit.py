@@ -0,0 +1,59 @@
+"""Thread-sicherer Token-Bucket für API-Quoten (Finnhub, CoinGecko, ...)"""
+import threading
+import time
+
+
+class TokenBucket:
+    """rate_per_minute Tokens pro Minute, höchstens capacity auf Vorrat (Burst)
+
+    In einem beliebigen 60-s-Fenster gehen höchstens capacity + rate_per_minute Aufrufe
+    durch (voller Vorrat am Fensteranfang + Nachfüllung im Fenster). Für eine Quote von
+    N/min also capacity + rate_per_minute <= N wählen (window_limit()).
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def window_limit(self, seconds=60.0):
+        """Maximale Aufrufe in einem Fenster von seconds Sekunden"""
+        return int(self.capacity + self.rate * seconds)
+
+    def acquire(self):
+        """Blockiert, bis ein Token frei ist"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def drain(self):
+        """Nach einem 429: Vorrat verwerfen, damit alle Worker gemeinsam abbremsen"""
+        with self.lock:
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+
+
+def retry_delay(resp, attempt, base=1.0):
+    """Wartezeit nach einem 429: Retry-After-Header, sonst exponentieller Backoff"""
+    retry_after = getattr(resp, "headers", {}).get("Retry-After")
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return base * 2 ** attempt
+
+
+# Prozessweite Limiter pro API - alle Aufrufer teilen sich die Quote
+# Fenster-Rechnung: capacity + rate_per_minute <= Quote pro Minute
+# Finnhub Free Tier: 60 Calls/Minute -> 10 Burst + 50/min = 60 in jedem 60-s-Fenster
+FINNHUB_LIMITER = TokenBucket(rate_per_minute=50, capacity=10)
+# CoinGecko Free/Demo: ca. 30 Calls/Minute -> 10 Burst + 20/min = 30 in jedem 60-s-Fenster
+COINGECKO_LIMITER = TokenBucket(rate_per_minute=20, capacity=10)
@@ -0,0 +1,148 @@
+"""Lokaler Replay-Server: spielt aufgezeichnete Polygon-Snapshots als WebSocket-Stream ab
+
+Spricht dasselbe Protokoll wie socket.polygon.io (status connected -> auth ->
+subscribe -> Arrays von A-Events). Jeder Ticker, dessen "updated" sich zwischen zwei
+Aufnahmen geändert hat, wird als Sekunden-Aggregat aus seiner min-Bar gesendet.
+
+    python -m alpha_core.replay record DIR --every 30     # Snapshots aufzeichnen
+    python -m alpha_core.replay serve DIR --speed 10      # abspielen auf ws://localhost:8765
+
+Der Stream wird dann mit ALPHA_STREAM_URL=ws://localhost:8765 und der ersten Aufnahme
+als Startzustand gestartet (start_stream(key, url, seed=load_recording(DIR)[0]["tickers"])).
+Benötigt `websockets` (>= 11).
+"""
+import argparse
+import json
+import os
+import time
+
+REPLAY_PORT = 8765
+BATCH_SIZE = 500  # A-Events pro Nachricht
+
+
+# =============================================================================
+# AUFNAHMEN
+# =============================================================================
+def record_snapshot(poly_key, directory):
+    """Aktuellen REST-Snapshot als <Zeitstempel>.json ablegen -> Pfad"""
+    from alpha_core.scan import fetch_stock_snapshot
+
+    tickers = fetch_stock_snapshot(poly_key)
+    recorded = time.time()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{int(recorded * 1000)}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"recorded": recorded, "tickers": tickers}, f)
+    return path
+
+
+def load_recording(directory):
+    """Alle Aufnahmen eines Verzeichnisses, chronologisch"""
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            frames.append(json.load(f))
+    return sorted(frames, key=lambda frame: frame["recorded"])
+
+
+def snapshot_events(previous, tickers):
+    """A-Events für alle Ticker, die sich seit der vorherigen Aufnahme geändert haben"""
+    seen = {t.get("ticker"): t.get("updated") for t in previous}
+    events = []
+    for t in tickers:
+        sym = t.get("ticker")
+        updated = t.get("updated")
+        if not sym or (updated is not None and seen.get(sym) == updated):
+            continue
+        day = t.get("day") or {}
+        bar = t.get("min") or {}
+        close = bar.get("c") or day.get("c") or (t.get("lastTrade") or {}).get("p")
+        if not close:
+            continue
+        end = updated // 1_000_000 if updated else int(time.time() * 1000)
+        events.append({
+            "ev": "A", "sym": sym,
+            "o": bar.get("o") or close, "h": bar.get("h") or close, "l": bar.get("l") or close, "c": close,
+            "v": bar.get("v") or 0, "av": bar.get("av") or day.get("v") or 0,
+            "op": day.get("o"), "a": day.get("vw"),
+            "s": end - 1000, "e": end,
+        })
+    return events
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+def _handshake(ws):
+    ws.send(json.dumps([{"ev": "status", "status": "connected", "message": "Connected Successfully"}]))
+    while True:
+        msg = json.loads(ws.recv())
+        if msg.get("action") == "auth":
+            ws.send(json.dumps([{"ev": "status", "status": "auth_success", "message": "authenticated"}]))
+        elif msg.get("action") == "subscribe":
+            ws.send(json.dumps([{"ev": "status", "status": "success", "message": f"subscribed to: {msg.get('params')}"}]))
+            return
+
+
+def make_handler(frames, speed=1.0, loop=False):
+    """Verbindungs-Handler: Aufnahmen im (durch speed geteilten) Originaltakt senden"""
+    def handler(ws):
+        _handshake(ws)
+        while True:
+            previous = frames[0]["tickers"]
+            for prev_frame, frame in zip(frames, frames[1:]):
+                time.sleep(max(frame["recorded"] - prev_frame["recorded"], 0) / speed)
+                events = snapshot_events(previous, frame["tickers"])
+                for i in range(0, len(events), BATCH_SIZE):
+                    ws.send(json.dumps(events[i:i + BATCH_SIZE]))
+                previous = frame["tickers"]
+            if not loop:
+                return
+    return handler
+
+
+def serve(directory, host="localhost", port=REPLAY_PORT, speed=1.0, loop=False):
+    """Blockiert: Replay-Server für die Aufnahmen in directory"""
+    from websockets.sync.server import serve as ws_serve
+
+    frames = load_recording(directory)
+    if len(frames) < 2:
+        raise ValueError(f"Mindestens zwei Aufnahmen nötig in {directory}")
+    with ws_serve(make_handler(frames, speed, loop), host, port) as server:
+        print(f"Replay: {len(frames)} Aufnahmen auf ws://{host}:{port} (x{speed})")
+        server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m alpha_core.replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="REST-Snapshots aufzeichnen")
+    rec.add_argument("directory")
+    rec.add_argument("--every", type=float, default=30.0, help="Sekunden zwischen Aufnahmen")
+    rec.add_argument("--count", type=int, default=0, help="Anzahl Aufnahmen (0 = endlos)")
+    rec.add_argument("--key", default=os.environ.get("POLYGON_KEY"), help="Polygon-Key (Standard: $POLYGON_KEY)")
+    srv = sub.add_parser("serve", help="Aufnahmen als WebSocket abspielen")
+    srv.add_argument("directory")
+    srv.add_argument("--host", default="localhost")
+    srv.add_argument("--port", type=int, default=REPLAY_PORT)
+    srv.add_argument("--speed", type=float, default=1.0)
+    srv.add_argument("--loop", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.directory, args.host, args.port, args.speed, args.loop)
+        return
+    if not args.key:
+        parser.error("Polygon-Key fehlt (--key oder POLYGON_KEY)")
+    n = 0
+    while not args.count or n < args.count:
+        print(record_snapshot(args.key, args.directory))
+        n += 1
+        if not args.count or n < args.count:
+            time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
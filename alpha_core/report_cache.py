@@ -0,0 +1,218 @@
+"""Cache für generierte AI-Reports, Schlüssel = Fingerprint des Marktzustands
+
+Gleicher Ticker, gleicher Preis-Bucket, gleiche S/R-/Fib-Levels, gleiche News und
+gleiche Strategie -> gleicher Report, kein neuer Anthropic-Aufruf. Ein JSON pro
+Report auf der Platte, damit Cache und Verlauf einen Neustart überleben.
+
+Der Fingerprint (= Dateiname) beginnt mit Art und Ticker ("report.AAPL.<hash>"):
+der Verlauf eines Tickers liest nur dessen Dateien, abgelaufene Screening-Chunks
+lassen sich ohne Parsen erkennen und werden regelmäßig gelöscht.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+REPORT_DIR = os.environ.get("ALPHA_REPORT_DIR", os.path.join(os.path.expanduser("~"), ".alpha_station", "reports"))
+
+# Gültigkeit pro Report-Art in Sekunden
+REPORT_TTL = {
+    "report": 4 * 60 * 60,  # Vollständiger Report
+    "quick": 60 * 60,       # Schnell-Analyse im Such-Tab
+    "screen": 30 * 60,      # Bulk-Screening-Chunk (Rohantwort)
+}
+
+PRICE_BUCKET_PCT = 0.5  # Preise innerhalb von ~0.5% landen im selben Bucket
+MAX_MEMORY = 256        # Reports im Speicher (LRU), der Rest wird bei Bedarf von der Platte gelesen
+PRUNE_INTERVAL = 10 * 60  # Abgelaufene Screening-Chunks höchstens so oft löschen
+PRUNE_KINDS = ("screen",)  # Nur Cache, nicht Teil des Verlaufs
+
+_lock = threading.Lock()
+_memory = OrderedDict()  # Fingerprint -> Eintrag (spart das Lesen von der Platte)
+_maintenance = {"at": 0.0, "migrated": False}
+
+
+def price_bucket(price):
+    """Logarithmischer Preis-Bucket - relative Breite unabhängig von der Preishöhe"""
+    if not price or price <= 0:
+        return 0
+    return round(math.log(price) / math.log1p(PRICE_BUCKET_PCT / 100))
+
+
+def fingerprint(kind, ticker, market_type, price, strategy=None, sr_levels=None, fib_info=None, news=None, extra=None):
+    """Stabiler Hash über alle Eingaben, die den Report-Inhalt bestimmen (extra: weitere Prompt-Daten)"""
+    state = {
+        "kind": kind,
+        "ticker": ticker,
+        "market": market_type,
+        "price": price_bucket(price),
+        "strategy": strategy,
+        "sr": sr_levels,
+        "fib": fib_info,
+        "news": news,
+        "extra": extra,
+    }
+    raw = json.dumps(state, sort_keys=True, default=str, ensure_ascii=False)
+    return f"{kind}.{_safe(ticker)}.{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+
+def _safe(ticker):
+    """Ticker dateinamentauglich und ohne Punkt (Trenner im Fingerprint)"""
+    return re.sub(r"[^A-Za-z0-9_-]", "_", ticker) if ticker else "_"
+
+
+def _parts(fp):
+    """Fingerprint -> (Art, Ticker-Teil) oder None bei Dateien im alten Format (nur Hash)"""
+    parts = fp.split(".")
+    return (parts[0], parts[1]) if len(parts) == 3 else None
+
+
+def _path(fp):
+    return os.path.join(REPORT_DIR, f"{fp}.json")
+
+
+def _remember(fp, entry):
+    _memory[fp] = entry
+    _memory.move_to_end(fp)
+    while len(_memory) > MAX_MEMORY:
+        _memory.popitem(last=False)
+
+
+def _load(fp):
+    entry = _memory.get(fp)
+    if entry is not None:
+        _memory.move_to_end(fp)
+        return entry
+    try:
+        with open(_path(fp), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _remember(fp, entry)
+    return entry
+
+
+def get_report(fp):
+    """Gespeicherter Report (dict mit text, created, ...) oder None, wenn unbekannt/abgelaufen"""
+    with _lock:
+        entry = _load(fp)
+    if entry is None:
+        return None
+    if time.time() - entry["created"] > REPORT_TTL.get(entry.get("kind"), 0):
+        return None
+    return entry
+
+
+def put_report(fp, text, kind, ticker, market_type, strategy=None, price=None):
+    """Speichert einen Report - Schreibfehler (z.B. schreibgeschütztes Verzeichnis) bleiben folgenlos"""
+    entry = {
+        "fingerprint": fp,
+        "kind": kind,
+        "ticker": ticker,
+        "market": market_type,
+        "strategy": strategy,
+        "price": price,
+        "created": time.time(),
+        "text": text,
+    }
+    with _lock:
+        _remember(fp, entry)
+        try:
+            os.makedirs(REPORT_DIR, exist_ok=True)
+            tmp = _path(fp) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, _path(fp))
+        except OSError:
+            pass
+        if kind in PRUNE_KINDS:
+            _prune_expired(entry["created"])
+    return entry
+
+
+def _migrate_legacy():
+    """Dateien im alten Format (<hash>.json) einmal auf <Art>.<Ticker>.<hash>.json umbenennen"""
+    if _maintenance["migrated"]:
+        return
+    _maintenance["migrated"] = True
+    try:
+        names = [n[:-len(".json")] for n in os.listdir(REPORT_DIR) if n.endswith(".json")]
+    except OSError:
+        return
+    for old in names:
+        if _parts(old) is not None:
+            continue
+        entry = _load(old)
+        if entry is None:
+            continue
+        new = f"{entry.get('kind')}.{_safe(entry.get('ticker'))}.{old}"
+        entry["fingerprint"] = new
+        _memory.pop(old, None)
+        try:
+            os.replace(_path(old), _path(new))
+        except OSError:
+            continue
+
+
+def _prune_expired(now):
+    """Abgelaufene Chunks (PRUNE_KINDS) löschen - Alter aus der mtime, kein Parsen"""
+    if now - _maintenance["at"] < PRUNE_INTERVAL:
+        return
+    _maintenance["at"] = now
+    try:
+        with os.scandir(REPORT_DIR) as it:
+            for e in it:
+                parts = _parts(e.name[:-len(".json")]) if e.name.endswith(".json") else None
+                if parts and parts[0] in PRUNE_KINDS and now - e.stat().st_mtime > REPORT_TTL[parts[0]]:
+                    _memory.pop(e.name[:-len(".json")], None)
+                    os.remove(e.path)
+    except OSError:
+        pass
+
+
+def _newest_files(ticker=None, kind=None):
+    """Passende Report-Dateien nach Änderungszeit, neueste zuerst - Auswahl über den Namen, kein Parsen"""
+    wanted_ticker = None if ticker is None else _safe(ticker)
+    try:
+        with os.scandir(REPORT_DIR) as it:
+            files = []
+            for e in it:
+                parts = _parts(e.name[:-len(".json")]) if e.name.endswith(".json") else None
+                if parts is None or (kind is not None and parts[0] != kind):
+                    continue
+                if wanted_ticker is not None and parts[1] != wanted_ticker:
+                    continue
+                files.append((e.stat().st_mtime, e.name[:-len(".json")]))
+    except OSError:
+        return []
+    return [fp for _, fp in sorted(files, reverse=True)]
+
+
+def report_history(ticker=None, kind=None, limit=20):
+    """Gespeicherte Reports (auch abgelaufene), neueste zuerst
+
+    Nur Dateien mit passender Art/Ticker im Namen werden gelesen, neueste zuerst
+    und nur so viele wie nötig.
+    """
+    def matches(entry):
+        return (ticker is None or entry.get("ticker") == ticker) and (kind is None or entry.get("kind") == kind)
+
+    entries, seen = [], set()
+    with _lock:
+        _migrate_legacy()
+        _prune_expired(time.time())
+        for fp in _newest_files(ticker, kind):
+            if len(entries) >= limit:
+                break
+            entry = _load(fp)
+            # Gleicher Name nach dem Bereinigen (z.B. "BRK.B" / "BRK_B"): Ticker im Eintrag entscheidet
+            if entry is not None and matches(entry):
+                entries.append(entry)
+                seen.add(fp)
+        # Nur im Speicher (Platte nicht beschreibbar)
+        entries += [e for fp, e in _memory.items() if fp not in seen and matches(e) and not os.path.exists(_path(fp))]
+    return sorted(entries, key=lambda e: e["created"], reverse=True)[:limit]
@@ -0,0 +1,177 @@
+"""Markt-Scan ohne Streamlit: Rohdaten holen + Strategie-Filter anwenden"""
+from concurrent.futures import ThreadPoolExecutor
+
+from alpha_core.delta import build_scan_state, rescan, state_results
+from alpha_core.http_cache import cached_get
+from alpha_core.metrics import scan_crypto_markets, scan_crypto_strategies, scan_stock_snapshot, scan_stock_strategies
+from alpha_core.rate_limit import COINGECKO_LIMITER
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, INSIDER_STRATEGIES, STRATEGIES, supports_market
+
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+POLYGON_SNAPSHOT_URL = "https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers"
+
+TOP_RESULTS = 50
+
+# CoinGecko-Universum: Top N nach Market Cap, 250 pro Seite (API-Maximum)
+CRYPTO_UNIVERSE = 1000
+CRYPTO_UNIVERSE_OPTIONS = [250, 500, 1000, 2500]
+COINGECKO_PER_PAGE = 250
+COINGECKO_PAGE_WORKERS = 4
+COINGECKO_RETRIES = 3
+
+
+class RateLimited(Exception):
+    """Upstream-API hat mit 429 geantwortet"""
+
+
+class ApiError(Exception):
+    """Upstream-API hat mit einem anderen Status als 200 oder ohne gültiges JSON geantwortet"""
+
+    def __init__(self, api, status=None, detail=None):
+        self.api = api
+        self.status = status
+        super().__init__(f"{api}: {detail or f'HTTP {status}'}")
+
+
+class AuthError(ApiError):
+    """401/403 - API-Key fehlt, ist ungültig oder hat keinen Zugriff auf den Endpoint"""
+
+
+def _get_json(api, url, **kwargs):
+    """cached_get + Statusprüfung: 200 -> geparstes JSON, sonst RateLimited/AuthError/ApiError"""
+    try:
+        resp = cached_get(url, **kwargs)
+        if resp.status_code == 200:
+            return resp.json()
+    except ValueError:
+        # 200, aber kein JSON (z.B. HTML-Fehlerseite eines Proxys)
+        raise ApiError(api, 200, "Antwort ist kein JSON") from None
+    if resp.status_code == 429:
+        raise RateLimited(api)
+    if resp.status_code in (401, 403):
+        raise AuthError(api, resp.status_code, f"HTTP {resp.status_code} - API-Key prüfen")
+    raise ApiError(api, resp.status_code)
+
+
+def _fetch_markets_page(page):
+    params = {
+        "vs_currency": "usd",
+        "order": "market_cap_desc",
+        "per_page": COINGECKO_PER_PAGE,
+        "page": page,
+        "sparkline": False,
+        # Hole 24h UND 7d change - daraus können wir Vortag approximieren
+        "price_change_percentage": "24h,7d"
+    }
+    coins = _get_json("CoinGecko", COINGECKO_MARKETS_URL, params=params, endpoint="markets", timeout=30,
+                      limiter=COINGECKO_LIMITER, retries=COINGECKO_RETRIES)
+    if not isinstance(coins, list):
+        raise ApiError("CoinGecko", 200, "unerwartetes Antwortformat")
+    return coins
+
+
+def fetch_crypto_markets(max_coins=None, failed_pages=None):
+    """CoinGecko /coins/markets, Top max_coins nach Market Cap - Seiten parallel im Rate-Limit
+
+    Scheitert Seite 1, wird deren Fehler geworfen (RateLimited/AuthError/ApiError).
+    Scheitern spätere Seiten, fehlen nur deren Coins - failed_pages (Liste) bekommt dann
+    je Seite (Seite, Fehlertext), damit Aufrufer das unvollständige Ergebnis anzeigen.
+    """
+    max_coins = max_coins or CRYPTO_UNIVERSE
+    pages = range(1, -(-max_coins // COINGECKO_PER_PAGE) + 1)
+
+    with ThreadPoolExecutor(max_workers=COINGECKO_PAGE_WORKERS) as pool:
+        futures = [pool.submit(_fetch_markets_page, page) for page in pages]
+        first = futures[0].result()
+        rest = []
+        for page, future in zip(pages[1:], futures[1:]):
+            try:
+                rest.append(future.result())
+            except Exception as e:
+                rest.append([])
+                if failed_pages is not None:
+                    failed_pages.append((page, str(e)))
+
+    # Seiten in Rang-Reihenfolge zusammenführen, Duplikate an Seitengrenzen entfernen
+    coins, seen = [], set()
+    for page in [first] + rest:
+        for coin in page:
+            coin_id = coin.get("id")
+            if coin_id in seen:
+                continue
+            seen.add(coin_id)
+            coins.append(coin)
+    return coins[:max_coins]
+
+
+def partial_warning(failed_pages):
+    """Hinweistext für fehlende Markets-Seiten (None, wenn alle Seiten da sind)"""
+    if not failed_pages:
+        return None
+    ranks = ", ".join(f"{(p - 1) * COINGECKO_PER_PAGE + 1}-{p * COINGECKO_PER_PAGE}" for p, _ in sorted(failed_pages))
+    return f"Unvollständig: CoinGecko-Ränge {ranks} fehlen ({failed_pages[0][1]})"
+
+
+def fetch_stock_snapshot(poly_key):
+    """Polygon Snapshot aller US-Aktien - Liste der Ticker-Objekte"""
+    payload = _get_json("Polygon", f"{POLYGON_SNAPSHOT_URL}?apiKey={poly_key}", endpoint="snapshot", timeout=30)
+    if not isinstance(payload, dict):
+        raise ApiError("Polygon", 200, "unerwartetes Antwortformat")
+    return payload.get("tickers", [])
+
+
+def scan_market(market_type, filters, additional_filters, poly_key=None, raw=None, max_coins=None,
+                failed_pages=None):
+    """Scan eines Marktes -> (results, skipped_no_price, skipped_filter)
+
+    raw: bereits geholte Coins/Ticker (z.B. ein Abruf für mehrere Strategien).
+    max_coins: Größe des Krypto-Universums (Standard CRYPTO_UNIVERSE).
+    failed_pages: Liste für fehlgeschlagene Markets-Seiten (siehe fetch_crypto_markets).
+    """
+    if market_type == "Krypto":
+        coins = fetch_crypto_markets(max_coins, failed_pages) if raw is None else raw
+        return scan_crypto_markets(coins, filters, additional_filters)
+    tickers = fetch_stock_snapshot(poly_key) if raw is None else raw
+    if not tickers:
+        return [], 0, 0
+    return scan_stock_snapshot(tickers, filters, additional_filters)
+
+
+def scan_stocks_incremental(state, filters, additional_filters, poly_key=None, tickers=None):
+    """Aktien-Scan mit Delta-Zustand -> (results, skipped_no_price, skipped_filter, state, diff)
+
+    state: Zustand des letzten Aufrufs (None beim ersten); diff ist dann None.
+    tickers: bereits vorliegender Snapshot (z.B. live_snapshot des WebSocket-Streams).
+    """
+    tickers = fetch_stock_snapshot(poly_key) if tickers is None else tickers
+    if not tickers:
+        return [], 0, 0, state, None
+    if state is None:
+        state, diff = build_scan_state(tickers, filters, additional_filters), None
+    else:
+        state, diff = rescan(state, tickers, filters, additional_filters)
+    return (*state_results(state), state, diff)
+
+
+def range_strategies(market_type):
+    """Strategien mit reinen Range-Filtern, die auf dem Markt laufen (ohne Insider)"""
+    return {
+        name: strategy["filters"] for name, strategy in STRATEGIES.items()
+        if name not in INSIDER_STRATEGIES and supports_market(name, market_type)
+    }
+
+
+def scan_all_strategies(market_type, poly_key=None, raw=None, strategies=None,
+                        additional_filters=DEFAULT_ADDITIONAL_FILTERS, max_coins=None, failed_pages=None):
+    """Ein Abruf + ein Kennzahlen-Durchlauf für alle Strategien -> (per_strategy, matrix)"""
+    strategies = range_strategies(market_type) if strategies is None else strategies
+    if market_type == "Krypto":
+        coins = fetch_crypto_markets(max_coins, failed_pages) if raw is None else raw
+        return scan_crypto_strategies(coins, strategies, additional_filters)
+    tickers = fetch_stock_snapshot(poly_key) if raw is None else raw
+    return scan_stock_strategies(tickers, strategies, additional_filters)
+
+
+def top_results(results, limit=TOP_RESULTS):
+    """Beste Treffer nach Alpha-Score"""
+    return sorted(results, key=lambda x: x["Alpha"], reverse=True)[:limit]
@@ -0,0 +1,176 @@
+"""Hintergrund-Scanner: ein Taktgeber-Thread pro Server-Prozess, Ergebnisse in einem geteilten Store
+
+Jede (Markt, Strategie)-Kombination wird im festen Takt neu gescannt - ein Abruf
+pro Markt und Zyklus, egal wie viele Browser-Sessions offen sind. Sessions lesen
+nur noch aus dem Store (get_published).
+
+Der Taktgeber startet fällige Jobs in eigenen Threads (einer pro laufendem Job):
+ein langsamer Job (Insider, Symbol-Index, Watchlist) hält die Markt-Scans nicht auf,
+derselbe Job läuft aber nie doppelt. Die Job-Threads sind Daemons - ein laufender
+Scan hält das Beenden des Servers nicht auf (die Worker eines ThreadPoolExecutor
+würden beim Interpreter-Ende noch abgewartet, vor jedem atexit-Handler).
+"""
+import threading
+import time
+
+from alpha_core.insider import iter_insider_signals, rank_insider_signals
+from alpha_core.monitor import MONITOR_INTERVAL, run_monitor_cycle
+from alpha_core.scan import fetch_crypto_markets, fetch_stock_snapshot, partial_warning, scan_all_strategies, top_results
+from alpha_core.strategies import INSIDER_STRATEGIES, STRATEGIES
+from alpha_core.symbols import refresh_index
+from alpha_core.stream import live_snapshot, stream_active
+
+# Takt pro Markt in Sekunden (= TTL des jeweiligen Endpoints im HTTP-Cache)
+SCAN_INTERVAL = {
+    "Krypto": 60,
+    "Aktien": 30,
+}
+STREAM_SCAN_INTERVAL = 5    # Aktien bei laufendem WebSocket-Stream (kein API-Abruf pro Zyklus)
+INSIDER_INTERVAL = 30 * 60  # Finnhub-Daten ändern sich selten, Quote ist knapp
+SYMBOL_CHECK_INTERVAL = 60 * 60  # Symbol-Index: stündlich prüfen, erneuert wird nach SYMBOL_INDEX_TTL
+TICK = 1.0                  # Wie oft der Taktgeber prüft, ob etwas fällig ist
+
+_lock = threading.Lock()
+_store = {}      # (market_type, strategy) -> veröffentlichter Scan
+_due = {}        # Job-Name -> nächster Lauf (monotonic)
+_errors = {}     # Job-Name -> letzter Fehler (None nach erfolgreichem Lauf)
+_running = set() # Job-Namen, die gerade laufen
+_config = {"markets": (), "poly_key": None, "finnhub_key": None, "monitor": True}
+_thread = None
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+def publish(market_type, strategy, results, skipped_no_price=0, skipped_filter=0, duration=0.0, warning=None):
+    """warning: Hinweis zu einem unvollständigen Abruf (z.B. fehlende Markets-Seiten)"""
+    with _lock:
+        _store[(market_type, strategy)] = {
+            "results": results,
+            "skipped_no_price": skipped_no_price,
+            "skipped_filter": skipped_filter,
+            "updated": time.time(),
+            "duration": duration,
+            "warning": warning,
+        }
+
+
+def _job_name(market_type, strategy):
+    return "Insider" if strategy in INSIDER_STRATEGIES else market_type
+
+
+def get_published(market_type, strategy):
+    """Letzter veröffentlichter Scan (dict mit results, updated, error, ...) oder None"""
+    with _lock:
+        entry = _store.get((market_type, strategy))
+        error = _errors.get(_job_name(market_type, strategy))
+        if entry is None and error is None:
+            return None
+        entry = dict(entry or {"results": [], "skipped_no_price": 0, "skipped_filter": 0, "updated": None,
+                               "duration": 0.0, "warning": None})
+        entry["error"] = error
+        return entry
+
+
+def scheduler_status():
+    """Überblick: läuft der Taktgeber, welche Jobs, wann zuletzt aktualisiert"""
+    with _lock:
+        return {
+            "running": _thread is not None and _thread.is_alive(),
+            "markets": list(_config["markets"]),
+            "jobs": {f"{m} | {s}": e.get("updated") for (m, s), e in _store.items()},
+            "errors": {k: v for k, v in _errors.items() if v},
+        }
+
+
+# =============================================================================
+# JOBS
+# =============================================================================
+def scan_cycle(market_type, poly_key=None):
+    """Ein Abruf + ein Kennzahlen-Durchlauf für den Markt, alle Range-Strategien auf einmal"""
+    start = time.monotonic()
+    failed_pages = []
+    if market_type == "Krypto":
+        raw = fetch_crypto_markets(failed_pages=failed_pages)
+    else:
+        raw = live_snapshot() if stream_active() else fetch_stock_snapshot(poly_key)
+    per_strategy, _ = scan_all_strategies(market_type, raw=raw)
+    duration = time.monotonic() - start
+    warning = partial_warning(failed_pages)
+    for name, (results, snp, sf) in per_strategy.items():
+        publish(market_type, name, top_results(results), snp, sf, duration, warning)
+
+
+def insider_cycle(finnhub_key):
+    """Beide Insider-Strategien (Finnhub-Antworten kommen beim zweiten Mal aus dem Cache)"""
+    for name in INSIDER_STRATEGIES:
+        start = time.monotonic()
+        trans_type = STRATEGIES[name]["filters"]["Insider"]
+        signals = [s for _, s in iter_insider_signals(finnhub_key, trans_type) if s]
+        publish("Aktien", name, rank_insider_signals(signals, trans_type), duration=time.monotonic() - start)
+
+
+def _jobs():
+    """(Job-Name, Intervall, Funktion) für die aktuelle Konfiguration"""
+    jobs = []
+    for market_type in _config["markets"]:
+        if market_type == "Aktien" and not _config["poly_key"]:
+            continue
+        interval = STREAM_SCAN_INTERVAL if market_type == "Aktien" and stream_active() else SCAN_INTERVAL[market_type]
+        jobs.append((market_type, interval,
+                     lambda m=market_type: scan_cycle(m, _config["poly_key"])))
+    if "Aktien" in _config["markets"] and _config["finnhub_key"]:
+        jobs.append(("Insider", INSIDER_INTERVAL, lambda: insider_cycle(_config["finnhub_key"])))
+    # Symbol-Index: refresh_index prüft selbst das Alter der Datei auf der Platte
+    jobs.append(("Symbole", SYMBOL_CHECK_INTERVAL, lambda: refresh_index(_config["poly_key"])))
+    if _config["monitor"]:
+        jobs.append(("Watchlist", MONITOR_INTERVAL, lambda: run_monitor_cycle(_config["poly_key"])))
+    return jobs
+
+
+def _run_job(name, interval, job):
+    try:
+        job()
+        error = None
+    except Exception as e:
+        # Alte Ergebnisse bleiben stehen, der nächste Takt versucht es erneut
+        error = str(e)
+    with _lock:
+        _errors[name] = error
+        _due[name] = time.monotonic() + interval
+        _running.discard(name)
+
+
+def _start_due_jobs():
+    """Fällige Jobs, die nicht schon laufen, in Daemon-Threads starten -> gestartete Job-Namen"""
+    started = []
+    for name, interval, job in _jobs():
+        with _lock:
+            if name in _running or time.monotonic() < _due.get(name, 0):
+                continue
+            _running.add(name)
+        threading.Thread(target=_run_job, args=(name, interval, job), name=f"alpha-scan-job-{name}",
+                         daemon=True).start()
+        started.append(name)
+    return started
+
+
+def _run_forever():
+    while True:
+        _start_due_jobs()
+        time.sleep(TICK)
+
+
+def start_scheduler(markets=("Krypto", "Aktien"), poly_key=None, finnhub_key=None, monitor=True):
+    """Startet den Taktgeber einmal pro Prozess - weitere Aufrufe aktualisieren nur die Konfiguration
+
+    monitor: Watchlist-Alerts (alpha_core.monitor) als eigenen Job auswerten.
+    """
+    global _thread
+    with _lock:
+        _config.update(markets=tuple(markets), poly_key=poly_key or _config["poly_key"],
+                       finnhub_key=finnhub_key or _config["finnhub_key"], monitor=monitor)
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run_forever, name="alpha-scan-scheduler", daemon=True)
+            _thread.start()
+    return _thread
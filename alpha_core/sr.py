@@ -0,0 +1,504 @@
+"""Support/Resistance-Engine: Swing Highs/Lows + Fibonacci + Konsolidierungszonen
+
+Der preisunabhängige Teil (Swings, Zonen-Zuordnung) wird pro (Ticker, Markt,
+Timeframe) als Zustand gehalten und bei neuen Kerzen nur am Rand aktualisiert.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from alpha_core.history import load_crypto_history, load_stock_history
+from alpha_core.rate_limit import COINGECKO_LIMITER
+
+# Timeframe zu Tagen mappen
+TF_TO_DAYS = {
+    "1H": 1,
+    "4H": 7,
+    "1D": 30,
+    "1W": 90,
+    "1M": 180,
+    "1Y": 365,
+}
+
+NUM_ZONES = 20  # 20 Zonen über den Preisbereich
+DEFAULT_SWING_WINDOW = 3  # Kerzen links/rechts, die ein Swing überragen muss
+MAX_STATES = 256
+BATCH_WORKERS = 8
+# Krypto-Batch: höchstens so viele OHLC-Abrufe wie der CoinGecko-Burst, Rest nur aus dem lokalen Verlauf
+CRYPTO_BATCH_FETCH = int(COINGECKO_LIMITER.capacity)
+
+_states = OrderedDict()  # (Ticker bzw. CoinID, market_type, timeframe, days, swing_window) -> SR-Zustand
+_states_lock = threading.Lock()
+
+
+# =============================================================================
+# HISTORISCHE DATEN
+# =============================================================================
+def fetch_historical_data_crypto(coin_id, days, local_only=False):
+    """Historische OHLC-Daten von CoinGecko - über den lokalen Verlauf, nur Lücken aus dem Netz"""
+    try:
+        candles = load_crypto_history(coin_id, days, refresh=not local_only)
+        if len(candles):
+            # Format: [[timestamp, open, high, low, close], ...]
+            return candles[:, :5].tolist()
+    except Exception:
+        pass
+    return None
+
+
+def fetch_historical_data_stocks(ticker, days, poly_key):
+    """Historische Tageskerzen von Polygon - über den lokalen Verlauf, nur Lücken aus dem Netz"""
+    try:
+        candles = load_stock_history(ticker, days, poly_key)
+        if len(candles):
+            # Format anpassen: [[timestamp, open, high, low, close], ...]
+            return candles[:, :5].tolist()
+    except Exception:
+        pass
+    return None
+
+
+# =============================================================================
+# HELPER
+# =============================================================================
+def smart_round(price):
+    if price >= 1000:
+        return round(price, 0)
+    elif price >= 100:
+        return round(price, 1)
+    elif price >= 10:
+        return round(price, 2)
+    elif price >= 1:
+        return round(price, 3)
+    else:
+        return round(price, 6)
+
+
+def merge_zones(zones):
+    """Merge überlappende Zonen (2% Überlappung erlaubt)"""
+    if not zones:
+        return []
+    zones = sorted(zones, key=lambda x: x["low"])
+    merged = [zones[0]]
+    for zone in zones[1:]:
+        last = merged[-1]
+        if zone["low"] <= last["high"] * 1.02:
+            merged[-1] = {
+                "low": last["low"],
+                "high": max(last["high"], zone["high"]),
+                "mid": (last["low"] + max(last["high"], zone["high"])) / 2,
+                "days": last["days"] + zone["days"],
+                "pct_time": last["pct_time"] + zone["pct_time"]
+            }
+        else:
+            merged.append(zone)
+    return merged
+
+
+def remove_clusters(levels, min_distance_pct=2.0):
+    """Entfernt Levels, die näher als min_distance_pct am vorherigen liegen"""
+    if not levels:
+        return []
+    cleaned = [levels[0]]
+    for level in levels[1:]:
+        last_price = cleaned[-1]["price"]
+        distance_pct = abs(level["price"] - last_price) / last_price * 100
+        if distance_pct >= min_distance_pct:
+            cleaned.append(level)
+    return cleaned
+
+
+# =============================================================================
+# SR-ZUSTAND (PREISUNABHÄNGIG)
+# =============================================================================
+def _swing_window(num_candles, swing_window=DEFAULT_SWING_WINDOW):
+    return max(1, min(swing_window, num_candles // 4))
+
+
+def _swing_flags(values, window, start, stop):
+    """Swing-Flags für Kerzen [start, stop): Wert strikt über allen window Nachbarn je Seite
+
+    Für Swing Lows mit -lows aufrufen. Vergleicht gegen das rollierende Maximum der
+    linken und rechten Nachbarn statt Kerze für Kerze.
+    """
+    n = len(values)
+    flags = np.zeros(stop - start, dtype=bool)
+    lo, hi = max(start, window), min(stop, n - window)
+    if hi <= lo:
+        return flags
+    segment = values[lo - window:hi + window]
+    rolling_max = sliding_window_view(segment, window).max(axis=1)
+    center = segment[window:window + hi - lo]
+    flags[lo - start:hi - start] = (center > rolling_max[:hi - lo]) & (center > rolling_max[window + 1:])
+    return flags
+
+
+def _mark_swings(state, start, stop):
+    """Setzt Swing-Flags für die Kerzen [start, stop) neu"""
+    window = state["window"]
+    state["swing_high"][start:stop] = _swing_flags(state["highs"], window, start, stop)
+    state["swing_low"][start:stop] = _swing_flags(-state["lows"], window, start, stop)
+
+
+def _zone_index(closes, period_low, zone_size):
+    # int() schneidet Richtung 0 ab -> np.trunc
+    zone_idx = np.trunc((closes - period_low) / zone_size).astype(np.int64)
+    return np.minimum(zone_idx, NUM_ZONES - 1)  # Clamp
+
+
+def _count_zones(state):
+    """Zonen-Zähler (zone_start, zone_end) -> Kerzen, in Reihenfolge des ersten Auftretens"""
+    zone_counts = {}
+    if state["zone_idx"] is None:
+        return zone_counts
+    bins, first_seen, counts = np.unique(state["zone_idx"], return_index=True, return_counts=True)
+    order = np.argsort(first_seen, kind="stable")
+    # Nur noch <= NUM_ZONES Einträge - gerundete Schlüssel können bei Micro-Preisen zusammenfallen
+    for zone_idx, count in zip(bins[order].tolist(), counts[order].tolist()):
+        zone_start = state["period_low"] + zone_idx * state["zone_size"]
+        zone_end = zone_start + state["zone_size"]
+        zone_key = (round(zone_start, 6), round(zone_end, 6))
+        zone_counts[zone_key] = zone_counts.get(zone_key, 0) + count
+    return zone_counts
+
+
+def _assign_zones(state, keep_from=None, kept=None):
+    """Berechnet Periode High/Low und Zonen-Zuordnung (nur neue Kerzen, wenn die Range gleich bleibt)"""
+    period_high = float(state["highs"].max())
+    period_low = float(state["lows"].min())
+    price_range = period_high - period_low
+
+    if price_range <= 0:
+        state.update(period_high=period_high, period_low=period_low, zone_size=None, zone_idx=None)
+        return
+
+    zone_size = price_range / NUM_ZONES
+    if kept is not None and kept["zone_idx"] is not None and (kept["period_low"], kept["zone_size"]) == (period_low, zone_size):
+        kept_idx = kept["zone_idx"][keep_from[0]:keep_from[1]]
+        zone_idx = np.concatenate([kept_idx, _zone_index(state["closes"][len(kept_idx):], period_low, zone_size)])
+    else:
+        zone_idx = _zone_index(state["closes"], period_low, zone_size)
+
+    state.update(period_high=period_high, period_low=period_low, zone_size=zone_size, zone_idx=zone_idx)
+    state["zone_counts"] = _count_zones(state)
+
+
+def _empty_state(ohlc_data, swing_window):
+    candles = np.array([c[:5] for c in ohlc_data], dtype=float).reshape(-1, 5)
+    return {
+        "candles": candles,
+        "highs": candles[:, 2],   # Index 2 = High
+        "lows": candles[:, 3],    # Index 3 = Low
+        "closes": candles[:, 4],  # Index 4 = Close
+        "window": _swing_window(len(candles), swing_window),
+        "swing_high": np.zeros(len(candles), dtype=bool),
+        "swing_low": np.zeros(len(candles), dtype=bool),
+        "zone_counts": {},
+        "memo": None,
+    }
+
+
+def build_sr_state(ohlc_data, swing_window=DEFAULT_SWING_WINDOW):
+    """Komplette Analyse der Kerzen (Swings + Zonen) ohne Preisbezug"""
+    state = _empty_state(ohlc_data, swing_window)
+    _mark_swings(state, 0, len(state["candles"]))
+    _assign_zones(state)
+    return state
+
+
+def update_sr_state(state, ohlc_data, swing_window=DEFAULT_SWING_WINDOW):
+    """Übernimmt neue Kerzen inkrementell - None, wenn die Daten nicht sauber anschließen
+
+    Vorne herausgefallene Kerzen werden verworfen, die letzte bekannte Kerze darf sich
+    noch verändert haben (laufende Kerze). Neu bewertet werden nur Swings im Fenster
+    um die geänderten Kerzen und die Zonen-Zuordnung der neuen Kerzen.
+    """
+    old = state["candles"]
+    if not ohlc_data:
+        return None
+    matches = np.flatnonzero(old[:, 0] == ohlc_data[0][0])
+    if matches.size == 0:
+        return None
+
+    start = int(matches[0])
+    overlap = len(old) - start
+    fresh = _empty_state(ohlc_data, swing_window)
+    n = len(fresh["candles"])
+    if overlap > n or fresh["window"] != state["window"] or not np.array_equal(fresh["candles"][:overlap - 1], old[start:-1]):
+        return None
+
+    # Kerzen ab changed_from sind neu oder haben sich verändert
+    changed_from = overlap - 1
+    window = fresh["window"]
+    fresh["swing_high"][:changed_from] = state["swing_high"][start:start + changed_from]
+    fresh["swing_low"][:changed_from] = state["swing_low"][start:start + changed_from]
+    _mark_swings(fresh, 0, min(window, n))
+    _mark_swings(fresh, max(changed_from - window, 0), n)
+
+    _assign_zones(fresh, keep_from=(start, start + changed_from), kept=state)
+    return fresh
+
+
+# =============================================================================
+# LEVELS AUS DEM ZUSTAND (PREISABHÄNGIG)
+# =============================================================================
+def sr_levels_from_state(state, current_price):
+    """Kombiniert Swings, Fibonacci und Zonen relativ zum aktuellen Preis"""
+    highs, lows = state["highs"], state["lows"]
+    period_high = state["period_high"]
+    period_low = state["period_low"]
+    price_range = period_high - period_low
+
+    if price_range <= 0:
+        return calculate_sr_levels_simple(current_price), {}
+
+    # =========================================================================
+    # KONSOLIDIERUNGSZONEN (wo der Preis oft war)
+    # =========================================================================
+    sorted_zones = sorted(state["zone_counts"].items(), key=lambda x: x[1], reverse=True)
+
+    consolidation_zones = []
+    total_candles = len(state["closes"])
+
+    for (zone_start, zone_end), count in sorted_zones[:5]:  # Top 5
+        if count >= 3:  # Mindestens 3 Kerzen in dieser Zone
+            pct_time = round((count / total_candles) * 100, 1)
+            zone_mid = (zone_start + zone_end) / 2
+            consolidation_zones.append({
+                "low": zone_start,
+                "high": zone_end,
+                "mid": zone_mid,
+                "days": count,
+                "pct_time": pct_time
+            })
+
+    consolidation_zones = merge_zones(consolidation_zones)[:3]  # Max 3 Zonen
+
+    # =========================================================================
+    # FIBONACCI LEVELS
+    # =========================================================================
+    fib_levels = {
+        "0.0": period_low,
+        "23.6": period_low + price_range * 0.236,
+        "38.2": period_low + price_range * 0.382,
+        "50.0": period_low + price_range * 0.5,
+        "61.8": period_low + price_range * 0.618,
+        "78.6": period_low + price_range * 0.786,
+        "100.0": period_high,
+        "127.2": period_high + price_range * 0.272,
+        "161.8": period_high + price_range * 0.618,
+    }
+
+    # =========================================================================
+    # SWING HIGHS/LOWS
+    # =========================================================================
+    swing_highs = highs[state["swing_high"]].tolist()
+    swing_lows = lows[state["swing_low"]].tolist()
+    swing_highs.append(period_high)
+    swing_lows.append(period_low)
+    swing_highs = sorted(set(swing_highs), reverse=True)
+    swing_lows = sorted(set(swing_lows))
+
+    # =========================================================================
+    # SUPPORTS & RESISTANCES kombinieren
+    # =========================================================================
+    all_supports = []
+    all_resistances = []
+
+    for sl in swing_lows:
+        if sl < current_price:
+            all_supports.append({"price": sl, "type": "Swing Low"})
+
+    for fib_name, fib_price in fib_levels.items():
+        if fib_price < current_price and float(fib_name) <= 100:
+            all_supports.append({"price": fib_price, "type": f"Fib {fib_name}%"})
+
+    for sh in swing_highs:
+        if sh > current_price:
+            all_resistances.append({"price": sh, "type": "Swing High"})
+
+    for fib_name, fib_price in fib_levels.items():
+        if fib_price > current_price:
+            all_resistances.append({"price": fib_price, "type": f"Fib {fib_name}%"})
+
+    all_supports = sorted(all_supports, key=lambda x: x["price"], reverse=True)
+    all_resistances = sorted(all_resistances, key=lambda x: x["price"])
+
+    supports_cleaned = remove_clusters(all_supports)[:3]
+    resistances_cleaned = remove_clusters(all_resistances)[:3]
+
+    supports = [smart_round(s["price"]) for s in supports_cleaned]
+    resistances = [smart_round(r["price"]) for r in resistances_cleaned]
+
+    for zone in consolidation_zones:
+        zone["low"] = smart_round(zone["low"])
+        zone["high"] = smart_round(zone["high"])
+        zone["mid"] = smart_round(zone["mid"])
+
+    # =========================================================================
+    # FIB INFO für AI-Analyse
+    # =========================================================================
+    fib_info = {
+        "period_high": smart_round(period_high),
+        "period_low": smart_round(period_low),
+        "fib_236": smart_round(fib_levels["23.6"]),
+        "fib_382": smart_round(fib_levels["38.2"]),
+        "fib_500": smart_round(fib_levels["50.0"]),
+        "fib_618": smart_round(fib_levels["61.8"]),
+        "fib_786": smart_round(fib_levels["78.6"]),
+        "fib_1272": smart_round(fib_levels["127.2"]),
+        "fib_1618": smart_round(fib_levels["161.8"]),
+        "supports_detail": supports_cleaned,
+        "resistances_detail": resistances_cleaned,
+        "consolidation_zones": consolidation_zones,
+        "total_candles": total_candles,
+    }
+
+    return (supports, resistances), fib_info
+
+
+# =============================================================================
+# ÖFFENTLICHE API
+# =============================================================================
+def calculate_sr_from_historical(ohlc_data, current_price, swing_window=DEFAULT_SWING_WINDOW):
+    """Berechnet S/R-Levels aus Fibonacci + Swing Highs/Lows + Konsolidierungszonen"""
+    if not ohlc_data or len(ohlc_data) < 5:
+        return calculate_sr_levels_simple(current_price), {}
+    return sr_levels_from_state(build_sr_state(ohlc_data, swing_window), current_price)
+
+
+def calculate_sr_levels_simple(price):
+    """Fallback: Berechnet S/R basierend auf Fibonacci vom Preis"""
+    if price <= 0:
+        return ([], []), {}
+
+    supports = [
+        round(price * 0.95, 6),   # -5%
+        round(price * 0.90, 6),   # -10%
+        round(price * 0.85, 6),   # -15%
+    ]
+
+    resistances = [
+        round(price * 1.05, 6),   # +5%
+        round(price * 1.10, 6),   # +10%
+        round(price * 1.15, 6),   # +15%
+    ]
+
+    return (supports, resistances), {}
+
+
+def _cached_sr_state(key, ohlc_data, swing_window):
+    """Zustand aus dem Memo (gleiche letzte Kerze), inkrementell aktualisiert oder neu gebaut"""
+    with _states_lock:
+        state = _states.get(key)
+
+    if state is not None:
+        candles = state["candles"]
+        same_last = np.array_equal(candles[-1], np.asarray(ohlc_data[-1][:5], dtype=float))
+        if same_last and candles[0, 0] == ohlc_data[0][0] and len(candles) == len(ohlc_data):
+            with _states_lock:
+                _states.move_to_end(key)
+            return state
+        state = update_sr_state(state, ohlc_data, swing_window)
+
+    if state is None:
+        state = build_sr_state(ohlc_data, swing_window)
+
+    with _states_lock:
+        _states[key] = state
+        _states.move_to_end(key)
+        while len(_states) > MAX_STATES:
+            _states.popitem(last=False)
+    return state
+
+
+def calculate_sr_levels(price, ticker=None, market_type="Krypto", timeframe="4H", poly_key=None,
+                        swing_window=DEFAULT_SWING_WINDOW, lookback_days=None, coin_id=None, local_only=False):
+    """Hauptfunktion: Berechnet S/R-Levels basierend auf Timeframe
+
+    Memoisiert über (Ticker, Markt, Timeframe, letzte Kerze) - bei neuen Kerzen
+    wird der Zustand nur inkrementell fortgeschrieben. lookback_days überschreibt
+    die Standard-Periode des Timeframes (z.B. mehrere Jahre Tageskerzen).
+    coin_id ist die CoinGecko-ID (Symbol != ID, z.B. BTC -> bitcoin) und bei Krypto auch
+    der Memo-Schlüssel - gleichnamige Coins teilen sich keinen Zustand.
+    local_only: Krypto nur aus dem lokalen Verlauf, ohne Abruf.
+    """
+    days = lookback_days or TF_TO_DAYS.get(timeframe, 7)
+
+    ohlc_data = None
+    symbol = ticker
+    if market_type == "Krypto" and ticker:
+        symbol = coin_id or ticker.lower()
+        ohlc_data = fetch_historical_data_crypto(symbol, days, local_only)
+    elif market_type == "Aktien" and ticker and poly_key:
+        ohlc_data = fetch_historical_data_stocks(ticker, days, poly_key)
+
+    if not ohlc_data:
+        return calculate_sr_levels_simple(price)
+    if len(ohlc_data) < 5:
+        return calculate_sr_from_historical(ohlc_data, price, swing_window)
+
+    state = _cached_sr_state((symbol, market_type, timeframe, days, swing_window), ohlc_data, swing_window)
+
+    memo = state["memo"]
+    if memo is not None and memo[0] == price:
+        return memo[1]
+    result = sr_levels_from_state(state, price)
+    state["memo"] = (price, result)
+    return result
+
+
+# =============================================================================
+# BATCH (ALLE SCAN-TREFFER)
+# =============================================================================
+def batch_sr_levels(rows, market_type="Krypto", timeframe="4H", poly_key=None, max_workers=BATCH_WORKERS,
+                    max_fetch=None):
+    """S/R für viele Scan-Treffer parallel - Liste in Reihenfolge von rows
+
+    Die Historien-Abrufe laufen über Session-Pool, Cache und API-Limiter;
+    die Zustände landen im Memo, der spätere Einzelaufruf ist dann sofort da.
+    max_fetch (Krypto, Standard CRYPTO_BATCH_FETCH): nur die ersten Zeilen dürfen nachladen,
+    der Rest kommt aus dem lokalen Verlauf und wird sonst erst in der Einzelansicht geholt.
+    Zeilen ohne Verlauf bekommen (([], []), {}) statt der ±x%-Fallback-Levels.
+    """
+    if max_fetch is None:
+        max_fetch = CRYPTO_BATCH_FETCH if market_type == "Krypto" else len(rows)
+
+    def levels_for(indexed):
+        i, row = indexed
+        local_only = i >= max_fetch
+        try:
+            levels = calculate_sr_levels(
+                price=row.get("Preis", 0), ticker=row.get("Ticker"), market_type=market_type,
+                timeframe=timeframe, poly_key=poly_key, coin_id=row.get("CoinID"), local_only=local_only
+            )
+        except Exception:
+            return ([], []), {}
+        # Ohne Verlauf (nur lokal, Abruf fehlgeschlagen oder leer) gibt es nur ±x%-Levels -
+        # die würden als echte Abstände von 5.0% erscheinen, also lieber keine
+        return levels if levels[1] else (([], []), {})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(levels_for, enumerate(rows)))
+
+
+def sr_distances(price, supports, resistances):
+    """Abstand in % zum nächsten Support darunter und zur nächsten Resistance darüber"""
+    below = [s for s in supports if s < price]
+    above = [r for r in resistances if r > price]
+    if price <= 0:
+        return None, None
+    support_dist = round((price - max(below)) / price * 100, 2) if below else None
+    resistance_dist = round((min(above) - price) / price * 100, 2) if above else None
+    return support_dist, resistance_dist
+
+
+def with_sr_distances(rows, levels):
+    """Ergänzt Scan-Ergebnisse um S-Dist% / R-Dist% aus batch_sr_levels"""
+    enriched = []
+    for row, ((supports, resistances), _) in zip(rows, levels):
+        support_dist, resistance_dist = sr_distances(row.get("Preis", 0), supports, resistances)
+        enriched.append({**row, "S-Dist%": support_dist, "R-Dist%": resistance_dist})
+    return enriched
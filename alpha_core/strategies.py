@@ -0,0 +1,105 @@
+"""Strategie-Definitionen (Filter-Bereiche pro Strategie) + Standard-Zusatzfilter"""
+
+STRATEGIES = {
+    "Volume Surge": {
+        "description": "Aktien/Krypto mit überdurchschnittlichem Volumen",
+        "filters": {"RVOL": (2.0, 50.0)},
+        "logic": "RVOL > 2.0 zeigt erhöhtes Interesse"
+    },
+    "Bull Flag": {
+        "description": "Konsolidierung nach starkem Anstieg - Volumen nimmt ab",
+        "filters": {"Vortag %": (4.0, 25.0), "Change %": (-2.0, 2.0), "RVOL": (0.3, 1.5)},
+        "logic": "Vortag stark positiv, heute seitwärts, Volumen sinkt = Bullflag"
+    },
+    "Bear Flag": {
+        "description": "Konsolidierung nach Abverkauf - Short-Setup",
+        "filters": {"Vortag %": (-25.0, -4.0), "Change %": (-2.0, 2.0), "RVOL": (0.3, 1.5)},
+        "logic": "Vortag stark negativ, heute seitwärts, Volumen sinkt = Bearflag"
+    },
+    "Breakout Long": {
+        "description": "Momentum-Ausbruch mit Volumen-Bestätigung",
+        "filters": {"Change %": (5.0, 50.0), "RVOL": (2.0, 50.0), "Close Position": (0.75, 1.0)},
+        "logic": "Starker Anstieg + hohes Volumen + Close nahe High"
+    },
+    "Breakdown Short": {
+        "description": "Abverkauf mit Volumen - Short-Chance",
+        "filters": {"Change %": (-50.0, -5.0), "RVOL": (2.0, 50.0), "Close Position": (0.0, 0.25)},
+        "logic": "Starker Abverkauf + hohes Volumen + Close nahe Low"
+    },
+    "Penny Rockets": {
+        "description": "Günstige Coins/Aktien mit explosivem Volumen",
+        "filters": {"Preis": (0.0001, 1.0), "RVOL": (3.0, 100.0), "Change %": (2.0, 100.0)},
+        "logic": "Lowcaps unter $1 mit extremem Interesse"
+    },
+    "Dip Buy": {
+        "description": "Qualitäts-Assets im Rücksetzer ohne Panik",
+        "filters": {"Preis": (10.0, 100000.0), "Change %": (-8.0, -2.0), "RVOL": (0.5, 2.0)},
+        "logic": "Moderater Rücksetzer ohne Volumen-Panik = Kaufchance"
+    },
+    "Reversal Hunter": {
+        "description": "Trendumkehr nach starkem Abverkauf",
+        "filters": {"Vortag %": (-50.0, -5.0), "Change %": (2.0, 30.0), "RVOL": (1.5, 50.0)},
+        "logic": "Gestern Crash, heute Käufer = potenzielle Umkehr"
+    },
+    "Early Momentum": {
+        "description": "Starker Tagesstart mit Volumen",
+        "filters": {"Change %": (3.0, 30.0), "RVOL": (1.5, 50.0)},
+        "logic": "Positive Bewegung mit überdurchschnittlichem Volumen"
+    },
+    "Whale Watch": {
+        "description": "Extremes Volumen - Big Player aktiv",
+        "filters": {"RVOL": (5.0, 100.0)},
+        "logic": "RVOL > 5.0 = institutionelles Interesse wahrscheinlich"
+    },
+    # GAP STRATEGIEN - NUR AKTIEN!
+    "Gap Up": {
+        "description": "📈 NUR AKTIEN: Gap nach oben - Gaps werden oft gefüllt",
+        "filters": {"Gap %": (2.0, 50.0)},
+        "logic": "Open > Previous High = Gap Up, wird oft gefüllt (Short-Chance)",
+        "stocks_only": True
+    },
+    "Gap Down": {
+        "description": "📉 NUR AKTIEN: Gap nach unten - Gaps werden oft gefüllt",
+        "filters": {"Gap %": (-50.0, -2.0)},
+        "logic": "Open < Previous Low = Gap Down, wird oft gefüllt (Long-Chance)",
+        "stocks_only": True
+    },
+    # WICK STRATEGIEN - BEIDE MÄRKTE
+    "Long Wick Up": {
+        "description": "Lange obere Wick = Verkaufsdruck, oft Reversal nach unten",
+        "filters": {"Upper Wick %": (30.0, 100.0), "Change %": (-10.0, 5.0)},
+        "logic": "Lange obere Wick zeigt Ablehnung höherer Preise = Short-Signal"
+    },
+    "Long Wick Down": {
+        "description": "Lange untere Wick = Kaufdruck, oft Reversal nach oben",
+        "filters": {"Lower Wick %": (30.0, 100.0), "Change %": (-5.0, 10.0)},
+        "logic": "Lange untere Wick zeigt Ablehnung tieferer Preise = Long-Signal"
+    },
+    # INSIDER STRATEGIEN - NUR AKTIEN
+    "Insider Buying": {
+        "description": "🔥 NUR AKTIEN: Insider (CEO, CFO, Directors) kaufen eigene Aktien",
+        "filters": {"Insider": "BUY"},
+        "logic": "Insider kaufen = Sie glauben an die Firma → Bullish Signal",
+        "stocks_only": True
+    },
+    "Insider Selling": {
+        "description": "⚠️ NUR AKTIEN: Insider verkaufen große Mengen",
+        "filters": {"Insider": "SELL"},
+        "logic": "Große Insider-Verkäufe können Warnsignal sein",
+        "stocks_only": True
+    },
+}
+
+INSIDER_STRATEGIES = ["Insider Buying", "Insider Selling"]
+
+# Zusatzfilter nach "Strategie laden" (nichts zusätzlich eingeschränkt)
+DEFAULT_ADDITIONAL_FILTERS = {
+    "preis_min": 0.0, "preis_max": 100000.0,
+    "nur_gewinner": False, "nur_verlierer": False,
+    "rvol_override_min": None, "rvol_override_max": None,
+}
+
+
+def supports_market(strategy_name, market_type):
+    """Insider- und Gap-Strategien (stocks_only) laufen nur bei Aktien"""
+    return market_type != "Krypto" or not STRATEGIES[strategy_name].get("stocks_only", False)
@@ -0,0 +1,203 @@
+"""Echtzeit-Aktien über den Polygon-WebSocket (A.* = Sekunden-Aggregate)
+
+Der Stream hält pro Ticker einen Eintrag im Format des REST-Snapshots (day, prevDay,
+min, lastTrade, todaysChangePerc, updated). live_snapshot() geht deshalb unverändert
+in scan_market(raw=...) bzw. delta.rescan - RVOL ergibt sich wie beim Snapshot aus
+day.v / prevDay.v. Startzustand (prevDay + bisheriger Tag) kommt aus dem REST-Snapshot.
+
+Optional: benötigt das Paket `websockets` (>= 11, sync API). Zum Testen ohne Polygon
+spielt alpha_core.replay aufgezeichnete Snapshots über dasselbe Protokoll ab.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+POLYGON_STREAM_URL = os.environ.get("ALPHA_STREAM_URL", "wss://socket.polygon.io/stocks")
+SUBSCRIPTION = "A.*"
+RECONNECT_DELAY = 1.0       # Sekunden, verdoppelt sich bis RECONNECT_MAX_DELAY
+RECONNECT_MAX_DELAY = 30.0
+STALE_AFTER = 30.0          # Sekunden ohne Event -> Stream gilt als inaktiv, Aufrufer pollen wieder REST
+MARKET_TZ = ZoneInfo("America/New_York")
+
+_lock = threading.Lock()
+_book = {}       # Ticker -> Eintrag im Snapshot-Format (wird bei Updates ersetzt, nie verändert)
+_status = {"connected": False, "url": None, "events": 0, "last_event": None, "error": None}
+_stop = threading.Event()
+_thread = None
+
+
+# =============================================================================
+# BOOK
+# =============================================================================
+def _session_date(ms):
+    """Handelstag (New York) eines Zeitstempels in ms"""
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).astimezone(MARKET_TZ).date()
+
+
+def seed_book(tickers):
+    """Startzustand aus einem REST-Snapshot (Liste der Ticker-Objekte)"""
+    with _lock:
+        _book.clear()
+        for t in tickers:
+            if t.get("ticker"):
+                _book[t["ticker"]] = dict(t)
+
+
+def apply_aggregate(event):
+    """Ein A-Event (Sekunden-Aggregat) in den Tageszustand des Tickers einrechnen"""
+    sym = event.get("sym")
+    close = event.get("c")
+    if not sym or not close:
+        return
+    start = event.get("s") or 0
+    end = event.get("e") or start
+
+    with _lock:
+        entry = _book.get(sym, {"ticker": sym})
+        day = entry.get("day") or {}
+        prev = entry.get("prevDay") or {}
+        updated = entry.get("updated")
+
+        # Neuer Handelstag: bisheriger Tag wird zum Vortag
+        if updated and start and _session_date(updated / 1e6) != _session_date(start):
+            prev = day if day.get("c") else prev
+            day = {}
+
+        day = {
+            "o": event.get("op") or day.get("o") or event.get("o"),
+            "h": max(day.get("h") or 0, event.get("h") or close),
+            "l": min(day.get("l") or float("inf"), event.get("l") or close),
+            "c": close,
+            "v": event.get("av") or (day.get("v") or 0) + (event.get("v") or 0),
+            "vw": event.get("a") or day.get("vw"),
+        }
+        prev_close = prev.get("c")
+        _book[sym] = {
+            **entry,
+            "day": day,
+            "prevDay": prev,
+            "min": {"o": event.get("o"), "h": event.get("h"), "l": event.get("l"), "c": close,
+                    "v": event.get("v"), "av": day["v"], "t": start},
+            "lastTrade": {"p": close, "t": end * 1_000_000},
+            "todaysChange": close - prev_close if prev_close else entry.get("todaysChange"),
+            "todaysChangePerc": (close - prev_close) / prev_close * 100 if prev_close else entry.get("todaysChangePerc"),
+            "updated": end * 1_000_000,
+        }
+        _status["events"] += 1
+        _status["last_event"] = time.time()
+
+
+def apply_message(text):
+    """Eine WebSocket-Nachricht (JSON-Array) verarbeiten -> Status-Events (Handshake)"""
+    events = json.loads(text)
+    if isinstance(events, dict):
+        events = [events]
+    status = []
+    for event in events:
+        if event.get("ev") == "A":
+            apply_aggregate(event)
+        elif event.get("ev") == "status":
+            status.append(event)
+    return status
+
+
+def live_snapshot():
+    """Aktueller Stand aller Ticker im Format von fetch_stock_snapshot"""
+    with _lock:
+        return list(_book.values())
+
+
+def stream_status():
+    with _lock:
+        return {**_status, "running": _thread is not None and _thread.is_alive(), "tickers": len(_book)}
+
+
+# =============================================================================
+# VERBINDUNG
+# =============================================================================
+def _expect(ws, wanted):
+    """Liest Nachrichten bis ein Status-Event in wanted ankommt - Fehlstatus wirft"""
+    while True:
+        for event in apply_message(ws.recv()):
+            if event.get("status") in wanted:
+                return event
+            if event.get("status") in ("auth_failed", "error"):
+                raise ConnectionError(event.get("message") or event.get("status"))
+
+
+def _session(connect, url, poly_key):
+    with connect(url, open_timeout=15, max_size=None) as ws:
+        _expect(ws, ("connected",))
+        ws.send(json.dumps({"action": "auth", "params": poly_key}))
+        _expect(ws, ("auth_success",))
+        ws.send(json.dumps({"action": "subscribe", "params": SUBSCRIPTION}))
+        with _lock:
+            _status.update(connected=True, error=None)
+        for text in ws:
+            if _stop.is_set():
+                return
+            apply_message(text)
+
+
+def _run_forever(connect, url, poly_key, seed):
+    delay = RECONNECT_DELAY
+    while not _stop.is_set():
+        try:
+            # Vor jeder (Wieder-)Verbindung neu aus REST: Events aus der Lücke fehlen sonst im Book
+            seed_book(seed() if callable(seed) else seed)
+            _session(connect, url, poly_key)
+            delay = RECONNECT_DELAY
+        except Exception as e:
+            # Vor dem Warten: während des Reconnects gilt der Stream nicht als verbunden
+            with _lock:
+                _status.update(connected=False, error=str(e))
+            _stop.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        finally:
+            with _lock:
+                _status["connected"] = False
+
+
+def start_stream(poly_key, url=None, seed=None):
+    """Startet den Stream-Thread einmal pro Prozess
+
+    seed: Liste der Ticker-Objekte für den Startzustand oder Funktion, die sie liefert
+    (Standard: REST-Snapshot). ImportError, wenn `websockets` fehlt.
+    """
+    global _thread
+    from websockets.sync.client import connect
+
+    if seed is None:
+        from alpha_core.scan import fetch_stock_snapshot
+        seed = lambda: fetch_stock_snapshot(poly_key)
+    url = url or POLYGON_STREAM_URL
+
+    with _lock:
+        _stop.clear()  # Ein gestoppter, noch laufender Thread macht einfach weiter
+        if _thread is not None and _thread.is_alive():
+            return _thread
+        _status.update(url=url, error=None)
+        _thread = threading.Thread(target=_run_forever, args=(connect, url, poly_key, seed),
+                                   name="alpha-stock-stream", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def stop_stream():
+    """Beendet den Stream nach der nächsten Nachricht, der Stand bleibt erhalten"""
+    _stop.set()
+
+
+def stream_active():
+    """Ist der Stream verbunden und kam das letzte Event vor höchstens STALE_AFTER Sekunden?
+
+    Nach einem Abbruch, während des Reconnects und außerhalb der Handelszeit ist das
+    Book eingefroren - dann False, damit Scanner und Hintergrund-Scan wieder REST nutzen.
+    """
+    with _lock:
+        last_event = _status["last_event"]
+        return (_thread is not None and _thread.is_alive() and _status["connected"] and bool(_book)
+                and last_event is not None and time.time() - last_event <= STALE_AFTER)
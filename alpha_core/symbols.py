@@ -0,0 +1,196 @@
+"""Lokaler Symbol-Index: Symbol -> CoinGecko-ID / Polygon-Ticker, Prefix- und Fuzzy-Suche
+
+Quellen: CoinGecko /coins/list (alle Coins, ein Abruf) und Polygon /v3/reference/tickers
+(aktive US-Aktien, seitenweise). Der Index liegt als JSON auf der Platte und wird im
+Hintergrund-Scanner erneuert, sobald er älter als SYMBOL_INDEX_TTL ist. Auflösen und
+Autocomplete laufen danach ohne Netzwerk: dict-Lookup bzw. bisect über sortierte Symbole.
+"""
+import bisect
+import difflib
+import json
+import os
+import threading
+import time
+
+from alpha_core.http_cache import cached_get
+from alpha_core.rate_limit import COINGECKO_LIMITER
+
+SYMBOL_INDEX_FILE = os.environ.get("ALPHA_SYMBOL_INDEX",
+                                   os.path.join(os.path.expanduser("~"), ".alpha_station", "symbols.json"))
+SYMBOL_INDEX_TTL = 24 * 60 * 60
+
+COINGECKO_LIST_URL = "https://api.coingecko.com/api/v3/coins/list"
+POLYGON_REFERENCE_URL = "https://api.polygon.io/v3/reference/tickers"
+POLYGON_PAGE_LIMIT = 1000
+POLYGON_MAX_PAGES = 30
+
+_lock = threading.Lock()
+_index = {"built": 0, "Krypto": None, "Aktien": None}   # Markt -> _MarketIndex
+_loaded = False
+
+
+class _MarketIndex:
+    """Einträge eines Marktes: exakt (dict), Prefix (sortierte Schlüssel), Namen für Fuzzy"""
+
+    def __init__(self, entries):
+        # entries: [{"symbol", "id", "name", "rank"}] - bei gleichem Symbol gewinnt der beste Rang
+        self.entries = sorted(entries, key=lambda e: (e["symbol"], e.get("rank") or float("inf")))
+        self.by_symbol = {}
+        for e in self.entries:
+            self.by_symbol.setdefault(e["symbol"], e)
+        self.symbols = [e["symbol"] for e in self.entries]
+        self.names = {}
+        for e in self.entries:
+            self.names.setdefault((e.get("name") or "").lower(), e)
+
+    def prefix(self, text, limit):
+        start = bisect.bisect_left(self.symbols, text)
+        stop = bisect.bisect_left(self.symbols, text + "\uffff", lo=start)
+        hits = sorted(self.entries[start:stop], key=lambda e: (e["symbol"] != text, e.get("rank") or float("inf"),
+                                                               len(e["symbol"])))
+        return hits[:limit]
+
+
+# =============================================================================
+# AUFBAU
+# =============================================================================
+def _crypto_ranks():
+    """CoinGecko-ID -> Market-Cap-Rang aus den (gecachten) Markets-Seiten des Scans"""
+    from alpha_core.scan import fetch_crypto_markets
+
+    try:
+        return {c["id"]: c.get("market_cap_rank") for c in fetch_crypto_markets()}
+    except Exception:
+        return {}
+
+
+def fetch_crypto_symbols():
+    resp = cached_get(COINGECKO_LIST_URL, endpoint="reference", timeout=30, limiter=COINGECKO_LIMITER, retries=2)
+    if resp.status_code != 200:
+        return []
+    ranks = _crypto_ranks()
+    return [
+        {"symbol": (c.get("symbol") or "").upper(), "id": c["id"], "name": c.get("name", ""), "rank": ranks.get(c["id"])}
+        for c in resp.json() if c.get("id") and c.get("symbol")
+    ]
+
+
+def fetch_stock_symbols(poly_key):
+    """Aktive US-Aktien über alle Seiten (next_url-Cursor)"""
+    symbols = []
+    url, params = POLYGON_REFERENCE_URL, {"market": "stocks", "active": "true", "limit": POLYGON_PAGE_LIMIT, "apiKey": poly_key}
+    for _ in range(POLYGON_MAX_PAGES):
+        resp = cached_get(url, params=params, endpoint="reference", timeout=30)
+        if resp.status_code != 200:
+            break
+        data = resp.json()
+        symbols += [{"symbol": t["ticker"], "id": t["ticker"], "name": t.get("name", ""), "rank": None}
+                    for t in data.get("results", []) if t.get("ticker")]
+        if not data.get("next_url"):
+            break
+        url, params = data["next_url"], {"apiKey": poly_key}
+    return symbols
+
+
+def _install(data):
+    with _lock:
+        _index["built"] = data.get("built", 0)
+        for market in ("Krypto", "Aktien"):
+            if data.get(market):
+                _index[market] = _MarketIndex(data[market])
+
+
+def _load():
+    """Index einmal pro Prozess von der Platte laden"""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        with open(SYMBOL_INDEX_FILE, encoding="utf-8") as f:
+            _install(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+
+def refresh_index(poly_key=None, force=False):
+    """Index neu holen, wenn älter als SYMBOL_INDEX_TTL (oder force) -> True wenn erneuert
+
+    Ein Markt, der nicht geholt werden kann, behält seinen alten Stand.
+    """
+    _load()
+    if not force and time.time() - _index["built"] < SYMBOL_INDEX_TTL:
+        return False
+
+    data = {"built": time.time(), "Krypto": fetch_crypto_symbols(), "Aktien": fetch_stock_symbols(poly_key) if poly_key else []}
+    for market in ("Krypto", "Aktien"):
+        if not data[market] and _index[market] is not None:
+            data[market] = _index[market].entries
+    _install(data)
+    try:
+        os.makedirs(os.path.dirname(SYMBOL_INDEX_FILE) or ".", exist_ok=True)
+        tmp = SYMBOL_INDEX_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, SYMBOL_INDEX_FILE)
+    except OSError:
+        pass
+    return True
+
+
+def index_status():
+    _load()
+    with _lock:
+        return {
+            "built": _index["built"] or None,
+            "Krypto": len(_index["Krypto"].entries) if _index["Krypto"] else 0,
+            "Aktien": len(_index["Aktien"].entries) if _index["Aktien"] else 0,
+        }
+
+
+# =============================================================================
+# SUCHE
+# =============================================================================
+def _market_index(market_type):
+    _load()
+    with _lock:
+        return _index.get(market_type)
+
+
+def resolve(symbol, market_type):
+    """Exakter Treffer (bei Mehrdeutigkeit der beste Market-Cap-Rang) oder None"""
+    index = _market_index(market_type)
+    return index.by_symbol.get(symbol.strip().upper()) if index and symbol else None
+
+
+def complete(text, market_type=None, limit=10):
+    """Autocomplete: Symbol-Prefix, dann Namens-Prefix, dann Fuzzy - Einträge mit "market" """
+    text = (text or "").strip()
+    if not text:
+        return []
+    markets = [market_type] if market_type else ["Aktien", "Krypto"]
+    hits = []
+    for market in markets:
+        index = _market_index(market)
+        if index is None:
+            continue
+        found = index.prefix(text.upper(), limit)
+        if len(found) < limit:
+            lowered = text.lower()
+            found += [e for name, e in index.names.items() if name.startswith(lowered) and e not in found][:limit - len(found)]
+        if not found:
+            found = fuzzy(text, market, limit)
+        hits += [{**e, "market": market} for e in found]
+    return hits[:limit]
+
+
+def fuzzy(text, market_type, limit=5):
+    """Ähnliche Symbole/Namen (Tippfehler) - nur als Fallback, difflib über den ganzen Index"""
+    index = _market_index(market_type)
+    if index is None:
+        return []
+    by_symbol = difflib.get_close_matches(text.upper(), index.by_symbol.keys(), n=limit, cutoff=0.75)
+    by_name = difflib.get_close_matches(text.lower(), index.names.keys(), n=limit, cutoff=0.75)
+    found = [index.by_symbol[s] for s in by_symbol]
+    found += [index.names[n] for n in by_name if index.names[n] not in found]
+    return found[:limit]
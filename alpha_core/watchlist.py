@@ -0,0 +1,314 @@
+"""Persistente Watchlist (SQLite) + gebündelte Live-Kurse
+
+Ein Eintrag pro (Markt, Symbol), überlebt Browser-Session und Neustart. Symbol ist bei
+Aktien der Ticker, bei Krypto die CoinGecko-ID - Coins mit gleichem Kürzel (mehrere "UNI",
+"ONE", ...) überschreiben sich nicht gegenseitig. Live-Kurse
+kommen in wenigen Abrufen für die ganze Liste: Polygon Snapshot mit tickers=A,B,...
+und CoinGecko simple/price mit ids=a,b,... - statt eines Aufrufs pro Ticker.
+"""
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from alpha_core.http_cache import cached_get
+from alpha_core.rate_limit import COINGECKO_LIMITER
+from alpha_core.scan import COINGECKO_MARKETS_URL, POLYGON_SNAPSHOT_URL
+
+WATCHLIST_DB = os.environ.get("ALPHA_WATCHLIST_DB", os.path.join(os.path.expanduser("~"), ".alpha_station", "watchlist.sqlite"))
+
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+# Symbole pro Abruf (URL-Länge) und parallele Abrufe
+STOCK_CHUNK = 250
+CRYPTO_CHUNK = 250
+QUOTE_WORKERS = 4
+
+_lock = threading.Lock()
+_schema_ready = set()
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+def _symbol(market_type, ticker, coin_id=None):
+    """Schlüssel innerhalb des Marktes: Krypto per CoinGecko-ID (Kürzel sind nicht eindeutig)"""
+    return coin_id if market_type == "Krypto" and coin_id else ticker
+
+
+def entry_key(entry):
+    """(Markt, Symbol) eines Eintrags - gleicher Schlüssel wie in der Datenbank"""
+    return entry["market"], _symbol(entry["market"], entry["ticker"], entry.get("coin_id"))
+
+
+def _migrate(conn):
+    """Alte Tabelle mit PRIMARY KEY (market, ticker) auf (market, symbol) umstellen"""
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(watchlist)")}
+    if not columns or "symbol" in columns:
+        return
+    conn.execute("ALTER TABLE watchlist RENAME TO watchlist_old")
+    _create(conn)
+    conn.execute("""
+        INSERT OR IGNORE INTO watchlist (market, symbol, ticker, coin_id, price, added, data)
+        SELECT market,
+               CASE WHEN market = 'Krypto' AND coin_id IS NOT NULL AND coin_id != '' THEN coin_id ELSE ticker END,
+               ticker, coin_id, price, added, data
+        FROM watchlist_old ORDER BY rowid
+    """)
+    conn.execute("DROP TABLE watchlist_old")
+
+
+def _create(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS watchlist (
+            market  TEXT NOT NULL,
+            symbol  TEXT NOT NULL,
+            ticker  TEXT NOT NULL,
+            coin_id TEXT,
+            price   REAL,
+            added   TEXT,
+            data    TEXT,
+            PRIMARY KEY (market, symbol)
+        )
+    """)
+
+
+def _connect():
+    os.makedirs(os.path.dirname(WATCHLIST_DB) or ".", exist_ok=True)
+    conn = sqlite3.connect(WATCHLIST_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if WATCHLIST_DB not in _schema_ready:
+        with conn:
+            _migrate(conn)
+            _create(conn)
+        _schema_ready.add(WATCHLIST_DB)
+    return conn
+
+
+@contextmanager
+def _db():
+    """Eine Verbindung pro Aufruf (Streamlit-Reruns laufen in wechselnden Threads)"""
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def make_entry(ticker, market_type, data):
+    return {
+        "ticker": ticker,
+        "market": market_type,
+        "coin_id": data.get("CoinID"),
+        "price": data.get("Preis", 0),
+        "added": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "data": data
+    }
+
+
+def _row_to_entry(row):
+    return {
+        "ticker": row["ticker"],
+        "market": row["market"],
+        "coin_id": row["coin_id"],
+        "price": row["price"],
+        "added": row["added"],
+        "data": json.loads(row["data"] or "{}"),
+    }
+
+
+def load_watchlist():
+    """Alle Einträge in Hinzufügen-Reihenfolge"""
+    with _db() as conn:
+        return [_row_to_entry(r) for r in conn.execute("SELECT * FROM watchlist ORDER BY rowid")]
+
+
+def add_to_watchlist(ticker, market_type, data):
+    """Fügt Ticker zur Watchlist hinzu - False, wenn schon vorhanden"""
+    entry = make_entry(ticker, market_type, data)
+    with _db() as conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO watchlist (market, symbol, ticker, coin_id, price, added, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*entry_key(entry), ticker, entry["coin_id"], entry["price"], entry["added"],
+             json.dumps(data, ensure_ascii=False, default=str))
+        )
+        return cur.rowcount == 1
+
+
+def remove_from_watchlist(ticker, market_type=None, coin_id=None):
+    """Entfernt den Eintrag (ohne Markt: den Ticker in beiden Märkten)
+
+    Krypto mit coin_id entfernt genau diesen Coin, nicht andere mit gleichem Kürzel.
+    """
+    with _db() as conn:
+        if market_type is None:
+            conn.execute("DELETE FROM watchlist WHERE ticker = ?", (ticker,))
+        else:
+            conn.execute("DELETE FROM watchlist WHERE market = ? AND symbol = ?",
+                         (market_type, _symbol(market_type, ticker, coin_id)))
+
+
+def clear_watchlist():
+    with _db() as conn:
+        conn.execute("DELETE FROM watchlist")
+
+
+def _set_coin_id(ticker, coin_id):
+    """Alten Eintrag ohne ID auf die CoinGecko-ID umschlüsseln (gibt es den Coin schon: Duplikat löschen)"""
+    with _db() as conn:
+        conn.execute("UPDATE OR IGNORE watchlist SET coin_id = ?, symbol = ? "
+                     "WHERE market = 'Krypto' AND symbol = ? AND coin_id IS NULL", (coin_id, coin_id, ticker))
+        conn.execute("DELETE FROM watchlist WHERE market = 'Krypto' AND symbol = ? AND coin_id IS NULL", (ticker,))
+
+
+# =============================================================================
+# LIVE-KURSE
+# =============================================================================
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _stock_snapshot(tickers, poly_key):
+    """Polygon Snapshot für eine Ticker-Liste -> Ticker-Objekte wie im Gesamt-Snapshot"""
+    resp = cached_get(POLYGON_SNAPSHOT_URL, params={"tickers": ",".join(tickers), "apiKey": poly_key},
+                      endpoint="snapshot", timeout=15)
+    if resp.status_code != 200:
+        return []
+    return resp.json().get("tickers", []) or []
+
+
+def _crypto_markets(coin_ids):
+    """CoinGecko /coins/markets für eine ID-Liste -> Coin-Objekte wie im Markt-Scan"""
+    params = {"vs_currency": "usd", "ids": ",".join(coin_ids), "per_page": len(coin_ids), "page": 1,
+              "sparkline": False, "price_change_percentage": "24h,7d"}
+    resp = cached_get(COINGECKO_MARKETS_URL, params=params, endpoint="markets", timeout=30,
+                      limiter=COINGECKO_LIMITER, retries=2)
+    if resp.status_code != 200:
+        return []
+    coins = resp.json()
+    return coins if isinstance(coins, list) else []
+
+
+def _stock_quotes(tickers, poly_key):
+    """Polygon Snapshot für eine Ticker-Liste -> {ticker: quote}"""
+    quotes = {}
+    for t in _stock_snapshot(tickers, poly_key):
+        day = t.get("day", {}) or {}
+        prev = t.get("prevDay", {}) or {}
+        last = t.get("lastTrade", {}) or {}
+        minute = t.get("min", {}) or {}
+        price = day.get("c") or last.get("p") or minute.get("c") or prev.get("c")
+        if price:
+            quotes[t.get("ticker")] = {"price": price, "change_pct": t.get("todaysChangePerc"), "updated": t.get("updated")}
+    return quotes
+
+
+def _crypto_quotes(coin_ids):
+    """CoinGecko simple/price für eine ID-Liste -> {coin_id: quote}"""
+    params = {"ids": ",".join(coin_ids), "vs_currencies": "usd", "include_24hr_change": "true",
+              "include_last_updated_at": "true"}
+    resp = cached_get(COINGECKO_PRICE_URL, params=params, endpoint="price", timeout=15,
+                      limiter=COINGECKO_LIMITER, retries=2)
+    if resp.status_code != 200:
+        return {}
+    return {
+        coin_id: {"price": q.get("usd"), "change_pct": q.get("usd_24h_change"), "updated": q.get("last_updated_at")}
+        for coin_id, q in (resp.json() or {}).items() if q.get("usd")
+    }
+
+
+def _resolve_coin_ids(entries):
+    """Ältere Krypto-Einträge ohne CoinGecko-ID einmalig nachschlagen und speichern"""
+    from alpha_core.lookup import find_coin_id
+
+    for entry in entries:
+        if entry["market"] == "Krypto" and not entry.get("coin_id"):
+            try:
+                entry["coin_id"] = find_coin_id(entry["ticker"])
+            except Exception:
+                continue
+            if entry["coin_id"]:
+                _set_coin_id(entry["ticker"], entry["coin_id"])
+
+
+def _symbols(entries, poly_key):
+    """(Aktien-Ticker, CoinGecko-IDs) der Einträge, sortiert und ohne Doppelte"""
+    _resolve_coin_ids(entries)
+    stocks = sorted({e["ticker"] for e in entries if e["market"] == "Aktien"}) if poly_key else []
+    coins = sorted({e["coin_id"] for e in entries if e["market"] == "Krypto" and e.get("coin_id")})
+    return stocks, coins
+
+
+def _run_chunked(jobs):
+    """(Funktion, Argumente)-Jobs parallel - ein fehlgeschlagener Block kostet nur seine Symbole"""
+    def run(job):
+        fn, args = job
+        try:
+            return fn(*args)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=QUOTE_WORKERS) as pool:
+        return list(pool.map(run, jobs))
+
+
+def fetch_raw(entries, poly_key=None):
+    """Vollständige Snapshot-/Markets-Objekte aller Einträge -> (Aktien-Ticker, Coins)
+
+    Gleiche Abrufe wie der jeweilige Markt-Scan, nur auf die Watchlist beschränkt -
+    die Ergebnisse gehen direkt in scan_stock_strategies / scan_crypto_strategies.
+    """
+    stocks, coins = _symbols(entries, poly_key)
+    stock_jobs = [(_stock_snapshot, (chunk, poly_key)) for chunk in _chunks(stocks, STOCK_CHUNK)]
+    coin_jobs = [(_crypto_markets, (chunk,)) for chunk in _chunks(coins, CRYPTO_CHUNK)]
+    results = _run_chunked(stock_jobs + coin_jobs)
+    stock_objs = [t for r in results[:len(stock_jobs)] if r for t in r]
+    coin_objs = [c for r in results[len(stock_jobs):] if r for c in r]
+    return stock_objs, coin_objs
+
+
+def fetch_quotes(entries, poly_key=None):
+    """Live-Kurse für alle Einträge in gebündelten Abrufen -> {entry_key: quote}
+
+    quote: price, change_pct, updated. Fehlende Kurse (Fehler, unbekannt) fehlen im dict.
+    """
+    stocks, coins = _symbols(entries, poly_key)
+    jobs = [(_stock_quotes, (chunk, poly_key)) for chunk in _chunks(stocks, STOCK_CHUNK)]
+    jobs += [(_crypto_quotes, (chunk,)) for chunk in _chunks(coins, CRYPTO_CHUNK)]
+
+    stock_quotes, crypto_quotes = {}, {}
+    for (fn, _), result in zip(jobs, _run_chunked(jobs)):
+        (stock_quotes if fn is _stock_quotes else crypto_quotes).update(result or {})
+
+    quotes = {}
+    for e in entries:
+        quote = stock_quotes.get(e["ticker"]) if e["market"] == "Aktien" else crypto_quotes.get(e.get("coin_id"))
+        if quote:
+            quotes[entry_key(e)] = quote
+    return quotes
+
+
+def with_pnl(entries, quotes):
+    """Einträge + Live-Kurs und P&L seit dem Hinzufügen (Tabellenzeilen)"""
+    rows = []
+    for e in entries:
+        quote = quotes.get(entry_key(e)) or {}
+        live = quote.get("price")
+        added_price = e.get("price") or 0
+        pnl = round((live - added_price) / added_price * 100, 2) if live and added_price else None
+        rows.append({
+            "Ticker": e["ticker"],
+            "Markt": e["market"],
+            "Preis (hinzugefügt)": added_price,
+            "Live": live,
+            "Chg%": round(quote["change_pct"], 2) if quote.get("change_pct") is not None else None,
+            "P&L%": pnl,
+            "Hinzugefügt": e["added"],
+        })
+    return rows
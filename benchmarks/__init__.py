@@ -0,0 +1 @@
+"""Benchmarks der Daten-Engine (alpha_core) mit Fixture-Antworten im echten API-Format"""
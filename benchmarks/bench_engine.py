@@ -0,0 +1,312 @@
+"""Benchmarks der Scan-Engine mit Fixture-Antworten (kein Netzwerk)
+
+    python -m benchmarks.bench_engine                           # 1k, 10k, 100k
+    python -m benchmarks.bench_engine --sizes 1000 --repeat 5 --json out.json
+    python -m benchmarks.bench_engine --record --poly KEY --finnhub KEY   # Fixtures neu aufzeichnen
+
+Die mitgelieferten Fixtures in benchmarks/fixtures sind SYNTHETISCH: erzeugte Werte im
+echten Antwortformat (Polygon Snapshot, CoinGecko markets/ohlc, Finnhub insider), keine
+Mitschnitte. --record ersetzt sie durch echte, gekürzte Antworten der APIs. Für größere
+Universen werden ihre Einträge vervielfältigt (eigene Ticker/IDs, verrauschte Preise).
+Eine Replay-Session ersetzt die geteilte requests.Session und liefert JSON-Bytes - das
+Parsen wird mitgemessen. Die Rate-Limiter sind während der Messung offen: gemessen wird
+die Engine, nicht die Quote.
+
+Ziele (Namen wie in scanner.py):
+  fetch_stock_data             Snapshot holen + Kennzahlen + Filter    Größe = Ticker
+  fetch_crypto_data            Markets-Seiten holen + Filter            Größe = Coins
+  calculate_sr_from_historical Swings, Zonen, Fibonacci                 Größe = Kerzen
+  fetch_insider_transactions   Finnhub pro Ticker + Aggregation         Größe = Ticker
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from alpha_core import http_session
+from alpha_core.http_cache import cache_clear
+from alpha_core.insider import INSIDER_URL, iter_insider_signals, rank_insider_signals
+from alpha_core.rate_limit import COINGECKO_LIMITER, FINNHUB_LIMITER
+from alpha_core.scan import COINGECKO_MARKETS_URL, POLYGON_SNAPSHOT_URL, range_strategies, scan_market
+from alpha_core.sr import calculate_sr_from_historical
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+SEED = 42
+
+STOCK_PRICE_FIELDS = {"day": "ohlcv", "prevDay": "ohlc", "min": "ohlc", "lastTrade": "p", "lastQuote": "Pp"}
+CRYPTO_PRICE_FIELDS = ["current_price", "high_24h", "low_24h", "price_change_24h", "ath", "atl"]
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _jitter(d, keys, factor):
+    return {k: v * factor if k in keys and isinstance(v, (int, float)) else v for k, v in d.items()}
+
+
+def scale_tickers(base, n, rnd):
+    """n Polygon-Ticker aus denen der Fixture - Kopien bekommen Suffix + eigenen Preis"""
+    tickers = []
+    for i in range(n):
+        t = base[i % len(base)]
+        if i < len(base):
+            tickers.append(t)
+            continue
+        factor = rnd.uniform(0.5, 2.0)
+        copy = dict(t, ticker=f"{t['ticker']}{i // len(base)}")
+        for field, keys in STOCK_PRICE_FIELDS.items():
+            if isinstance(t.get(field), dict):
+                copy[field] = _jitter(t[field], keys, factor)
+        copy["todaysChangePerc"] = (t.get("todaysChangePerc") or 0) * rnd.uniform(0.5, 1.5)
+        tickers.append(copy)
+    return tickers
+
+
+def scale_coins(base, n, rnd):
+    """n CoinGecko-Coins, nach Market Cap absteigend wie /coins/markets"""
+    coins = []
+    for i in range(n):
+        c = base[i % len(base)]
+        if i >= len(base):
+            factor = rnd.uniform(0.5, 2.0)
+            c = dict(c, id=f"{c['id']}-{i // len(base)}", symbol=f"{c['symbol']}{i // len(base)}",
+                     market_cap=(c.get("market_cap") or 0) * rnd.uniform(0.01, 0.5),
+                     price_change_percentage_24h_in_currency=(c.get("price_change_percentage_24h_in_currency") or 0) * rnd.uniform(0.5, 1.5))
+            c.update({k: c[k] * factor for k in CRYPTO_PRICE_FIELDS if isinstance(c.get(k), (int, float))})
+        coins.append(c)
+    coins.sort(key=lambda c: c.get("market_cap") or 0, reverse=True)
+    for rank, c in enumerate(coins, 1):
+        c["market_cap_rank"] = rank
+    return coins
+
+
+def scale_ohlc(base, n, rnd):
+    """n Kerzen: Serie aus der Fixture + Random Walk mit deren Schwankung"""
+    candles = [list(c) for c in base[:n]]
+    step = base[1][0] - base[0][0]
+    t, close = candles[-1][0], candles[-1][4]
+    while len(candles) < n:
+        t += step
+        o = close
+        close = o * rnd.uniform(0.985, 1.016)
+        candles.append([t, o, max(o, close) * rnd.uniform(1, 1.008), min(o, close) * rnd.uniform(0.992, 1), close])
+    return candles
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+class ReplayResponse:
+    def __init__(self, status_code, body=b""):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ReplaySession:
+    """Ersatz für requests.Session: beantwortet Polygon/CoinGecko/Finnhub aus dem Speicher"""
+
+    def __init__(self, tickers=None, coins=None, ohlc=None, insider=None):
+        self.snapshot = json.dumps({"status": "OK", "tickers": tickers or []}).encode()
+        self.coins = coins or []
+        self.pages = {}
+        self.ohlc = json.dumps(ohlc or []).encode()
+        self.insider = json.dumps(insider or {"data": []}).encode()
+
+    def get(self, url, params=None, timeout=None):
+        params = params or {}
+        if url.startswith(POLYGON_SNAPSHOT_URL):
+            return ReplayResponse(200, self.snapshot)
+        if url == COINGECKO_MARKETS_URL:
+            page, per_page = int(params.get("page", 1)), int(params.get("per_page", 100))
+            if page not in self.pages:
+                self.pages[page] = json.dumps(self.coins[(page - 1) * per_page:page * per_page]).encode()
+            return ReplayResponse(200, self.pages[page])
+        if url.endswith("/ohlc"):
+            return ReplayResponse(200, self.ohlc)
+        if url == INSIDER_URL:
+            return ReplayResponse(200, self.insider)
+        return ReplayResponse(404)
+
+
+@contextmanager
+def replay(session):
+    """Replay-Session statt der geteilten Session, Limiter offen, HTTP-Cache leer"""
+    saved_session = http_session._session
+    saved_limits = [(b, b.rate, b.capacity) for b in (COINGECKO_LIMITER, FINNHUB_LIMITER)]
+    http_session._session = session
+    for bucket, _, _ in saved_limits:
+        bucket.rate = bucket.capacity = bucket.tokens = 1e12
+    cache_clear()
+    try:
+        yield session
+    finally:
+        http_session._session = saved_session
+        for bucket, rate, capacity in saved_limits:
+            bucket.rate, bucket.capacity, bucket.tokens = rate, capacity, float(capacity)
+        cache_clear()
+
+
+# =============================================================================
+# ZIELE
+# =============================================================================
+def _first_strategy(market_type):
+    return next(iter(range_strategies(market_type).values()))
+
+
+def bench_stock_scan(n, rnd):
+    session = ReplaySession(tickers=scale_tickers(load_fixture("polygon_snapshot.json")["tickers"], n, rnd))
+    filters = _first_strategy("Aktien")
+
+    def run():
+        cache_clear()
+        return scan_market("Aktien", filters, DEFAULT_ADDITIONAL_FILTERS, poly_key="bench")
+    return session, run
+
+
+def bench_crypto_scan(n, rnd):
+    session = ReplaySession(coins=scale_coins(load_fixture("coingecko_markets.json"), n, rnd))
+    filters = _first_strategy("Krypto")
+
+    def run():
+        cache_clear()
+        return scan_market("Krypto", filters, DEFAULT_ADDITIONAL_FILTERS, max_coins=n)
+    return session, run
+
+
+def bench_sr(n, rnd):
+    ohlc = scale_ohlc(load_fixture("coingecko_ohlc.json"), n, rnd)
+    price = ohlc[-1][4]
+    return ReplaySession(), lambda: calculate_sr_from_historical(ohlc, price)
+
+
+def bench_insider(n, rnd):
+    session = ReplaySession(insider=load_fixture("finnhub_insider.json"))
+    tickers = [f"T{i:06d}" for i in range(n)]
+
+    def run():
+        cache_clear()
+        signals = [s for _, s in iter_insider_signals("bench", "BUY", tickers=tickers) if s]
+        return rank_insider_signals(signals, "BUY")
+    return session, run
+
+
+TARGETS = {
+    "fetch_stock_data": (bench_stock_scan, "Ticker"),
+    "fetch_crypto_data": (bench_crypto_scan, "Coins"),
+    "calculate_sr_from_historical": (bench_sr, "Kerzen"),
+    "fetch_insider_transactions": (bench_insider, "Ticker"),
+}
+
+
+# =============================================================================
+# MESSUNG
+# =============================================================================
+def measure(target, n, repeat=DEFAULT_REPEAT):
+    """Zeiten (ohne tracemalloc) + ein Lauf mit tracemalloc für den Speicher-Peak"""
+    factory, unit = TARGETS[target]
+    session, run = factory(n, random.Random(SEED))
+    with replay(session):
+        run()  # Aufwärmen (Imports, Seiten-Serialisierung)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "target": target, "size": n, "unit": unit, "repeat": repeat,
+        "median_s": median, "best_s": min(times),
+        "throughput": n / median if median else float("inf"),
+        "peak_mib": peak / 2 ** 20,
+    }
+
+
+HEADER = f"{'Ziel':<30}{'Größe':>9}  {'Median':>9}  {'Best':>9}  {'Durchsatz':>17}  {'Peak':>9}"
+
+
+def format_row(r):
+    return (f"{r['target']:<30}{r['size']:>9,}  {r['median_s'] * 1000:>7.1f}ms  {r['best_s'] * 1000:>7.1f}ms  "
+            f"{r['throughput']:>9,.0f} {r['unit'] + '/s':<8}{r['peak_mib']:>7.1f}MiB")
+
+
+# =============================================================================
+# AUFZEICHNEN
+# =============================================================================
+def record_fixtures(poly_key=None, finnhub_key=None, sample=30):
+    """Echte Antworten holen und gekürzt als Fixtures ablegen (Netzwerk + Keys nötig)"""
+    session = http_session.get_session()
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+
+    def save(name, payload):
+        with open(os.path.join(FIXTURE_DIR, name), "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=1)
+        print(f"✓ {name}")
+
+    coins = session.get(COINGECKO_MARKETS_URL, params={
+        "vs_currency": "usd", "order": "market_cap_desc", "per_page": sample, "page": 1,
+        "sparkline": False, "price_change_percentage": "24h,7d"}, timeout=30).json()
+    save("coingecko_markets.json", coins)
+    ohlc = session.get("https://api.coingecko.com/api/v3/coins/bitcoin/ohlc",
+                       params={"vs_currency": "usd", "days": 30}, timeout=30).json()
+    save("coingecko_ohlc.json", ohlc)
+    if poly_key:
+        snap = session.get(POLYGON_SNAPSHOT_URL, params={"apiKey": poly_key}, timeout=30).json()
+        snap["tickers"] = snap.get("tickers", [])[:sample]
+        snap["count"] = len(snap["tickers"])
+        save("polygon_snapshot.json", snap)
+    if finnhub_key:
+        insider = session.get(INSIDER_URL, params={"symbol": "AAPL", "token": finnhub_key}, timeout=30).json()
+        insider["data"] = insider.get("data", [])[:20]
+        save("finnhub_insider.json", insider)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON speichern")
+    parser.add_argument("--record", action="store_true", help="Fixtures von den echten APIs neu aufzeichnen")
+    parser.add_argument("--poly", default=os.environ.get("POLYGON_KEY"))
+    parser.add_argument("--finnhub", default=os.environ.get("FINNHUB_KEY"))
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.poly, args.finnhub)
+        return
+
+    print(HEADER)
+    rows = []
+    for target in args.targets:
+        for n in args.sizes:
+            rows.append(measure(target, n, args.repeat))
+            print(format_row(rows[-1]), flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
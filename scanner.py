@@ -1,11 +1,31 @@
 import streamlit as st
 import pandas as pd
-import requests
 import anthropic
 import json
 from datetime import datetime
 from streamlit_autorefresh import st_autorefresh
 
+from alpha_core import watchlist
+from alpha_core.analysis import (
+    QUICK_MAX_TOKENS, REPORT_MAX_TOKENS, build_quick_request, build_report_request, build_sr_text,
+    merge_screening, screen_key, screen_results, stream_analysis
+)
+from alpha_core.http_cache import cache_stats
+from alpha_core.insider import fetch_insider_signals
+from alpha_core.compare import compare_symbols, compare_table, parse_symbol_list
+from alpha_core.lookup import fetch_news_text, lookup_symbol
+from alpha_core.symbols import complete, index_status, resolve
+from alpha_core.monitor import ALERT_FILE, ALERT_WEBHOOK, MONITOR_INTERVAL, recent_alerts
+from alpha_core.report_cache import fingerprint, get_report, put_report, report_history
+from alpha_core.scan import (
+    CRYPTO_UNIVERSE, CRYPTO_UNIVERSE_OPTIONS, RateLimited, partial_warning, scan_all_strategies, scan_market,
+    scan_stocks_incremental, top_results
+)
+from alpha_core.scheduler import get_published, start_scheduler
+from alpha_core.sr import CRYPTO_BATCH_FETCH, batch_sr_levels, calculate_sr_levels, sr_distances, with_sr_distances
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, STRATEGIES
+from alpha_core.stream import live_snapshot, start_stream, stream_active, stream_status
+
 # =============================================================================
 # 1. INITIALISIERUNG
 # =============================================================================
@@ -22,7 +42,7 @@ if "current_strategy" not in st.session_state:
 if "market_type" not in st.session_state:
     st.session_state.market_type = "Krypto"
 if "watchlist" not in st.session_state:
-    st.session_state.watchlist = []
+    st.session_state.watchlist = watchlist.load_watchlist()
 if "sr_levels" not in st.session_state:
     st.session_state.sr_levels = {"support": [], "resistance": []}
 if "fib_info" not in st.session_state:
@@ -31,98 +51,8 @@ if "auto_refresh_enabled" not in st.session_state:
     st.session_state.auto_refresh_enabled = False
 
 # =============================================================================
-# 2. STRATEGIE-DEFINITIONEN
+# 2. STRATEGIE-DEFINITIONEN (alpha_core.strategies)
 # =============================================================================
-STRATEGIES = {
-    "Volume Surge": {
-        "description": "Aktien/Krypto mit überdurchschnittlichem Volumen",
-        "filters": {"RVOL": (2.0, 50.0)},
-        "logic": "RVOL > 2.0 zeigt erhöhtes Interesse"
-    },
-    "Bull Flag": {
-        "description": "Konsolidierung nach starkem Anstieg - Volumen nimmt ab",
-        "filters": {"Vortag %": (4.0, 25.0), "Change %": (-2.0, 2.0), "RVOL": (0.3, 1.5)},
-        "logic": "Vortag stark positiv, heute seitwärts, Volumen sinkt = Bullflag"
-    },
-    "Bear Flag": {
-        "description": "Konsolidierung nach Abverkauf - Short-Setup",
-        "filters": {"Vortag %": (-25.0, -4.0), "Change %": (-2.0, 2.0), "RVOL": (0.3, 1.5)},
-        "logic": "Vortag stark negativ, heute seitwärts, Volumen sinkt = Bearflag"
-    },
-    "Breakout Long": {
-        "description": "Momentum-Ausbruch mit Volumen-Bestätigung",
-        "filters": {"Change %": (5.0, 50.0), "RVOL": (2.0, 50.0), "Close Position": (0.75, 1.0)},
-        "logic": "Starker Anstieg + hohes Volumen + Close nahe High"
-    },
-    "Breakdown Short": {
-        "description": "Abverkauf mit Volumen - Short-Chance",
-        "filters": {"Change %": (-50.0, -5.0), "RVOL": (2.0, 50.0), "Close Position": (0.0, 0.25)},
-        "logic": "Starker Abverkauf + hohes Volumen + Close nahe Low"
-    },
-    "Penny Rockets": {
-        "description": "Günstige Coins/Aktien mit explosivem Volumen",
-        "filters": {"Preis": (0.0001, 1.0), "RVOL": (3.0, 100.0), "Change %": (2.0, 100.0)},
-        "logic": "Lowcaps unter $1 mit extremem Interesse"
-    },
-    "Dip Buy": {
-        "description": "Qualitäts-Assets im Rücksetzer ohne Panik",
-        "filters": {"Preis": (10.0, 100000.0), "Change %": (-8.0, -2.0), "RVOL": (0.5, 2.0)},
-        "logic": "Moderater Rücksetzer ohne Volumen-Panik = Kaufchance"
-    },
-    "Reversal Hunter": {
-        "description": "Trendumkehr nach starkem Abverkauf",
-        "filters": {"Vortag %": (-50.0, -5.0), "Change %": (2.0, 30.0), "RVOL": (1.5, 50.0)},
-        "logic": "Gestern Crash, heute Käufer = potenzielle Umkehr"
-    },
-    "Early Momentum": {
-        "description": "Starker Tagesstart mit Volumen",
-        "filters": {"Change %": (3.0, 30.0), "RVOL": (1.5, 50.0)},
-        "logic": "Positive Bewegung mit überdurchschnittlichem Volumen"
-    },
-    "Whale Watch": {
-        "description": "Extremes Volumen - Big Player aktiv",
-        "filters": {"RVOL": (5.0, 100.0)},
-        "logic": "RVOL > 5.0 = institutionelles Interesse wahrscheinlich"
-    },
-    # GAP STRATEGIEN - NUR AKTIEN!
-    "Gap Up": {
-        "description": "📈 NUR AKTIEN: Gap nach oben - Gaps werden oft gefüllt",
-        "filters": {"Gap %": (2.0, 50.0)},
-        "logic": "Open > Previous High = Gap Up, wird oft gefüllt (Short-Chance)",
-        "stocks_only": True
-    },
-    "Gap Down": {
-        "description": "📉 NUR AKTIEN: Gap nach unten - Gaps werden oft gefüllt",
-        "filters": {"Gap %": (-50.0, -2.0)},
-        "logic": "Open < Previous Low = Gap Down, wird oft gefüllt (Long-Chance)",
-        "stocks_only": True
-    },
-    # WICK STRATEGIEN - BEIDE MÄRKTE
-    "Long Wick Up": {
-        "description": "Lange obere Wick = Verkaufsdruck, oft Reversal nach unten",
-        "filters": {"Upper Wick %": (30.0, 100.0), "Change %": (-10.0, 5.0)},
-        "logic": "Lange obere Wick zeigt Ablehnung höherer Preise = Short-Signal"
-    },
-    "Long Wick Down": {
-        "description": "Lange untere Wick = Kaufdruck, oft Reversal nach oben",
-        "filters": {"Lower Wick %": (30.0, 100.0), "Change %": (-5.0, 10.0)},
-        "logic": "Lange untere Wick zeigt Ablehnung tieferer Preise = Long-Signal"
-    },
-    # INSIDER STRATEGIEN - NUR AKTIEN
-    "Insider Buying": {
-        "description": "🔥 NUR AKTIEN: Insider (CEO, CFO, Directors) kaufen eigene Aktien",
-        "filters": {"Insider": "BUY"},
-        "logic": "Insider kaufen = Sie glauben an die Firma → Bullish Signal",
-        "stocks_only": True
-    },
-    "Insider Selling": {
-        "description": "⚠️ NUR AKTIEN: Insider verkaufen große Mengen",
-        "filters": {"Insider": "SELL"},
-        "logic": "Große Insider-Verkäufe können Warnsignal sein",
-        "stocks_only": True
-    },
-}
-
 # =============================================================================
 # 3. HELPER FUNCTIONS
 # =============================================================================
@@ -130,775 +60,85 @@ def apply_strategy(strategy_name):
     if strategy_name in STRATEGIES:
         st.session_state.active_filters = STRATEGIES[strategy_name]["filters"].copy()
         st.session_state.current_strategy = strategy_name
-        st.session_state.additional_filters = {
-            "preis_min": 0.0, "preis_max": 100000.0,
-            "nur_gewinner": False, "nur_verlierer": False,
-            "rvol_override_min": None, "rvol_override_max": None,
-        }
-
-def calculate_close_position(high, low, close):
-    if high == low or high is None or low is None:
-        return 0.5
-    return (close - low) / (high - low)
-
-def calculate_alpha_score(rvol, vortag_pct, change_pct):
-    return round((rvol * 12) + (abs(vortag_pct) * 10) + (abs(change_pct) * 8), 2)
+        st.session_state.additional_filters = DEFAULT_ADDITIONAL_FILTERS.copy()
 
 def add_to_watchlist(ticker, data):
-    """Fügt Ticker zur Watchlist hinzu"""
-    entry = {
-        "ticker": ticker,
-        "market": st.session_state.market_type,
-        "price": data.get("Preis", 0),
-        "added": datetime.now().strftime("%Y-%m-%d %H:%M"),
-        "data": data
-    }
-    existing = [w["ticker"] for w in st.session_state.watchlist]
-    if ticker not in existing:
-        st.session_state.watchlist.append(entry)
-        return True
-    return False
+    """Fügt Ticker zur Watchlist hinzu (persistent, alpha_core.watchlist)"""
+    added = watchlist.add_to_watchlist(ticker, st.session_state.market_type, data)
+    st.session_state.watchlist = watchlist.load_watchlist()
+    return added
 
-def remove_from_watchlist(ticker):
+def remove_from_watchlist(ticker, market_type=None, coin_id=None):
     """Entfernt Ticker von Watchlist"""
-    st.session_state.watchlist = [w for w in st.session_state.watchlist if w["ticker"] != ticker]
+    watchlist.remove_from_watchlist(ticker, market_type, coin_id)
+    st.session_state.watchlist = watchlist.load_watchlist()
 
-def fetch_historical_data_crypto(coin_id, days):
-    """Holt historische OHLC-Daten von CoinGecko"""
-    try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc"
-        params = {"vs_currency": "usd", "days": days}
-        resp = requests.get(url, params=params, timeout=15)
-        if resp.status_code == 200:
-            data = resp.json()
-            # Format: [[timestamp, open, high, low, close], ...]
-            if data and len(data) > 0:
-                return data
-    except:
-        pass
-    return None
+def set_scan_results(results, market, strategy, updated=None):
+    """Neue Trefferliste + Stand merken (ein älterer Live-Feed überschreibt sie nicht)"""
+    st.session_state.scan_results = results
+    st.session_state.feed_state = (market, strategy, updated or datetime.now().timestamp())
 
-def fetch_historical_data_stocks(ticker, days, poly_key):
-    """Holt historische Daten von Polygon"""
-    try:
-        from datetime import timedelta
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-        
-        url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date}/{end_date}"
-        params = {"apiKey": poly_key, "limit": days}
-        resp = requests.get(url, params=params, timeout=15)
-        if resp.status_code == 200:
-            data = resp.json()
-            results = data.get("results", [])
-            if results:
-                # Format anpassen: [[timestamp, open, high, low, close], ...]
-                return [[r["t"], r["o"], r["h"], r["l"], r["c"]] for r in results]
-    except:
-        pass
-    return None
-
-def calculate_sr_from_historical(ohlc_data, current_price):
-    """Berechnet S/R-Levels aus Fibonacci + Swing Highs/Lows + Konsolidierungszonen"""
-    if not ohlc_data or len(ohlc_data) < 5:
-        return calculate_sr_levels_simple(current_price), {}
-    
-    # Extrahiere OHLC Daten
-    highs = [candle[2] for candle in ohlc_data]  # Index 2 = High
-    lows = [candle[3] for candle in ohlc_data]   # Index 3 = Low
-    closes = [candle[4] for candle in ohlc_data] # Index 4 = Close
-    
-    # Periode High und Low (wichtig für Fibonacci)
-    period_high = max(highs)
-    period_low = min(lows)
-    price_range = period_high - period_low
-    
-    if price_range <= 0:
-        return calculate_sr_levels_simple(current_price), {}
-    
-    # =========================================================================
-    # KONSOLIDIERUNGSZONEN BERECHNEN
-    # Finde Preiszonen wo der Preis oft war (High Activity Zones)
-    # =========================================================================
-    
-    # Teile den Preisbereich in Zonen auf
-    num_zones = 20  # 20 Zonen über den Preisbereich
-    zone_size = price_range / num_zones
-    zone_counts = {}  # zone_start -> anzahl_tage
-    
-    for i, close in enumerate(closes):
-        # Welche Zone ist dieser Close?
-        zone_idx = int((close - period_low) / zone_size)
-        zone_idx = min(zone_idx, num_zones - 1)  # Clamp
-        zone_start = period_low + zone_idx * zone_size
-        zone_end = zone_start + zone_size
-        
-        zone_key = (round(zone_start, 6), round(zone_end, 6))
-        zone_counts[zone_key] = zone_counts.get(zone_key, 0) + 1
-    
-    # Sortiere nach Häufigkeit (meiste Tage zuerst)
-    sorted_zones = sorted(zone_counts.items(), key=lambda x: x[1], reverse=True)
-    
-    # Top Konsolidierungszonen (min 3 Tage in der Zone)
-    consolidation_zones = []
-    total_candles = len(closes)
-    
-    for (zone_start, zone_end), count in sorted_zones[:5]:  # Top 5
-        if count >= 3:  # Mindestens 3 Kerzen in dieser Zone
-            pct_time = round((count / total_candles) * 100, 1)
-            zone_mid = (zone_start + zone_end) / 2
-            consolidation_zones.append({
-                "low": zone_start,
-                "high": zone_end,
-                "mid": zone_mid,
-                "days": count,
-                "pct_time": pct_time
-            })
-    
-    # Merge überlappende Zonen
-    def merge_zones(zones):
-        if not zones:
-            return []
-        zones = sorted(zones, key=lambda x: x["low"])
-        merged = [zones[0]]
-        for zone in zones[1:]:
-            last = merged[-1]
-            if zone["low"] <= last["high"] * 1.02:  # 2% Überlappung erlaubt
-                # Merge
-                merged[-1] = {
-                    "low": last["low"],
-                    "high": max(last["high"], zone["high"]),
-                    "mid": (last["low"] + max(last["high"], zone["high"])) / 2,
-                    "days": last["days"] + zone["days"],
-                    "pct_time": last["pct_time"] + zone["pct_time"]
-                }
-            else:
-                merged.append(zone)
-        return merged
-    
-    consolidation_zones = merge_zones(consolidation_zones)[:3]  # Max 3 Zonen
-    
-    # =========================================================================
-    # FIBONACCI LEVELS berechnen
-    # =========================================================================
-    fib_levels = {
-        "0.0": period_low,
-        "23.6": period_low + price_range * 0.236,
-        "38.2": period_low + price_range * 0.382,
-        "50.0": period_low + price_range * 0.5,
-        "61.8": period_low + price_range * 0.618,
-        "78.6": period_low + price_range * 0.786,
-        "100.0": period_high,
-        "127.2": period_high + price_range * 0.272,
-        "161.8": period_high + price_range * 0.618,
-    }
-    
-    # =========================================================================
-    # SWING HIGHS/LOWS finden
-    # =========================================================================
-    swing_highs = []
-    window = min(3, len(highs) // 4)
-    for i in range(window, len(highs) - window):
-        is_swing = True
-        for j in range(1, window + 1):
-            if highs[i] <= highs[i-j] or highs[i] <= highs[i+j]:
-                is_swing = False
-                break
-        if is_swing:
-            swing_highs.append(highs[i])
-    
-    swing_lows = []
-    for i in range(window, len(lows) - window):
-        is_swing = True
-        for j in range(1, window + 1):
-            if lows[i] >= lows[i-j] or lows[i] >= lows[i+j]:
-                is_swing = False
-                break
-        if is_swing:
-            swing_lows.append(lows[i])
-    
-    swing_highs.append(period_high)
-    swing_lows.append(period_low)
-    swing_highs = sorted(set(swing_highs), reverse=True)
-    swing_lows = sorted(set(swing_lows))
-    
-    # =========================================================================
-    # SUPPORTS & RESISTANCES kombinieren
-    # =========================================================================
-    all_supports = []
-    all_resistances = []
-    
-    # Swing Lows
-    for sl in swing_lows:
-        if sl < current_price:
-            all_supports.append({"price": sl, "type": "Swing Low"})
-    
-    # Fibonacci unter Preis
-    for fib_name, fib_price in fib_levels.items():
-        if fib_price < current_price and float(fib_name) <= 100:
-            all_supports.append({"price": fib_price, "type": f"Fib {fib_name}%"})
-    
-    # Swing Highs
-    for sh in swing_highs:
-        if sh > current_price:
-            all_resistances.append({"price": sh, "type": "Swing High"})
-    
-    # Fibonacci über Preis
-    for fib_name, fib_price in fib_levels.items():
-        if fib_price > current_price:
-            all_resistances.append({"price": fib_price, "type": f"Fib {fib_name}%"})
-    
-    # Sortieren
-    all_supports = sorted(all_supports, key=lambda x: x["price"], reverse=True)
-    all_resistances = sorted(all_resistances, key=lambda x: x["price"])
-    
-    # Cluster-Bereinigung
-    def remove_clusters(levels, min_distance_pct=2.0):
-        if not levels:
-            return []
-        cleaned = [levels[0]]
-        for level in levels[1:]:
-            last_price = cleaned[-1]["price"]
-            distance_pct = abs(level["price"] - last_price) / last_price * 100
-            if distance_pct >= min_distance_pct:
-                cleaned.append(level)
-        return cleaned
-    
-    supports_cleaned = remove_clusters(all_supports)[:3]
-    resistances_cleaned = remove_clusters(all_resistances)[:3]
-    
-    supports = [s["price"] for s in supports_cleaned]
-    resistances = [r["price"] for r in resistances_cleaned]
-    
-    # Smart Rounding
-    def smart_round(price):
-        if price >= 1000:
-            return round(price, 0)
-        elif price >= 100:
-            return round(price, 1)
-        elif price >= 10:
-            return round(price, 2)
-        elif price >= 1:
-            return round(price, 3)
-        else:
-            return round(price, 6)
-    
-    supports = [smart_round(s) for s in supports]
-    resistances = [smart_round(r) for r in resistances]
-    
-    # Runde Konsolidierungszonen
-    for zone in consolidation_zones:
-        zone["low"] = smart_round(zone["low"])
-        zone["high"] = smart_round(zone["high"])
-        zone["mid"] = smart_round(zone["mid"])
-    
-    # =========================================================================
-    # FIB INFO für AI-Analyse
-    # =========================================================================
-    fib_info = {
-        "period_high": smart_round(period_high),
-        "period_low": smart_round(period_low),
-        "fib_236": smart_round(fib_levels["23.6"]),
-        "fib_382": smart_round(fib_levels["38.2"]),
-        "fib_500": smart_round(fib_levels["50.0"]),
-        "fib_618": smart_round(fib_levels["61.8"]),
-        "fib_786": smart_round(fib_levels["78.6"]),
-        "fib_1272": smart_round(fib_levels["127.2"]),
-        "fib_1618": smart_round(fib_levels["161.8"]),
-        "supports_detail": supports_cleaned,
-        "resistances_detail": resistances_cleaned,
-        "consolidation_zones": consolidation_zones,  # NEU!
-        "total_candles": total_candles,
-    }
-    
-    return (supports, resistances), fib_info
+def carry_over_enrichment(results):
+    """S/R-Abstände und AI-Screening der bisherigen Liste auf neue Zeilen übertragen (CoinID/Ticker)
 
-
-def calculate_sr_levels_simple(price):
-    """Fallback: Berechnet S/R basierend auf Fibonacci vom Preis"""
-    if price <= 0:
-        return ([], []), {}
-    
-    # Schätze eine Range basierend auf typischer Volatilität (±20%)
-    estimated_high = price * 1.20
-    estimated_low = price * 0.80
-    price_range = estimated_high - estimated_low
-    
-    # Fibonacci Levels
-    supports = [
-        round(price * 0.95, 6),   # -5%
-        round(price * 0.90, 6),   # -10%
-        round(price * 0.85, 6),   # -15%
-    ]
-    
-    resistances = [
-        round(price * 1.05, 6),   # +5%
-        round(price * 1.10, 6),   # +10%
-        round(price * 1.15, 6),   # +15%
-    ]
-    
-    return (supports, resistances), {}
-
-
-def calculate_sr_levels(price, ticker=None, market_type="Krypto", timeframe="4H", poly_key=None):
-    """Hauptfunktion: Berechnet S/R-Levels basierend auf Timeframe"""
-    
-    # Timeframe zu Tagen mappen
-    tf_to_days = {
-        "1H": 1,
-        "4H": 7,
-        "1D": 30,
-        "1W": 90,
-        "1M": 180
-    }
-    days = tf_to_days.get(timeframe, 7)
-    
-    # Versuche historische Daten zu holen
-    ohlc_data = None
-    
-    if market_type == "Krypto" and ticker:
-        coin_id = ticker.lower()
-        ohlc_data = fetch_historical_data_crypto(coin_id, days)
-    
-    elif market_type == "Aktien" and ticker and poly_key:
-        ohlc_data = fetch_historical_data_stocks(ticker, days, poly_key)
-    
-    # Berechne S/R aus historischen Daten oder Fallback
-    if ohlc_data:
-        return calculate_sr_from_historical(ohlc_data, price)
-    else:
-        return calculate_sr_levels_simple(price)
+    Abstände werden mit dem neuen Preis aus den gemerkten Levels neu gerechnet.
+    """
+    levels = st.session_state.get("sr_batch", {})
+    if levels:
+        enriched = []
+        for row in results:
+            key = screen_key(row)
+            if key in levels:
+                support_dist, resistance_dist = sr_distances(row.get("Preis", 0), *levels[key])
+                row = {**row, "S-Dist%": support_dist, "R-Dist%": resistance_dist}
+            enriched.append(row)
+        results = enriched
+    if st.session_state.get("screening"):
+        results = merge_screening(results, st.session_state.screening)
+    return results
 
 # =============================================================================
 # 4. DATA FETCHING FUNCTIONS
 # =============================================================================
 
-def fetch_insider_transactions(finnhub_key, transaction_type="BUY"):
-    """Holt Insider-Transaktionen von Finnhub"""
-    results = []
+def fetch_insider_transactions(finnhub_key, transaction_type="BUY", on_progress=None):
+    """Holt Insider-Transaktionen von Finnhub (parallel, im 60/min-Limit)
     
+    on_progress(done, total, teil_ergebnisse) wird nach jedem Ticker aufgerufen.
+    """
     try:
-        from datetime import timedelta
-        
-        # Letzte 30 Tage
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        
-        # Finnhub Insider Transactions API
-        url = f"https://finnhub.io/api/v1/stock/insider-transactions"
-        params = {
-            "symbol": "",  # Leer = alle
-            "from": start_date,
-            "to": end_date,
-            "token": finnhub_key
-        }
-        
-        # Wir holen die Top-Aktien mit Insider-Aktivität
-        # Da Finnhub kein "alle" unterstützt, holen wir beliebte Ticker
-        popular_tickers = [
-            "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "AMD", "INTC",
-            "JPM", "BAC", "WFC", "GS", "MS", "V", "MA", "PYPL",
-            "JNJ", "PFE", "UNH", "MRK", "ABBV", "LLY", "BMY",
-            "XOM", "CVX", "COP", "SLB", "OXY",
-            "DIS", "NFLX", "CMCSA", "T", "VZ",
-            "WMT", "COST", "TGT", "HD", "LOW",
-            "BA", "CAT", "GE", "MMM", "HON",
-            "KO", "PEP", "MCD", "SBUX", "NKE",
-            "CRM", "ORCL", "IBM", "CSCO", "ADBE", "NOW", "SNOW", "PLTR",
-            "SQ", "SHOP", "COIN", "HOOD", "SOFI",
-            "RIVN", "LCID", "NIO", "F", "GM",
-            "MRNA", "BNTX", "REGN", "VRTX", "BIIB"
-        ]
-        
-        insider_data = {}  # ticker -> list of transactions
-        
-        # Batch-Abfrage (max 60/min bei Finnhub)
-        for ticker in popular_tickers[:50]:  # Limitieren auf 50 für Speed
-            try:
-                url = f"https://finnhub.io/api/v1/stock/insider-transactions"
-                params = {"symbol": ticker, "token": finnhub_key}
-                resp = requests.get(url, params=params, timeout=5)
-                
-                if resp.status_code == 200:
-                    data = resp.json()
-                    transactions = data.get("data", [])
-                    
-                    if transactions:
-                        insider_data[ticker] = transactions
-                        
-            except:
-                continue
-        
-        # Filtern nach BUY oder SELL
-        for ticker, transactions in insider_data.items():
-            buy_value = 0
-            sell_value = 0
-            buy_count = 0
-            sell_count = 0
-            recent_transactions = []
-            
-            for t in transactions[:20]:  # Letzte 20 Transaktionen
-                trans_type = t.get("transactionType", "")
-                shares = abs(t.get("share", 0) or 0)
-                price = t.get("transactionPrice", 0) or 0
-                value = shares * price
-                name = t.get("name", "Unknown")
-                date = t.get("transactionDate", "")
-                
-                # P-Purchase, S-Sale, A-Grant/Award
-                if "P" in trans_type or "Buy" in trans_type.lower():
-                    buy_value += value
-                    buy_count += 1
-                    recent_transactions.append({
-                        "type": "BUY",
-                        "name": name,
-                        "shares": shares,
-                        "value": value,
-                        "date": date
-                    })
-                elif "S" in trans_type or "Sale" in trans_type.lower():
-                    sell_value += value
-                    sell_count += 1
-                    recent_transactions.append({
-                        "type": "SELL",
-                        "name": name,
-                        "shares": shares,
-                        "value": value,
-                        "date": date
-                    })
-            
-            # Filter nach gewünschtem Typ
-            if transaction_type == "BUY" and buy_count > 0 and buy_value > 10000:
-                results.append({
-                    "Ticker": ticker,
-                    "Name": "",
-                    "InsiderType": "BUY",
-                    "BuyCount": buy_count,
-                    "BuyValue": buy_value,
-                    "SellCount": sell_count,
-                    "SellValue": sell_value,
-                    "NetValue": buy_value - sell_value,
-                    "Transactions": recent_transactions[:5],
-                    "Alpha": int(buy_value / 10000)  # Alpha basiert auf Kaufvolumen
-                })
-            elif transaction_type == "SELL" and sell_count > 0 and sell_value > 50000:
-                results.append({
-                    "Ticker": ticker,
-                    "Name": "",
-                    "InsiderType": "SELL",
-                    "BuyCount": buy_count,
-                    "BuyValue": buy_value,
-                    "SellCount": sell_count,
-                    "SellValue": sell_value,
-                    "NetValue": buy_value - sell_value,
-                    "Transactions": recent_transactions[:5],
-                    "Alpha": int(sell_value / 10000)
-                })
-        
-        # Sortieren nach Value
-        if transaction_type == "BUY":
-            results = sorted(results, key=lambda x: x["BuyValue"], reverse=True)
-        else:
-            results = sorted(results, key=lambda x: x["SellValue"], reverse=True)
-        
-        return results[:30], 0, 0
-        
+        return fetch_insider_signals(finnhub_key, transaction_type, on_progress), 0, 0
     except Exception as e:
         st.error(f"Finnhub Fehler: {e}")
         return [], 0, 0
 
 
 def fetch_crypto_data():
-    """Holt Krypto-Daten von CoinGecko mit korrektem Vortag"""
-    results = []
-    skipped_filter = 0
-    
+    """Krypto-Scan der aktiven Filter (alpha_core.scan)"""
     try:
-        url = "https://api.coingecko.com/api/v3/coins/markets"
-        params = {
-            "vs_currency": "usd", 
-            "order": "market_cap_desc",
-            "per_page": 250, 
-            "page": 1, 
-            "sparkline": False,
-            # Hole 24h UND 7d change - daraus können wir Vortag approximieren
-            "price_change_percentage": "24h,7d"
-        }
-        
-        resp = requests.get(url, params=params, timeout=30)
-        if resp.status_code == 429:
-            st.warning("⚠️ CoinGecko Rate Limit. Warte 60 Sekunden.")
-            return [], 0, 0
-        
-        coins = resp.json()
-        if not isinstance(coins, list):
-            return [], 0, 0
-        
-        f = st.session_state.active_filters
-        af = st.session_state.additional_filters
-        
-        for coin in coins:
-            try:
-                price = coin.get("current_price") or 0
-                if price <= 0:
-                    continue
-                
-                # HEUTE: 24h Change
-                change_24h = coin.get("price_change_percentage_24h") or 0
-                
-                # VORTAG BERECHNUNG:
-                # 7d change enthält die letzten 7 Tage inkl. heute
-                # Vortag ≈ (7d_change - 24h_change) / 6 * Tage
-                # Besser: Wir schätzen den Vortag aus der Differenz
-                change_7d = coin.get("price_change_percentage_7d_in_currency") or 0
-                
-                # Approximation: Vortag = (Preis vor 48h -> Preis vor 24h)
-                # Wenn wir 24h und 7d haben:
-                # price_48h_ago = price / (1 + change_24h/100) / (1 + vortag/100)
-                # Vereinfachte Schätzung: 
-                if change_7d != 0 and change_24h != 0:
-                    # Durchschnittliche tägliche Änderung der letzten 7 Tage (ohne heute)
-                    avg_daily_7d = change_7d / 7
-                    # Vortag ≈ avg * 1.5 (gewichtet auf recent)
-                    vortag_chg = round(avg_daily_7d * 1.5, 2)
-                    # Korrektur: Wenn heute stark anders als Durchschnitt, anpassen
-                    if abs(change_24h) > abs(avg_daily_7d) * 3:
-                        # Heute ist ein Ausreißer - Vortag war wahrscheinlich ruhiger
-                        vortag_chg = round(avg_daily_7d, 2)
-                else:
-                    # Fallback: Keine 7d Daten, nutze 24h als grobe Schätzung
-                    # ABER: Setze auf 0 wenn wir wirklich keine Info haben
-                    vortag_chg = 0
-                
-                high_24h = coin.get("high_24h") or price
-                low_24h = coin.get("low_24h") or price
-                vol_24h = coin.get("total_volume") or 0
-                market_cap = coin.get("market_cap") or 1
-                
-                # OHLC für Wick-Berechnung
-                # Approximation: Open = Price / (1 + change/100)
-                open_price = price / (1 + change_24h / 100) if change_24h != -100 else price
-                
-                # Wick-Berechnungen (KORREKT für Krypto)
-                candle_range = high_24h - low_24h if high_24h > low_24h else 0.0001
-                body_top = max(open_price, price)
-                body_bottom = min(open_price, price)
-                
-                # Upper Wick %: (High - Body Top) / Candle Range * 100
-                upper_wick_pct = ((high_24h - body_top) / candle_range) * 100 if candle_range > 0 else 0
-                
-                # Lower Wick %: (Body Bottom - Low) / Candle Range * 100
-                lower_wick_pct = ((body_bottom - low_24h) / candle_range) * 100 if candle_range > 0 else 0
-                
-                # GAP % - KRYPTO HAT KEINE ECHTEN GAPS (24/7 Markt)
-                # Wir setzen es auf None damit der Filter weiß dass es nicht anwendbar ist
-                gap_pct = None  # Explizit None für "nicht verfügbar"
-                
-                # RVOL Berechnung (Krypto-spezifisch)
-                if market_cap > 0:
-                    vol_ratio = (vol_24h / market_cap) * 100
-                    rvol = round(vol_ratio * 5, 2)
-                    rvol = max(0.1, min(rvol, 100))
-                else:
-                    rvol = 1.0
-                
-                close_pos = calculate_close_position(high_24h, low_24h, price)
-                
-                # =====================================================
-                # FILTER-LOGIK (KRYPTO-SPEZIFISCH)
-                # =====================================================
-                match = True
-                
-                # RVOL Filter
-                if "RVOL" in f:
-                    rvol_min, rvol_max = f["RVOL"]
-                    if af.get("rvol_override_min"): rvol_min = af["rvol_override_min"]
-                    if af.get("rvol_override_max"): rvol_max = af["rvol_override_max"]
-                    if not (rvol_min <= rvol <= rvol_max): match = False
-                
-                # Change % (heute)
-                if "Change %" in f and not (f["Change %"][0] <= change_24h <= f["Change %"][1]): 
-                    match = False
-                
-                # Vortag % (approximiert aus 7d-Daten)
-                if "Vortag %" in f and not (f["Vortag %"][0] <= vortag_chg <= f["Vortag %"][1]): 
-                    match = False
-                
-                # Preis
-                if "Preis" in f and not (f["Preis"][0] <= price <= f["Preis"][1]): 
-                    match = False
-                
-                # Close Position
-                if "Close Position" in f and not (f["Close Position"][0] <= close_pos <= f["Close Position"][1]): 
-                    match = False
-                
-                # Wick Filter (funktioniert bei Krypto)
-                if "Upper Wick %" in f and not (f["Upper Wick %"][0] <= upper_wick_pct <= f["Upper Wick %"][1]): 
-                    match = False
-                if "Lower Wick %" in f and not (f["Lower Wick %"][0] <= lower_wick_pct <= f["Lower Wick %"][1]): 
-                    match = False
-                
-                # GAP Filter - NICHT ANWENDBAR BEI KRYPTO!
-                # Wenn jemand Gap-Strategie bei Krypto wählt, findet er nichts
-                if "Gap %" in f:
-                    # Krypto hat keine Gaps - dieser Filter matched nie
-                    match = False
-                
-                # Zusatzfilter
-                if af.get("preis_min", 0) > 0 and price < af["preis_min"]: match = False
-                if af.get("preis_max", 100000) < 100000 and price > af["preis_max"]: match = False
-                if af.get("nur_gewinner") and change_24h <= 0: match = False
-                if af.get("nur_verlierer") and change_24h >= 0: match = False
-                
-                if not match:
-                    skipped_filter += 1
-                    continue
-                
-                ticker = coin.get("symbol", "").upper()
-                alpha = calculate_alpha_score(rvol, vortag_chg, change_24h)
-                
-                results.append({
-                    "Ticker": ticker, 
-                    "Name": coin.get("name", "")[:15],
-                    "Preis": round(price, 6), 
-                    "Chg%": round(change_24h, 2),
-                    "RVOL": rvol, 
-                    "Vortag%": round(vortag_chg, 2),
-                    "ClosePos": round(close_pos, 2), 
-                    "Alpha": alpha,
-                    "UpperWick%": round(upper_wick_pct, 1),
-                    "LowerWick%": round(lower_wick_pct, 1),
-                    "Gap%": 0,  # Immer 0 bei Krypto (keine echten Gaps)
-                })
-            except:
-                continue
-        
-        return results, 0, skipped_filter
+        failed_pages = []
+        found = scan_market("Krypto", st.session_state.active_filters, st.session_state.additional_filters,
+                            max_coins=st.session_state.get("crypto_universe", CRYPTO_UNIVERSE), failed_pages=failed_pages)
+        if failed_pages:
+            st.warning(f"⚠️ {partial_warning(failed_pages)}")
+        return found
+    except RateLimited:
+        st.warning("⚠️ CoinGecko Rate Limit - auch nach mehreren Versuchen. Bitte gleich erneut scannen.")
+        return [], 0, 0
     except Exception as e:
         st.error(f"CoinGecko Fehler: {e}")
         return [], 0, 0
 
 
 def fetch_stock_data(poly_key):
-    results = []
-    skipped_no_price = 0
-    skipped_filter = 0
-    
+    """Aktien-Scan der aktiven Filter - Folge-Scans rechnen nur geänderte Ticker neu (alpha_core.delta)"""
     try:
-        url = f"https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers?apiKey={poly_key}"
-        resp = requests.get(url, timeout=30).json()
-        tickers = resp.get("tickers", [])
-        
-        if len(tickers) == 0:
-            return [], 0, 0
-        
-        f = st.session_state.active_filters
-        af = st.session_state.additional_filters
-        
-        for t in tickers:
-            try:
-                day = t.get("day", {}) or {}
-                prev = t.get("prevDay", {}) or {}
-                last = t.get("lastTrade", {}) or {}
-                minute_data = t.get("min", {}) or {}
-                
-                price = day.get("c") or last.get("p") or minute_data.get("c") or prev.get("c") or 0
-                if price <= 0:
-                    skipped_no_price += 1
-                    continue
-                
-                # OHLC Daten
-                open_price = day.get("o") or price
-                high = day.get("h") or price
-                low = day.get("l") or price
-                close = day.get("c") or price
-                
-                # Previous Day Daten für Gap-Berechnung
-                prev_high = prev.get("h") or 0
-                prev_low = prev.get("l") or 0
-                prev_close = prev.get("c") or 0
-                
-                # GAP-Berechnung
-                # Gap Up: Open > Previous High
-                # Gap Down: Open < Previous Low
-                gap_pct = 0
-                if prev_high > 0 and prev_low > 0:
-                    if open_price > prev_high:
-                        # Gap Up: Wie viel % über dem Previous High
-                        gap_pct = ((open_price - prev_high) / prev_high) * 100
-                    elif open_price < prev_low:
-                        # Gap Down: Wie viel % unter dem Previous Low (negativ)
-                        gap_pct = ((open_price - prev_low) / prev_low) * 100
-                
-                # WICK-Berechnungen
-                candle_range = high - low if high > low else 0.0001
-                body_top = max(open_price, close)
-                body_bottom = min(open_price, close)
-                
-                # Upper Wick %: (High - Body Top) / Candle Range * 100
-                upper_wick_pct = ((high - body_top) / candle_range) * 100 if candle_range > 0 else 0
-                
-                # Lower Wick %: (Body Bottom - Low) / Candle Range * 100
-                lower_wick_pct = ((body_bottom - low) / candle_range) * 100 if candle_range > 0 else 0
-                
-                change = t.get("todaysChangePerc")
-                if change is None:
-                    change = ((price - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-                change = change or 0
-                
-                vol = day.get("v") or minute_data.get("v") or 0
-                prev_vol = prev.get("v") or 0
-                rvol = round(vol / prev_vol, 2) if prev_vol > 0 and vol > 0 else 1.0
-                rvol = min(rvol, 999.0)
-                
-                prev_open = prev.get("o") or 0
-                vortag_chg = round(((prev_close - prev_open) / prev_open) * 100, 2) if prev_open > 0 else 0
-                
-                close_pos = calculate_close_position(high, low, close)
-                
-                # FILTER-LOGIK
-                match = True
-                if "RVOL" in f:
-                    rvol_min, rvol_max = f["RVOL"]
-                    if af.get("rvol_override_min"): rvol_min = af["rvol_override_min"]
-                    if af.get("rvol_override_max"): rvol_max = af["rvol_override_max"]
-                    if not (rvol_min <= rvol <= rvol_max): match = False
-                
-                if "Change %" in f and not (f["Change %"][0] <= change <= f["Change %"][1]): match = False
-                if "Vortag %" in f and not (f["Vortag %"][0] <= vortag_chg <= f["Vortag %"][1]): match = False
-                if "Preis" in f and not (f["Preis"][0] <= price <= f["Preis"][1]): match = False
-                if "Close Position" in f and not (f["Close Position"][0] <= close_pos <= f["Close Position"][1]): match = False
-                
-                # Neue Filter: Gap & Wicks
-                if "Gap %" in f and not (f["Gap %"][0] <= gap_pct <= f["Gap %"][1]): match = False
-                if "Upper Wick %" in f and not (f["Upper Wick %"][0] <= upper_wick_pct <= f["Upper Wick %"][1]): match = False
-                if "Lower Wick %" in f and not (f["Lower Wick %"][0] <= lower_wick_pct <= f["Lower Wick %"][1]): match = False
-                
-                if af.get("preis_min", 0) > 0 and price < af["preis_min"]: match = False
-                if af.get("preis_max", 100000) < 100000 and price > af["preis_max"]: match = False
-                if af.get("nur_gewinner") and change <= 0: match = False
-                if af.get("nur_verlierer") and change >= 0: match = False
-                
-                if not match:
-                    skipped_filter += 1
-                    continue
-                
-                ticker_raw = t.get("ticker", "")
-                alpha = calculate_alpha_score(rvol, vortag_chg, change)
-                
-                results.append({
-                    "Ticker": ticker_raw, "Name": "",
-                    "Preis": round(price, 4), "Chg%": round(change, 2),
-                    "RVOL": rvol, "Vortag%": vortag_chg,
-                    "ClosePos": round(close_pos, 2), "Alpha": alpha,
-                    "Gap%": round(gap_pct, 2),
-                    "UpperWick%": round(upper_wick_pct, 1),
-                    "LowerWick%": round(lower_wick_pct, 1),
-                })
-            except:
-                continue
-        
-        return results, skipped_no_price, skipped_filter
+        use_stream = st.session_state.get("stream_enabled") and stream_active()
+        results, snp, sf, st.session_state.delta_state, st.session_state.scan_diff = scan_stocks_incremental(
+            st.session_state.get("delta_state"), st.session_state.active_filters, st.session_state.additional_filters,
+            poly_key=poly_key, tickers=live_snapshot() if use_stream else None
+        )
+        return results, snp, sf
     except Exception as e:
         st.error(f"Polygon Fehler: {e}")
         return [], 0, 0
@@ -908,6 +148,12 @@ def fetch_stock_data(poly_key):
 # =============================================================================
 st.set_page_config(page_title="Alpha V52 Pro", layout="wide")
 
+# HINTERGRUND-SCANNER (einmal pro Server-Prozess, weitere Aufrufe nur Konfiguration)
+try:
+    start_scheduler(poly_key=st.secrets.get("POLYGON_KEY"), finnhub_key=st.secrets.get("FINNHUB_KEY"))
+except Exception:
+    start_scheduler()
+
 # AUTO-REFRESH (wenn aktiviert)
 if st.session_state.auto_refresh_enabled:
     refresh_interval = st.session_state.get("refresh_interval", 5) * 60 * 1000  # in ms
@@ -927,10 +173,14 @@ with st.sidebar:
     st.session_state.market_type = m_type
     
     if m_type == "Krypto":
-        st.caption("📡 CoinGecko (Top 250)")
+        st.select_slider("📡 CoinGecko Universum (Top N)", CRYPTO_UNIVERSE_OPTIONS,
+                         value=CRYPTO_UNIVERSE, key="crypto_universe")
     else:
         st.caption("📡 Polygon.io")
     
+    cs = cache_stats()
+    st.caption(f"🗄️ API-Cache: {cs['hits']} Hits / {cs['misses']} Misses ({cs['size']} Einträge)")
+    
     st.divider()
     
     # AUTO-REFRESH CONTROLS
@@ -1016,6 +266,11 @@ with st.sidebar:
                 "nur_gewinner": nur_gewinner, "nur_verlierer": nur_verlierer,
                 "rvol_override_min": None, "rvol_override_max": None,
             }
+        
+        # Krypto standardmäßig aus: die OHLC-Abrufe teilen sich das CoinGecko-Limit (30/min)
+        st.checkbox("📐 S/R für alle Treffer berechnen", value=m_type == "Aktien", key=f"batch_sr_{m_type}",
+                    help="Abstand zum nächsten Support/Resistance für jeden Treffer (parallel, gecacht). "
+                         f"Krypto: höchstens {CRYPTO_BATCH_FETCH} Abrufe, der Rest aus dem lokalen Verlauf")
     
     st.divider()
     
@@ -1037,9 +292,21 @@ with st.sidebar:
                     finnhub_key = st.secrets["FINNHUB_KEY"]
                     trans_type = "BUY" if current_strat == "Insider Buying" else "SELL"
                     status.update(label=f"Hole {trans_type} Transaktionen von Finnhub...")
-                    results, snp, sf = fetch_insider_transactions(finnhub_key, trans_type)
-                    st.session_state.scan_results = results
+                    live_table = st.empty()
+                    
+                    def show_insider_progress(done, total, partial):
+                        status.update(label=f"Hole {trans_type} Transaktionen von Finnhub... {done}/{total}")
+                        if partial:
+                            live_table.dataframe(
+                                pd.DataFrame(partial)[["Ticker", "BuyCount", "BuyValue", "SellCount", "SellValue"]],
+                                hide_index=True, use_container_width=True
+                            )
+                    
+                    results, snp, sf = fetch_insider_transactions(finnhub_key, trans_type, on_progress=show_insider_progress)
+                    live_table.empty()
+                    set_scan_results(results, "Aktien", current_strat)
                     st.session_state.market_type = "Aktien"  # Insider nur für Aktien
+                    st.session_state.screening, st.session_state.sr_batch = {}, {}
                     status.update(label=f"✅ {len(results)} Insider-Signale gefunden", state="complete")
                 except KeyError:
                     st.error("❌ FINNHUB_KEY fehlt in Secrets! Füge ihn hinzu unter Settings → Secrets")
@@ -1059,10 +326,100 @@ with st.sidebar:
                 else:
                     poly_key = st.secrets["POLYGON_KEY"]
                     results, snp, sf = fetch_stock_data(poly_key)
-                
-                st.session_state.scan_results = sorted(results, key=lambda x: x["Alpha"], reverse=True)[:50]
+                    diff = st.session_state.get("scan_diff")
+                    if diff:
+                        st.caption(
+                            f"🆕 {len(diff['entered'])} neu | ❌ {len(diff['exited'])} raus | "
+                            f"↕️ {len(diff['moved'])} bewegt ({diff['changed']}/{diff['total']} neu berechnet)"
+                        )
+                
+                top = top_results(results)
+                st.session_state.screening, st.session_state.sr_batch = {}, {}
+                
+                # S/R für alle Treffer in einem Rutsch - Einzelansicht nutzt danach das Memo
+                if top and st.session_state.get(f"batch_sr_{m_type}", m_type == "Aktien"):
+                    status.update(label=f"Berechne S/R für {len(top)} Treffer...")
+                    levels = batch_sr_levels(
+                        top, market_type=m_type,
+                        timeframe=st.session_state.get("tf_selector", "4H"),
+                        poly_key=poly_key if m_type == "Aktien" else None
+                    )
+                    top = with_sr_distances(top, levels)
+                    # Levels merken: Live-Feed-Updates rechnen die Abstände damit neu
+                    st.session_state.sr_batch = {screen_key(row): lv for row, (lv, _) in zip(top, levels)}
+                
+                # Manueller Scan ist aktueller als der Live-Feed-Stand
+                set_scan_results(top, m_type, current_strat)
                 status.update(label=f"✅ {len(st.session_state.scan_results)} Signale", state="complete")
 
+    # ALLE STRATEGIEN: ein Abruf, ein Kennzahlen-Durchlauf, Matrix Ticker x Strategie
+    if st.button("🧮 Alle Strategien scannen", use_container_width=True):
+        with st.status(f"Scanne {m_type} mit allen Strategien...") as status:
+            try:
+                failed_pages = []
+                per_strategy, matrix = scan_all_strategies(
+                    m_type, poly_key=st.secrets["POLYGON_KEY"] if m_type == "Aktien" else None,
+                    additional_filters=st.session_state.additional_filters or DEFAULT_ADDITIONAL_FILTERS,
+                    max_coins=st.session_state.get("crypto_universe", CRYPTO_UNIVERSE), failed_pages=failed_pages
+                )
+                if failed_pages:
+                    st.warning(f"⚠️ {partial_warning(failed_pages)}")
+                st.session_state.multi_scan = {
+                    "market": m_type,
+                    "per_strategy": {name: top_results(res[0]) for name, res in per_strategy.items()},
+                    "matrix": matrix.sort_values("Treffer", ascending=False),
+                }
+                hits = {name: len(res[0]) for name, res in per_strategy.items()}
+                status.update(label=f"✅ {len(matrix)} Ticker in {sum(1 for h in hits.values() if h)} Strategien", state="complete")
+            except RateLimited:
+                st.warning("⚠️ CoinGecko Rate Limit - auch nach mehreren Versuchen. Bitte gleich erneut scannen.")
+            except Exception as e:
+                st.error(f"Fehler: {e}")
+    
+    # LIVE-FEED: Ergebnisse des Hintergrund-Scanners übernehmen - kein eigener API-Abruf pro Session
+    live_feed = st.checkbox("📡 Live-Feed (Hintergrund-Scan)", value=False, key="live_feed",
+                            help="Übernimmt neuere Ergebnisse des geteilten Hintergrund-Scanners, solange die Filter "
+                                 "der Strategie unverändert sind (S/R-Abstände und AI-Screening bleiben erhalten)")
+    feed_strat = st.session_state.current_strategy
+    if live_feed and feed_strat in STRATEGIES:
+        uses_defaults = (
+            st.session_state.active_filters == STRATEGIES[feed_strat]["filters"]
+            and st.session_state.additional_filters == DEFAULT_ADDITIONAL_FILTERS
+            # Hintergrund-Scanner deckt das Standard-Universum ab
+            and (m_type != "Krypto" or st.session_state.get("crypto_universe", CRYPTO_UNIVERSE) == CRYPTO_UNIVERSE)
+        )
+        published = get_published(m_type, feed_strat) if uses_defaults else None
+        if published and published["updated"]:
+            last_feed = st.session_state.get("feed_state", (None, None, 0))
+            if (m_type, feed_strat) != last_feed[:2] or published["updated"] > last_feed[2]:
+                if (m_type, feed_strat) != last_feed[:2]:
+                    st.session_state.screening, st.session_state.sr_batch = {}, {}
+                set_scan_results(carry_over_enrichment(published["results"]), m_type, feed_strat, published["updated"])
+            st.caption(f"📡 Live-Feed: Stand {datetime.fromtimestamp(published['updated']).strftime('%H:%M:%S')}")
+        elif not uses_defaults:
+            st.caption("📡 Live-Feed pausiert (Filter angepasst) - manuell scannen")
+        if published and published["error"]:
+            st.caption(f"⚠️ Hintergrund-Scan: {published['error']}")
+        elif published and published.get("warning"):
+            st.caption(f"⚠️ Hintergrund-Scan: {published['warning']}")
+
+    # ECHTZEIT-STREAM: Polygon-WebSocket (Sekunden-Aggregate) statt Snapshot-Polling
+    if m_type == "Aktien":
+        if st.checkbox("⚡ Echtzeit-Stream (WebSocket)", key="stream_enabled",
+                       help="Hält Tages-OHLCV, Vortag und RVOL live im Speicher - Scans ohne API-Abruf. "
+                            "Der Stream läuft einmal pro Server-Prozess weiter, auch für den Hintergrund-Scan"):
+            try:
+                start_stream(st.secrets["POLYGON_KEY"])
+            except ImportError:
+                st.warning("Paket 'websockets' fehlt: pip install websockets")
+            except KeyError:
+                st.error("❌ POLYGON_KEY fehlt in Secrets!")
+            info = stream_status()
+            if info["connected"]:
+                st.caption(f"⚡ Stream: {info['tickers']} Ticker, {info['events']} Updates")
+            elif info["error"]:
+                st.caption(f"⚠️ Stream: {info['error']}")
+
 # -----------------------------------------------------------------------------
 # HAUPTBEREICH - TABS
 # -----------------------------------------------------------------------------
@@ -1079,6 +436,37 @@ with tab_scanner:
         if st.session_state.current_strategy:
             st.caption(f"{st.session_state.current_strategy} | {st.session_state.market_type}")
         
+        # Multi-Strategie-Scan: Matrix + Strategie-Liste in die Ergebnisse übernehmen
+        multi = st.session_state.get("multi_scan")
+        if multi and multi["market"] == st.session_state.market_type:
+            with st.expander(f"🧮 Strategie-Matrix ({len(multi['matrix'])} Ticker)"):
+                st.dataframe(multi["matrix"].head(100), hide_index=True, use_container_width=True)
+                counts = {name: len(res) for name, res in multi["per_strategy"].items()}
+                pick = st.selectbox("Liste übernehmen", list(counts), format_func=lambda n: f"{n} ({counts[n]})", key="multi_pick")
+                if st.button("📋 In Ergebnisse übernehmen", use_container_width=True):
+                    apply_strategy(pick)
+                    st.session_state.screening, st.session_state.sr_batch = {}, {}
+                    set_scan_results(multi["per_strategy"][pick], multi["market"], pick)
+                    st.rerun()
+        
+        # Bulk-Screening: ganze Trefferliste in wenigen Claude-Requests bewerten
+        if st.session_state.scan_results and not is_insider:
+            if st.button(f"🤖 AI-Screening ({len(st.session_state.scan_results)} Treffer)", use_container_width=True):
+                with st.status("Claude bewertet die Trefferliste...") as status:
+                    try:
+                        client = anthropic.Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
+                        screening = screen_results(
+                            client, st.session_state.scan_results, st.session_state.market_type,
+                            st.session_state.current_strategy,
+                            on_progress=lambda done, total: status.update(label=f"Claude bewertet die Trefferliste... {done}/{total}")
+                        )
+                        st.session_state.screening = {**st.session_state.get("screening", {}), **screening}
+                        set_scan_results(merge_screening(st.session_state.scan_results, screening),
+                                         st.session_state.market_type, st.session_state.current_strategy)
+                        status.update(label=f"✅ {len(screening)} Ticker bewertet", state="complete")
+                    except Exception as e:
+                        st.error(f"Fehler: {e}")
+        
         if st.session_state.scan_results:
             df = pd.DataFrame(st.session_state.scan_results)
             
@@ -1108,12 +496,29 @@ with tab_scanner:
                     "Alpha": st.column_config.NumberColumn("Alpha", format="%.0f⭐"),
                 }
             
+            # S/R-Abstände (Batch) anzeigen + filtern
+            if "S-Dist%" in df.columns:
+                display_cols += ["S-Dist%", "R-Dist%"]
+                col_config["S-Dist%"] = st.column_config.NumberColumn("↓ S", format="%.1f%%", help="Abstand zum nächsten Support")
+                col_config["R-Dist%"] = st.column_config.NumberColumn("↑ R", format="%.1f%%", help="Abstand zur nächsten Resistance")
+                max_s_dist = st.number_input("Max. Abstand zum Support (%)", 0.0, 100.0, 100.0, step=0.5, key="max_s_dist")
+                if max_s_dist < 100.0:
+                    df = df[df["S-Dist%"].notna() & (df["S-Dist%"] <= max_s_dist)].reset_index(drop=True)
+            
+            # AI-Screening (falls gelaufen)
+            if "AI-Score" in df.columns:
+                display_cols = display_cols[:1] + ["AI-Score", "AI-Verdict"] + display_cols[1:]
+                col_config["AI-Score"] = st.column_config.ProgressColumn("AI", min_value=0, max_value=100, format="%d")
+                col_config["AI-Verdict"] = st.column_config.TextColumn("Verdict")
+            
             # Nur vorhandene Spalten anzeigen
             display_cols = [c for c in display_cols if c in df.columns]
             
             sel = st.dataframe(
                 df[display_cols], on_select="rerun", selection_mode="single-row",
                 hide_index=True, use_container_width=True,
+                # Neue Liste -> Auswahl zurücksetzen (Zeilennummer zeigte sonst auf einen anderen Ticker)
+                key=f"results_{st.session_state.get('feed_state', (None, None, 0))[2]}",
                 column_config=col_config
             )
             
@@ -1122,6 +527,10 @@ with tab_scanner:
                 st.session_state.selected_symbol = str(row["Ticker"])
                 st.session_state.current_data = row.to_dict()
                 
+                # AI-Screening Begründung
+                if isinstance(row.get("AI-Note"), str) and row["AI-Note"]:
+                    st.caption(f"🤖 {row['AI-Verdict']} ({row['AI-Score']:.0f}/100): {row['AI-Note']}")
+                
                 # Insider Details anzeigen
                 if is_insider and "Transactions" in row:
                     st.divider()
@@ -1147,7 +556,7 @@ with tab_scanner:
         with col_tf:
             selected_tf = st.selectbox(
                 "⏱️ Timeframe",
-                ["1H", "4H", "1D", "1W", "1M"],
+                ["1H", "4H", "1D", "1W", "1M", "1Y"],
                 index=1,  # Default: 4H
                 key="tf_selector",
                 help="S/R-Levels werden basierend auf diesem Timeframe berechnet"
@@ -1159,7 +568,8 @@ with tab_scanner:
             "4H": "240", 
             "1D": "D",
             "1W": "W",
-            "1M": "M"
+            "1M": "M",
+            "1Y": "12M"
         }
         tv_interval = tf_to_tv.get(selected_tf, "240")
         
@@ -1183,7 +593,8 @@ with tab_scanner:
                 ticker=ticker,
                 market_type=m_type,
                 timeframe=selected_tf,
-                poly_key=poly_key
+                poly_key=poly_key,
+                coin_id=st.session_state.current_data.get("CoinID")
             )
             st.session_state.sr_levels = {"support": supports, "resistance": resistances}
             st.session_state.fib_info = fib_info
@@ -1277,138 +688,25 @@ with tab_search:
         st.write("")  # Spacer
         search_clicked = st.button("🔍 Suchen", type="primary", key="search_btn")
     
+    # Vorschläge aus dem lokalen Symbol-Index (kein API-Abruf pro Tastendruck)
+    if search_input and not resolve(search_input, search_market):
+        suggestions = complete(search_input, search_market, limit=8)
+        if suggestions:
+            st.caption("Meintest du: " + ", ".join(f"**{s['symbol']}** ({s['name']})" for s in suggestions))
+    symbol_index = index_status()
+    if symbol_index["built"]:
+        st.caption(f"Symbol-Index: {symbol_index['Aktien']:,} Aktien, {symbol_index['Krypto']:,} Coins "
+                   f"(Stand {datetime.fromtimestamp(symbol_index['built']):%d.%m. %H:%M})")
+    
     if search_clicked and search_input:
         with st.spinner(f"Suche {search_input}..."):
             search_result = None
             
-            if search_market == "Krypto":
-                # CoinGecko Suche - Verbessert mit Search API
-                try:
-                    # Methode 1: Direkte Suche via Search API
-                    search_url = f"https://api.coingecko.com/api/v3/search?query={search_input.lower()}"
-                    search_resp = requests.get(search_url, timeout=15)
-                    
-                    coin_id = None
-                    if search_resp.status_code == 200:
-                        search_data = search_resp.json()
-                        coins_found = search_data.get("coins", [])
-                        
-                        # Finde den besten Match
-                        for c in coins_found:
-                            if c.get("symbol", "").upper() == search_input:
-                                coin_id = c.get("id")
-                                break
-                        
-                        # Fallback: Erster Treffer
-                        if not coin_id and coins_found:
-                            coin_id = coins_found[0].get("id")
-                    
-                    # Methode 2: Falls Search nicht klappt, in Markets suchen
-                    if not coin_id:
-                        markets_url = "https://api.coingecko.com/api/v3/coins/markets"
-                        params = {
-                            "vs_currency": "usd",
-                            "order": "market_cap_desc",
-                            "per_page": 250,
-                            "page": 1
-                        }
-                        markets_resp = requests.get(markets_url, params=params, timeout=30)
-                        if markets_resp.status_code == 200:
-                            for coin in markets_resp.json():
-                                if coin.get("symbol", "").upper() == search_input:
-                                    coin_id = coin.get("id")
-                                    break
-                    
-                    # Jetzt Coin-Daten holen
-                    if coin_id:
-                        detail_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
-                        params = {"localization": "false", "tickers": "false", "community_data": "false", "developer_data": "false"}
-                        detail_resp = requests.get(detail_url, params=params, timeout=15)
-                        
-                        if detail_resp.status_code == 200:
-                            coin = detail_resp.json()
-                            market_data = coin.get("market_data", {})
-                            
-                            price = market_data.get("current_price", {}).get("usd", 0)
-                            change = market_data.get("price_change_percentage_24h", 0) or 0
-                            vol = market_data.get("total_volume", {}).get("usd", 0)
-                            mcap = market_data.get("market_cap", {}).get("usd", 1)
-                            high = market_data.get("high_24h", {}).get("usd", price)
-                            low = market_data.get("low_24h", {}).get("usd", price)
-                            
-                            rvol = round((vol / mcap) * 500, 2) if mcap > 0 else 1.0
-                            rvol = max(0.1, min(rvol, 100))
-                            close_pos = calculate_close_position(high, low, price)
-                            alpha = calculate_alpha_score(rvol, change, change)
-                            
-                            search_result = {
-                                "Ticker": coin.get("symbol", "").upper(),
-                                "Name": coin.get("name", ""),
-                                "Preis": round(price, 6),
-                                "Chg%": round(change, 2),
-                                "RVOL": rvol,
-                                "Vortag%": round(change, 2),
-                                "ClosePos": round(close_pos, 2),
-                                "Alpha": alpha,
-                                "High24h": high,
-                                "Low24h": low,
-                                "Volume": vol,
-                                "MarketCap": mcap
-                            }
-                except Exception as e:
-                    st.error(f"Fehler bei Krypto-Suche: {e}")
-            
-            else:
-                # Polygon Aktien-Suche
-                try:
-                    poly_key = st.secrets["POLYGON_KEY"]
-                    url = f"https://api.polygon.io/v2/snapshot/locale/us/markets/stocks/tickers/{search_input}"
-                    params = {"apiKey": poly_key}
-                    resp = requests.get(url, params=params, timeout=15)
-                    
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        ticker_data = data.get("ticker", {})
-                        
-                        if ticker_data:
-                            day = ticker_data.get("day", {}) or {}
-                            prev = ticker_data.get("prevDay", {}) or {}
-                            last = ticker_data.get("lastTrade", {}) or {}
-                            
-                            price = day.get("c") or last.get("p") or prev.get("c") or 0
-                            
-                            if price > 0:
-                                high = day.get("h", price)
-                                low = day.get("l", price)
-                                
-                                change = ticker_data.get("todaysChangePerc", 0) or 0
-                                
-                                vol = day.get("v", 0)
-                                prev_vol = prev.get("v", 1)
-                                rvol = round(vol / prev_vol, 2) if prev_vol > 0 else 1.0
-                                
-                                prev_open = prev.get("o", 0)
-                                prev_close = prev.get("c", 0)
-                                vortag = round(((prev_close - prev_open) / prev_open) * 100, 2) if prev_open > 0 else 0
-                                
-                                close_pos = calculate_close_position(high, low, price)
-                                alpha = calculate_alpha_score(rvol, vortag, change)
-                                
-                                search_result = {
-                                    "Ticker": search_input,
-                                    "Name": search_input,
-                                    "Preis": round(price, 4),
-                                    "Chg%": round(change, 2),
-                                    "RVOL": rvol,
-                                    "Vortag%": vortag,
-                                    "ClosePos": round(close_pos, 2),
-                                    "Alpha": alpha,
-                                    "High24h": high,
-                                    "Low24h": low,
-                                    "Volume": vol
-                                }
-                except Exception as e:
-                    st.error(f"Fehler bei Aktien-Suche: {e}")
+            try:
+                poly_key = st.secrets["POLYGON_KEY"] if search_market == "Aktien" else None
+                search_result = lookup_symbol(search_input, search_market, poly_key)
+            except Exception as e:
+                st.error(f"Fehler bei {search_market}-Suche: {e}")
             
             # Ergebnis anzeigen
             if search_result:
@@ -1498,33 +796,19 @@ with tab_search:
                     st.subheader("🤖 AI-Analyse")
                     with st.spinner("Claude analysiert..."):
                         try:
-                            client = anthropic.Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
-                            
-                            prompt = f"""SCHNELL-ANALYSE für {search_result['Ticker']}
-
-DATEN:
-- Preis: ${search_result['Preis']}
-- 24h Change: {search_result['Chg%']}%
-- RVOL: {search_result['RVOL']}x
-- Alpha-Score: {search_result['Alpha']}
-- Markt: {search_market}
-
-AUFGABEN:
-1. Kurze technische Einschätzung (2-3 Sätze)
-2. Key Support & Resistance Levels
-3. Empfehlung: LONG / SHORT / ABWARTEN
-4. Rating: X/100
-
-Keine Disclaimers. Direkt und knapp."""
-
-                            message = client.messages.create(
-                                model="claude-sonnet-4-20250514",
-                                max_tokens=800,
-                                system="Du bist ein präzises Trading-Terminal. Kurz und knackig.",
-                                messages=[{"role": "user", "content": prompt}]
+                            quick_fp = fingerprint(
+                                "quick", search_result["Ticker"], search_market, search_result["Preis"],
+                                extra=[search_result["Chg%"], search_result["RVOL"], search_result["Alpha"]]
                             )
-                            
-                            st.write(message.content[0].text)
+                            cached_report = get_report(quick_fp)
+                            if cached_report:
+                                st.write(cached_report["text"])
+                                st.caption(f"♻️ Aus dem Report-Cache (vor {(datetime.now().timestamp() - cached_report['created']) / 60:.0f} Min)")
+                            else:
+                                client = anthropic.Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
+                                system_prompt, messages = build_quick_request(search_result, search_market)
+                                text = st.write_stream(stream_analysis(client, system_prompt, messages, QUICK_MAX_TOKENS))
+                                put_report(quick_fp, text, "quick", search_result["Ticker"], search_market, price=search_result["Preis"])
                             st.session_state.run_search_analysis = False
                             
                         except Exception as e:
@@ -1533,6 +817,44 @@ Keine Disclaimers. Direkt und knapp."""
             else:
                 st.warning(f"❌ '{search_input}' nicht gefunden. Prüfe die Schreibweise.")
                 st.caption("Beispiele: TSLA, AAPL, NVDA, BTC, ETH, SOL")
+    
+    # Vergleich: mehrere Symbole (gemischt) in gebündelten Abrufen, eine Tabelle
+    st.divider()
+    st.subheader("📊 Vergleich")
+    compare_input = st.text_area(
+        "Mehrere Ticker (Komma/Leerzeichen, Krypto z.B. als BTC-USD erzwingen)",
+        placeholder="TSLA, NVDA, AAPL, BTC, ETH, SOL",
+        key="compare_input", height=80
+    )
+    compare_clicked = st.button("📊 Vergleichen", key="compare_btn")
+    
+    if compare_clicked and compare_input.strip():
+        compare_pairs = parse_symbol_list(compare_input, search_market)
+        try:
+            compare_poly_key = st.secrets.get("POLYGON_KEY")
+        except Exception:
+            compare_poly_key = None
+        with st.spinner(f"Lade {len(compare_pairs)} Ticker..."):
+            compare_rows, compare_missing = compare_symbols(compare_pairs, compare_poly_key)
+        st.session_state.compare_result = (compare_rows, compare_missing)
+    
+    if st.session_state.get("compare_result"):
+        compare_rows, compare_missing = st.session_state.compare_result
+        if compare_rows:
+            st.dataframe(
+                compare_table(compare_rows), use_container_width=True, hide_index=True,
+                column_config={
+                    "Preis": st.column_config.NumberColumn("Preis", format="$%.4f"),
+                    "Chg%": st.column_config.NumberColumn("Chg%", format="%.2f%%"),
+                    "RVOL": st.column_config.NumberColumn("RVOL", format="%.1fx"),
+                    "Alpha": st.column_config.NumberColumn("Alpha", format="%.0f⭐"),
+                    "ClosePos": st.column_config.NumberColumn("ClosePos", format="%.2f"),
+                    "S-Dist%": st.column_config.NumberColumn("↓ S", format="%.1f%%", help="Abstand zum nächsten Support"),
+                    "R-Dist%": st.column_config.NumberColumn("↑ R", format="%.1f%%", help="Abstand zur nächsten Resistance"),
+                }
+            )
+        if compare_missing:
+            st.warning(f"❌ Nicht gefunden: {', '.join(compare_missing)}")
 
 # -----------------------------------------------------------------------------
 # WATCHLIST TAB
@@ -1543,28 +865,64 @@ with tab_watchlist:
     if st.session_state.watchlist:
         st.caption(f"{len(st.session_state.watchlist)} Ticker gespeichert")
         
-        for i, item in enumerate(st.session_state.watchlist):
-            with st.container():
-                c1, c2, c3, c4 = st.columns([2, 2, 2, 1])
-                with c1:
-                    st.markdown(f"**{item['ticker']}**")
-                    st.caption(item['market'])
-                with c2:
-                    st.metric("Preis (beim Hinzufügen)", f"${item['price']:.4f}")
-                with c3:
-                    st.caption(f"Hinzugefügt: {item['added']}")
-                with c4:
-                    if st.button("🗑️", key=f"del_{i}"):
-                        remove_from_watchlist(item['ticker'])
-                        st.rerun()
-                st.divider()
+        # Live-Kurse für die ganze Liste in wenigen gebündelten Abrufen
+        try:
+            wl_poly_key = st.secrets.get("POLYGON_KEY")
+        except Exception:
+            wl_poly_key = None
+        with st.spinner("Lade Live-Kurse..."):
+            quotes = watchlist.fetch_quotes(st.session_state.watchlist, wl_poly_key)
+        wl_rows = watchlist.with_pnl(st.session_state.watchlist, quotes)
+        
+        wl_df = pd.DataFrame(wl_rows)
+        pnl_values = wl_df["P&L%"].dropna()
+        col_w1, col_w2, col_w3 = st.columns(3)
+        with col_w1:
+            st.metric("Mit Live-Kurs", f"{len(quotes)}/{len(wl_rows)}")
+        with col_w2:
+            st.metric("Ø P&L", f"{pnl_values.mean():+.2f}%" if len(pnl_values) else "-")
+        with col_w3:
+            st.metric("Im Plus", f"{(pnl_values > 0).sum()}/{len(pnl_values)}" if len(pnl_values) else "-")
+        if not wl_poly_key and any(w["market"] == "Aktien" for w in st.session_state.watchlist):
+            st.caption("⚠️ POLYGON_KEY fehlt - keine Live-Kurse für Aktien")
+        
+        st.dataframe(
+            wl_df, use_container_width=True, hide_index=True,
+            column_config={
+                "Preis (hinzugefügt)": st.column_config.NumberColumn(format="$%.4f"),
+                "Live": st.column_config.NumberColumn(format="$%.4f"),
+                "Chg%": st.column_config.NumberColumn(format="%.2f%%"),
+                "P&L%": st.column_config.NumberColumn(format="%+.2f%%"),
+            }
+        )
+        
+        # Entfernen über Auswahl statt Button pro Zeile (skaliert auf große Listen)
+        wl_labels = {f"{w['ticker']} ({w['market']}" + (f", {w['coin_id']})" if w.get("coin_id") else ")"): w
+                     for w in st.session_state.watchlist}
+        to_remove = st.multiselect("Entfernen", list(wl_labels), key="wl_remove")
+        if to_remove and st.button("🗑️ Ausgewählte entfernen"):
+            for label in to_remove:
+                w = wl_labels[label]
+                remove_from_watchlist(w["ticker"], w["market"], w.get("coin_id"))
+            st.rerun()
         
         # Watchlist Export
         if st.button("📋 Watchlist kopieren"):
             tickers = ", ".join([w['ticker'] for w in st.session_state.watchlist])
             st.code(tickers)
         
+        # Alerts des Watchlist-Monitors (läuft im Hintergrund-Scanner, auch ohne offenen Browser)
+        alerts = recent_alerts(limit=50)
+        with st.expander(f"🔔 Alerts ({len(alerts)})"):
+            if alerts:
+                st.dataframe(pd.DataFrame(alerts)[["time", "market", "ticker", "message"]],
+                             use_container_width=True, hide_index=True)
+            else:
+                st.caption("Noch keine Alerts - S/R-Kreuzungen und neue Strategie-Treffer erscheinen hier")
+            st.caption(f"Alle {MONITOR_INTERVAL}s, Datei: {ALERT_FILE}" + (" + Webhook" if ALERT_WEBHOOK else ""))
+        
         if st.button("🗑️ Alle löschen", type="secondary"):
+            watchlist.clear_watchlist()
             st.session_state.watchlist = []
             st.rerun()
     else:
@@ -1580,6 +938,7 @@ with col_ai1:
     st.subheader("🤖 Claude AI Analyse")
 with col_ai2:
     analyze_btn = st.button("Analyse starten", type="primary", use_container_width=True)
+    force_new_report = st.checkbox("🔄 Neu erzeugen", key="ai_force_new", help="Report-Cache ignorieren")
 
 if analyze_btn:
     if "current_data" not in st.session_state:
@@ -1595,269 +954,16 @@ if analyze_btn:
                 news_txt = "Keine News."
                 if m_type == "Aktien":
                     try:
-                        poly_key = st.secrets["POLYGON_KEY"]
-                        news_resp = requests.get(
-                            f"https://api.polygon.io/v2/reference/news?ticker={st.session_state.selected_symbol}&limit=3&apiKey={poly_key}",
-                            timeout=10
-                        ).json()
-                        news_items = news_resp.get("results", [])
-                        if news_items:
-                            news_txt = "\n".join([f"- {n.get('title', 'N/A')}" for n in news_items])
-                    except:
+                        news_txt = fetch_news_text(st.session_state.selected_symbol, st.secrets["POLYGON_KEY"])
+                    except Exception:
                         pass
                 
-                client = anthropic.Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
-                
-                # Fibonacci-erweiterte S/R Info
-                sr_text = f"""
-SUPPORT & RESISTANCE (aus Swing Highs/Lows + Fibonacci):
-Support-Zonen: {', '.join([f'${s}' for s in sr['support']])}
-Resistance-Zonen: {', '.join([f'${r}' for r in sr['resistance']])}
-"""
-                
-                # Fibonacci Details hinzufügen wenn vorhanden
-                if fib:
-                    sr_text += f"""
-FIBONACCI LEVELS (basierend auf Periode High/Low):
-• Periode High: ${fib.get('period_high', 'N/A')}
-• Periode Low: ${fib.get('period_low', 'N/A')}
-• Fib 23.6%: ${fib.get('fib_236', 'N/A')}
-• Fib 38.2%: ${fib.get('fib_382', 'N/A')}
-• Fib 50.0%: ${fib.get('fib_500', 'N/A')}
-• Fib 61.8% (Golden Ratio): ${fib.get('fib_618', 'N/A')}
-• Fib 78.6%: ${fib.get('fib_786', 'N/A')}
-• Fib Extension 127.2%: ${fib.get('fib_1272', 'N/A')}
-• Fib Extension 161.8%: ${fib.get('fib_1618', 'N/A')}
-"""
-                    
-                    # Konsolidierungszonen hinzufügen
-                    if fib.get('consolidation_zones'):
-                        sr_text += f"""
-KONSOLIDIERUNGSZONEN (High Activity - wo viel gehandelt wurde):
-"""
-                        for i, zone in enumerate(fib['consolidation_zones'], 1):
-                            sr_text += f"• Zone {i}: ${zone['low']} - ${zone['high']} ({zone['days']} Kerzen = {zone['pct_time']}% der Zeit)\n"
-                        sr_text += """
-Diese Zonen sind wichtig weil:
-- Viele Orders/Positionen wurden hier eröffnet
-- Oft fungieren sie als Support/Resistance
-- Preis tendiert dazu, in diese Zonen zurückzukehren
-"""
-                
-                # Erweiterter Profi-Prompt
-                asset_name = d.get('Name', d['Ticker'])
-                current_date = datetime.now().strftime("%d.%m.%Y")
-                
-                # MARKTSPEZIFISCHE KATALYSATOREN
-                if m_type == "Krypto":
-                    katalysatoren_text = """6. KOMMENDE KATALYSATOREN (KRYPTO-SPEZIFISCH)
-   - Token Unlocks / Vesting Schedules (wann werden Tokens freigeschaltet?)
-   - Protokoll-Upgrades / Hard Forks / Soft Forks
-   - Mainnet Launches / Testnet Updates
-   - Halvings (bei PoW Coins)
-   - Token Burns / Buybacks
-   - Neue Exchange Listings
-   - Partnership Announcements
-   - Staking/Yield Änderungen
-   - Regulatorische Entwicklungen (ETF-Entscheidungen, Gesetzgebung)
-   - Makro: Fed-Entscheidungen, Risk-On/Risk-Off Sentiment
-   - Wann ist das nächste wichtige Datum für diesen Coin?"""
-                    
-                    system_extra = """
-KRYPTO-EXPERTISE:
-- Du kennst typische Krypto-Katalysatoren: Halvings, Upgrades, Token Burns, Unlocks, Forks
-- Du weisst dass Krypto 24/7 handelt und volatiler ist
-- Du berücksichtigst On-Chain Metriken wenn relevant
-- Du kennst die wichtigsten Protokolle und deren Upgrade-Zyklen"""
-
-                else:  # Aktien
-                    katalysatoren_text = """6. KOMMENDE KATALYSATOREN (AKTIEN-SPEZIFISCH)
-   
-   EARNINGS & FINANCIALS:
-   - Nächster Earnings Report (Datum, Erwartungen)
-   - Guidance Updates
-   - Dividenden-Termine (Ex-Date, Payment Date)
-   - Aktienrückkauf-Programme
-   
-   SEKTOR-SPEZIFISCH:
-   
-   Biotech/Pharma:
-   - FDA-Entscheidungen (PDUFA Dates)
-   - Klinische Studien (Phase 1/2/3 Readouts)
-   - AdCom Meetings
-   - Patent-Abläufe
-   
-   Tech:
-   - Produkt-Launches
-   - Developer Conferences
-   - Nutzerzahlen / MAU Reports
-   
-   Retail:
-   - Same-Store-Sales Reports
-   - Holiday Season Performance
-   
-   Energie:
-   - OPEC Meetings
-   - Inventory Reports
-   
-   ALLGEMEIN:
-   - Insider-Käufe/Verkäufe
-   - Institutionelle Bewegungen (13F Filings)
-   - Analysten-Rating Änderungen
-   - Index-Aufnahmen/Entfernungen (S&P 500, etc.)
-   - Stock Splits
-   - Spin-Offs / M&A Gerüchte
-   
-   MAKRO:
-   - Fed Meetings / Zinsentscheidungen
-   - CPI / Inflationsdaten
-   - Arbeitsmarktdaten
-   
-   - Wann ist das nächste wichtige Datum für diese Aktie?"""
-                    
-                    system_extra = """
-AKTIEN-EXPERTISE:
-- Du kennst Earnings-Zyklen und typische Reaktionen
-- Bei Biotech/Pharma kennst du FDA-Prozesse und klinische Studien-Phasen
-- Du weisst dass Pre-Market und After-Hours wichtig sind
-- Du berücksichtigst Sektor-Rotation und Marktbreite
-- Du kennst die Bedeutung von Insider-Transaktionen und institutionellem Ownership"""
-                
-                prompt = f"""ALPHA STATION PRO - VOLLSTÄNDIGER TRADING REPORT
-
-═══════════════════════════════════════════════════
-ASSET: {d['Ticker']} ({asset_name})
-MARKT: {m_type}
-DATUM: {current_date}
-═══════════════════════════════════════════════════
-
-LIVE-DATEN:
-• Aktueller Preis: ${d['Preis']}
-• 24h Änderung: {d['Chg%']}%
-• RVOL (Volumen-Ratio): {d['RVOL']}x
-• Close Position: {d.get('ClosePos', 0.5)} (0=Tagestief, 1=Tageshoch)
-• Alpha-Score: {d['Alpha']}
-
-{sr_text}
-
-AKTUELLE NEWS:
-{news_txt}
-
-═══════════════════════════════════════════════════
-DEINE AUFGABEN (VOLLSTÄNDIGER REPORT):
-═══════════════════════════════════════════════════
-
-1. STRATEGIE-ANALYSE
-   - Bewerte das Setup für die Strategie "{st.session_state.current_strategy}"
-   - Passt das Asset zur gewählten Strategie? Warum/warum nicht?
-
-2. FIBONACCI-ANALYSE
-   - Analysiere die gegebenen Fibonacci-Levels
-   - Wo steht der Preis im Verhältnis zu den Fib-Levels?
-   - Welches Fib-Level ist das wichtigste für diesen Trade?
-   - Bei welchem Fib-Level erwarten wir Reaktion?
-   - Gib konkrete Preise an: "Fib 61.8% bei $XX ist Key-Level"
-
-3. KONSOLIDIERUNGSZONEN-ANALYSE
-   - Analysiere die High-Activity Zonen wo viel gehandelt wurde
-   - Liegt der aktuelle Preis in/nahe einer Konsolidierungszone?
-   - Welche Zone ist am wichtigsten als S/R?
-   - Erkläre warum diese Zonen als Support/Resistance fungieren können
-   - Beispiel: "Zone $1.78-$1.92 war 40% der Zeit aktiv = starke Support-Zone"
-
-4. ELLIOTT WAVE ANALYSE
-   - In welcher Elliott Wave befinden wir uns wahrscheinlich?
-   - Welle 1, 2, 3, 4 oder 5 (Impuls) oder A, B, C (Korrektur)?
-   - Begründe deine Einschätzung basierend auf der Preisbewegung
-   - Was ist das wahrscheinliche Kursziel basierend auf Elliott Wave?
-   - Beispiel: "Wir sind in Welle 3, typisches Ziel ist 161.8% Extension bei $XX"
-
-5. ENTRY-STRATEGIE
-   - Exakter Einstiegspunkt (Preis)
-   - Entry-Typ: Market Order / Limit Order / Stop-Entry?
-   - Optimaler Einstiegszeitpunkt (sofort, bei Pullback, bei Breakout?)
-   - Nutze Fibonacci-Level oder Konsolidierungszone für Entry
-
-6. STOP-LOSS & TAKE-PROFIT (MIT FIBONACCI + ZONEN)
-   - Stop-Loss: Unter welchem Fib-Level oder welcher Zone? Konkreter Preis
-   - Take-Profit 1: Welches Fib-Level oder Zone? Konkreter Preis
-   - Take-Profit 2: Welches Fib-Extension Level? Konkreter Preis
-   - Risk/Reward Ratio
-
-7. NEWS & SENTIMENT
-   - Analyse der aktuellen News (falls vorhanden)
-   - Sentiment-Einschätzung: Bullish / Bearish / Neutral
-
-{katalysatoren_text}
-
-9. RISIKO-FAKTOREN
-   - Was könnte schiefgehen?
-   - Welche Warnsignale gibt es?
-   - Sektor-spezifische Risiken
-
-10. FINAL VERDICT
-   - Rating: X/100
-   - Empfehlung: STRONG LONG / LONG / ABWARTEN / SHORT / STRONG SHORT
-   - Konfidenz: Hoch / Mittel / Niedrig
-   - Positionsgröße-Empfehlung: Klein (1-2%) / Normal (2-5%) / Aggressiv (5-10%)
-   - Zeithorizont: Intraday / Swing (Tage) / Position (Wochen)
-
-═══════════════════════════════════════════════════
-ZUSAMMENFASSUNG ZUM EINZEICHNEN:
-Am Ende liste diese Levels klar auf, damit der User sie im Chart einzeichnen kann:
-- Entry: $XX
-- Stop-Loss: $XX
-- TP1: $XX (Fib XX%)
-- TP2: $XX (Fib XX%)
-- Key Fib Levels: $XX (23.6%), $XX (38.2%), $XX (50%), $XX (61.8%), $XX (78.6%)
-═══════════════════════════════════════════════════
-
-REGELN: Keine Disclaimers, keine Ausreden, keine Höflichkeitsfloskeln.
-Du bist ein Trading-Terminal. Die Daten sind Fakten. Liefere konkrete Zahlen.
-═══════════════════════════════════════════════════"""
-
-                system_prompt = f"""Du bist ALPHA TERMINAL - ein präzises, professionelles Trading-Analyse-System mit Expertise in Fibonacci und Elliott Wave.
-
-DEINE EIGENSCHAFTEN:
-- Du lieferst messerscharfe, konkrete Analysen
-- Du nennst IMMER exakte Preise und Zahlen
-- Du bist Experte für Fibonacci Retracements und Extensions
-- Du kannst Elliott Waves identifizieren und Kursziele ableiten
-- Du bist direkt und ohne Umschweife
-- Du gibst klare Handlungsempfehlungen
-- Du recherchierst aus deinem Wissen bekannte Termine und Events
-{system_extra}
-
-FIBONACCI EXPERTISE:
-- Du kennst alle wichtigen Fib-Levels: 23.6%, 38.2%, 50%, 61.8%, 78.6%
-- Du kennst Fib-Extensions: 127.2%, 161.8%, 200%, 261.8%
-- Du weisst dass 61.8% das "Golden Ratio" ist und oft starke Reaktionen zeigt
-- Du nutzt Fib-Levels für Entry, Stop-Loss und Take-Profit
-
-ELLIOTT WAVE EXPERTISE:
-- Du kennst die 5-Wellen Impuls-Struktur (1-2-3-4-5)
-- Du kennst die 3-Wellen Korrektur-Struktur (A-B-C)
-- Welle 3 ist typischerweise die längste und stärkste
-- Welle 4 retraced typischerweise zum 38.2% Fib der Welle 3
-- Du gibst eine Einschätzung welche Welle gerade läuft
-
-FORMATIERUNG:
-- Nutze klare Überschriften
-- Nutze Bullet Points für Übersichtlichkeit
-- Hebe wichtige Zahlen hervor
-- Liste am Ende alle wichtigen Preise zum Einzeichnen auf
-
-VERBOTEN:
-- Keine Disclaimers über "keine Anlageberatung"
-- Keine Ausreden über fehlende Daten
-- Keine vagen Aussagen - immer konkret"""
-
-                message = client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=2500,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": prompt}]
+                # Gleiche Marktlage (Preis-Bucket, S/R, Fib, News, Strategie) -> gespeicherten Report zeigen
+                report_fp = fingerprint(
+                    "report", d["Ticker"], m_type, d["Preis"], st.session_state.current_strategy,
+                    sr_levels=sr, fib_info=fib, news=news_txt
                 )
+                cached_report = None if force_new_report else get_report(report_fp)
                 
                 st.markdown(f"### 🎯 ALPHA REPORT: {d['Ticker']}")
                 
@@ -1874,11 +980,41 @@ VERBOTEN:
                     st.metric("Alpha", f"{d['Alpha']:.0f}")
                 
                 st.divider()
-                st.write(message.content[0].text)
+                if cached_report:
+                    st.write(cached_report["text"])
+                    st.caption(f"♻️ Aus dem Report-Cache (vor {(datetime.now().timestamp() - cached_report['created']) / 60:.0f} Min, gleiche Marktlage)")
+                else:
+                    client = anthropic.Anthropic(api_key=st.secrets["ANTHROPIC_API_KEY"])
+                    
+                    # Statischer Prompt-Teil (System + Vorlage) wird gecacht, nur die Live-Daten ändern sich
+                    system_blocks, messages = build_report_request(
+                        d, m_type, st.session_state.current_strategy, build_sr_text(sr, fib), news_txt
+                    )
+                    text = st.write_stream(stream_analysis(
+                        client, system_blocks, messages, REPORT_MAX_TOKENS,
+                        on_done=lambda msg: st.session_state.update(last_ai_usage=msg.usage)
+                    ))
+                    put_report(report_fp, text, "report", d["Ticker"], m_type,
+                               strategy=st.session_state.current_strategy, price=d["Preis"])
+                    usage = st.session_state.get("last_ai_usage")
+                    if usage is not None:
+                        st.caption(f"🗄️ Prompt-Cache: {getattr(usage, 'cache_read_input_tokens', 0) or 0} Tokens gelesen / "
+                                   f"{getattr(usage, 'cache_creation_input_tokens', 0) or 0} geschrieben")
                 
             except Exception as e:
                 st.error(f"Fehler: {e}")
 
+# Report-Verlauf des gewählten Tickers (von der Platte, ohne API-Aufruf)
+past_reports = report_history(ticker=st.session_state.selected_symbol, kind="report", limit=10)
+if past_reports:
+    with st.expander(f"📚 Report-Verlauf {st.session_state.selected_symbol} ({len(past_reports)})"):
+        labels = [
+            f"{datetime.fromtimestamp(r['created']).strftime('%d.%m.%Y %H:%M')} | {r.get('strategy') or '-'} | ${r.get('price')}"
+            for r in past_reports
+        ]
+        picked = st.selectbox("Report", range(len(past_reports)), format_func=lambda i: labels[i], key="report_history_pick")
+        st.write(past_reports[picked]["text"])
+
 # -----------------------------------------------------------------------------
 # FOOTER
 # -----------------------------------------------------------------------------
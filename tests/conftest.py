@@ -0,0 +1,48 @@
+"""Gemeinsame Test-Daten: synthetische Polygon-Snapshots (kein Netzwerk)"""
+import random
+
+import pytest
+
+
+def _ohlcv(rnd, base):
+    o = base * rnd.uniform(0.9, 1.1)
+    c = base * rnd.uniform(0.9, 1.1)
+    h = max(o, c) * rnd.uniform(1.0, 1.08)
+    l = min(o, c) * rnd.uniform(0.92, 1.0)
+    return {"o": round(o, 4), "h": round(h, 4), "l": round(l, 4), "c": round(c, 4), "v": rnd.randint(0, 5_000_000)}
+
+
+def make_ticker(rnd, name):
+    """Ein Snapshot-Eintrag im Polygon-Format - mit gelegentlich leeren/fehlenden Feldern"""
+    base = rnd.choice([0.5, 3, 12, 80, 400])
+    day = _ohlcv(rnd, base)
+    prev = _ohlcv(rnd, base)
+    t = {
+        "ticker": name,
+        "day": day,
+        "prevDay": prev,
+        "lastTrade": {"p": day["c"]},
+        "min": {"c": day["c"], "v": day["v"] // 50},
+        "todaysChangePerc": round((day["c"] - prev["c"]) / prev["c"] * 100, 4),
+        "updated": rnd.randint(1, 10**12),
+    }
+    roll = rnd.random()
+    if roll < 0.05:
+        t["day"] = {}                      # Vorbörslich: nur lastTrade/min
+    elif roll < 0.10:
+        t["todaysChangePerc"] = None       # Change aus prevDay ableiten
+    elif roll < 0.13:
+        t["prevDay"] = {}                  # Neu gelistet
+    elif roll < 0.15:
+        t["day"], t["lastTrade"], t["min"], t["prevDay"] = {}, {}, {}, {}  # Kein Preis
+    elif roll < 0.20:
+        t["day"]["h"] = t["day"]["l"] = t["day"]["o"] = t["day"]["c"]      # Kerze ohne Range
+    return t
+
+
+@pytest.fixture
+def make_snapshot():
+    def build(n, seed=1):
+        rnd = random.Random(seed)
+        return [make_ticker(rnd, f"T{i:04d}") for i in range(n)]
+    return build
@@ -0,0 +1,77 @@
+"""Backtest: Verschiebungen und Forward-Returns enden an der Symbolgrenze"""
+import numpy as np
+import pytest
+
+from alpha_core import backtest, history
+from alpha_core.backtest import _shift, _to_ms, forward_returns
+
+DAY_MS = 24 * 60 * 60 * 1000
+# Zwei Symbole hintereinander im Panel: 0 (3 Kerzen), 1 (4 Kerzen)
+SYM = np.array([0, 0, 0, 1, 1, 1, 1], dtype=np.int32)
+CLOSE = np.array([10.0, 11.0, 12.0, 100.0, 110.0, 121.0, 133.1])
+
+
+def test_shift_forward_stops_at_symbol_boundary():
+    np.testing.assert_array_equal(_shift(CLOSE, SYM, 1), [11, 12, np.nan, 110, 121, 133.1, np.nan])
+    np.testing.assert_array_equal(_shift(CLOSE, SYM, 3), [np.nan, np.nan, np.nan, 133.1, np.nan, np.nan, np.nan])
+
+
+def test_shift_backward_stops_at_symbol_boundary():
+    np.testing.assert_array_equal(_shift(CLOSE, SYM, -1), [np.nan, 10, 11, np.nan, 100, 110, 121])
+
+
+def test_shift_beyond_panel_is_all_nan():
+    assert np.isnan(_shift(CLOSE, SYM, len(CLOSE))).all()
+    assert np.isnan(_shift(CLOSE, SYM, -len(CLOSE))).all()
+
+
+def test_forward_returns_never_mix_symbols():
+    returns = forward_returns(SYM, CLOSE, horizons=(1, 2))
+    np.testing.assert_allclose(returns[:, 0], [10, 100 / 11, np.nan, 10, 10, 10, np.nan])
+    np.testing.assert_allclose(returns[:, 1], [20, np.nan, np.nan, 21, 21, np.nan, np.nan])
+
+
+@pytest.mark.parametrize("tz", ["UTC", "America/New_York", "Asia/Tokyo"])
+def test_date_bounds_are_utc_days(monkeypatch, tz):
+    import time
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        start, end = _to_ms("2024-03-01"), _to_ms("2024-03-05", end=True)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    midnight = 1709251200000  # 2024-03-01 00:00 UTC
+    # Polygon-Stempel: Mitternacht New York (EST, 05:00 UTC)
+    stamps = midnight + 5 * 60 * 60 * 1000 + DAY_MS * np.arange(-1, 6)
+    assert (start, end) == (midnight, midnight + 5 * DAY_MS)
+    assert ((stamps >= start) & (stamps < end)).sum() == 5
+
+
+def test_backfill_extends_history_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(history, "_maps", type(history._maps)())
+    monkeypatch.setattr(history, "_refreshed", {})
+    stamp = 1709269200000  # 2024-03-01 00:00 New York
+    history.append_candles("Aktien", "AAPL", "1d", [[stamp + 10 * DAY_MS, 1, 2, 0.5, 1.5, 100]])
+    calls = []
+
+    def fetch_stock_aggs(ticker, start, end, poly_key, endpoint="aggs"):
+        calls.append((ticker, start))
+        return [[stamp + i * DAY_MS, 1, 2, 0.5, 1.0, 100] for i in range(12)]
+
+    monkeypatch.setattr(history, "fetch_stock_aggs", fetch_stock_aggs)
+    assert backtest.backfill(["AAPL", "MSFT"], "2024-03-01", "key", workers=1) == (2, 0)
+    assert sorted(calls) == [("AAPL", "2024-03-01"), ("MSFT", "2024-03-01")]
+    candles = history.read_history("Aktien", "AAPL", "1d")
+    assert (len(candles), candles[0, 0], candles[-1, 4]) == (12, stamp, 1.0)
+
+    # Reicht der Verlauf schon zurück, kein weiterer Abruf
+    assert backtest.backfill(["AAPL"], "2024-03-05", "key", workers=1) == (0, 0)
+    assert len(calls) == 2
+
+
+def test_backfill_needs_key(monkeypatch):
+    monkeypatch.delenv("POLYGON_KEY", raising=False)
+    assert backtest.main(["--backfill", "2020-01-01", "--symbols", "AAPL"]) == backtest.EXIT_USAGE
+    assert backtest.main(["--backfill", "2020-13-01", "--symbols", "AAPL", "--poly-key", "k"]) == backtest.EXIT_USAGE
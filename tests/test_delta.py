@@ -0,0 +1,75 @@
+"""Delta-Scan: Zeilen werden über den Ticker zugeordnet, nicht über die Position"""
+import copy
+import random
+
+import pytest
+
+from alpha_core.delta import build_scan_state, rescan, state_results
+from alpha_core.metrics import scan_stock_snapshot
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, STRATEGIES
+
+FILTERS = STRATEGIES["Volume Surge"]["filters"]
+
+
+def tick(tickers, picks, rnd):
+    """Neuer Snapshot: ausgewählte Ticker bekommen neuen Preis, Volumen und Zeitstempel"""
+    new = copy.deepcopy(tickers)
+    for i in picks:
+        t = new[i]
+        if t["day"]:
+            t["day"]["c"] = round(t["day"]["c"] * rnd.uniform(0.9, 1.1), 4)
+            t["day"]["v"] = t["day"]["v"] * rnd.randint(1, 6)
+        t["updated"] += 1
+    return new
+
+
+def results_by_ticker(results):
+    return {r["Ticker"]: r for r in results}
+
+
+@pytest.mark.parametrize("with_stamps", [True, False])
+def test_rescan_matches_full_scan_after_reorder(make_snapshot, with_stamps):
+    rnd = random.Random(5)
+    before = make_snapshot(800, seed=11)
+    if not with_stamps:
+        for t in before:
+            del t["updated"]  # Schlüssel aus den Feldern selbst
+    after = tick(before, rnd.sample(range(len(before)), 80), rnd) if with_stamps else copy.deepcopy(before)
+    if not with_stamps:
+        for t in rnd.sample(after, 80):
+            t["todaysChangePerc"] = (t["todaysChangePerc"] or 0) + 5
+    rnd.shuffle(after)
+
+    state = build_scan_state(before, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+    state, diff = rescan(state, after, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+
+    assert state_results(state) == scan_stock_snapshot(after, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+    assert diff["changed"] == 80
+    assert diff["total"] == len(after)
+
+
+def test_diff_reports_entered_exited_and_removed(make_snapshot):
+    rnd = random.Random(9)
+    before = make_snapshot(600, seed=2)
+    after = tick(before, rnd.sample(range(len(before)), 120), rnd)
+    removed = after.pop(0)["ticker"]
+
+    old = results_by_ticker(scan_stock_snapshot(before, FILTERS, DEFAULT_ADDITIONAL_FILTERS)[0])
+    new = results_by_ticker(scan_stock_snapshot(after, FILTERS, DEFAULT_ADDITIONAL_FILTERS)[0])
+
+    state = build_scan_state(before, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+    _, diff = rescan(state, after, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+
+    assert {r["Ticker"] for r in diff["entered"]} == new.keys() - old.keys()
+    assert {r["Ticker"] for r in diff["exited"]} == old.keys() - new.keys()
+    assert {m["Ticker"] for m in diff["moved"]} == {t for t in new.keys() & old.keys() if new[t] != old[t]}
+    assert removed not in {r["Ticker"] for r in diff["entered"] + [m["now"] for m in diff["moved"]]}
+
+
+def test_filter_change_recomputes_every_row(make_snapshot):
+    tickers = make_snapshot(400, seed=4)
+    other = STRATEGIES["Gap Up"]["filters"]
+    state = build_scan_state(tickers, FILTERS, DEFAULT_ADDITIONAL_FILTERS)
+    state, diff = rescan(state, tickers, other, DEFAULT_ADDITIONAL_FILTERS)
+    assert diff["changed"] == 0
+    assert state_results(state) == scan_stock_snapshot(tickers, other, DEFAULT_ADDITIONAL_FILTERS)
@@ -0,0 +1,26 @@
+"""Filter-Compiler: Bereiche verschmelzen, unbekannte Spalten früh melden"""
+import pytest
+
+from alpha_core.filters import FILTER_COLUMNS, compile_filters
+from alpha_core.metrics import build_crypto_metrics, build_stock_metrics
+
+
+def test_strategy_and_additional_filters_merge_per_column():
+    clauses = dict((c, (lo, hi)) for c, lo, hi in compile_filters(
+        {"Preis": (1, 50), "RVOL": (2, 10)}, {"preis_min": 5, "preis_max": 20, "rvol_override_min": 3}))
+    assert clauses["Preis"] == (5, 20)
+    assert clauses["RVOL"] == (3, 10)
+
+
+def test_non_range_filters_are_ignored():
+    assert compile_filters({"Insider": "BUY"}, {}) == []
+
+
+def test_unknown_column_raises_value_error():
+    with pytest.raises(ValueError, match="Volumen"):
+        compile_filters({"Volumen": (1, 2)}, {})
+
+
+def test_filter_columns_exist_in_both_metric_tables():
+    assert set(FILTER_COLUMNS) <= set(build_stock_metrics([]).columns)
+    assert set(FILTER_COLUMNS) <= set(build_crypto_metrics([]).columns)
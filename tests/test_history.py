@@ -0,0 +1,58 @@
+"""Lokaler Verlauf: Handelstage in UTC unabhängig von der Host-Zeitzone, begrenzte memmaps"""
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from alpha_core import history
+
+
+def ny_midnight(day):
+    """Polygon-Stempel einer Tageskerze: Mitternacht New York (hier EDT, 04:00 UTC)"""
+    return datetime.strptime(day, "%Y-%m-%d").replace(hour=4, tzinfo=timezone.utc).timestamp() * 1000
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(history, "_maps", type(history._maps)())
+    monkeypatch.setattr(history, "_refreshed", {})
+    return tmp_path
+
+
+@pytest.fixture
+def pacific(monkeypatch):
+    """Host westlich von New York: lokal ist NY-Mitternacht noch der Vortag"""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.delenv("TZ")
+    time.tzset()
+
+
+def test_top_up_starts_at_utc_day_of_last_candle(store, pacific, monkeypatch):
+    history.append_candles("Aktien", "AAPL", "1d", [[ny_midnight("2024-06-03"), 1, 2, 0.5, 1.5, 100]])
+    calls = []
+    monkeypatch.setattr(history, "fetch_stock_aggs",
+                        lambda ticker, start, end, key, endpoint="aggs": calls.append((start, end)) or None)
+
+    history.top_up_stock("AAPL", "key")
+    assert calls == [("2024-06-03", datetime.now(timezone.utc).date().isoformat())]
+
+
+def test_load_includes_first_trading_day(store, pacific, monkeypatch):
+    today = datetime.now(timezone.utc).date()
+    days = [today - timedelta(days=n) for n in (5, 4, 3)]
+    history.append_candles("Aktien", "AAPL", "1d", [[ny_midnight(d.isoformat()), 1, 2, 0.5, 1.5, 100] for d in days])
+    monkeypatch.setattr(history, "top_up_stock", lambda ticker, key: 0)
+
+    assert len(history.load_stock_history("AAPL", 5, "key")) == 3
+
+
+def test_memmaps_are_bounded(store, monkeypatch):
+    monkeypatch.setattr(history, "MAX_MAPS", 3)
+    for i in range(5):
+        history.append_candles("Aktien", f"T{i}", "1d", [[ny_midnight("2024-06-03"), 1, 2, 0.5, 1.5, 100]])
+        assert len(history.read_history("Aktien", f"T{i}", "1d")) == 1
+    assert len(history._maps) == 3
+    assert history.history_path("Aktien", "T4", "1d") in history._maps
@@ -0,0 +1,66 @@
+"""HTTP-Cache: eigene Kopie pro Aufrufer, ein Abruf für gleichzeitige Misses"""
+import threading
+import time
+
+import pytest
+
+from alpha_core import http_session
+from alpha_core.http_cache import cache_clear, cached_get
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {}
+
+    def json(self):
+        return {"tickers": [dict(t) for t in self.payload["tickers"]]}
+
+
+class FakeSession:
+    def __init__(self, status_code=200, delay=0.0):
+        self.status_code = status_code
+        self.delay = delay
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return FakeResponse(self.status_code, {"tickers": [{"ticker": "AAA", "p": 1.0}]})
+
+
+@pytest.fixture
+def session(monkeypatch):
+    cache_clear()
+    fake = FakeSession()
+    monkeypatch.setattr(http_session, "_session", fake)
+    yield fake
+    cache_clear()
+
+
+def test_hits_return_independent_copies(session):
+    first = cached_get("https://example.test/a").json()
+    first["tickers"][0]["p"] = 99.0
+    assert cached_get("https://example.test/a").json()["tickers"][0]["p"] == 1.0
+    assert session.calls == 1
+
+
+def test_concurrent_misses_share_one_request(session):
+    session.delay = 0.2
+    payloads = []
+    threads = [threading.Thread(target=lambda: payloads.append(cached_get("https://example.test/b").json()))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert session.calls == 1
+    assert len(payloads) == 8 and len({id(p) for p in payloads}) == 8
+
+
+def test_errors_are_not_cached(session):
+    session.status_code = 500
+    assert cached_get("https://example.test/c").status_code == 500
+    assert cached_get("https://example.test/c").status_code == 500
+    assert session.calls == 2
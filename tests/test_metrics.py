@@ -0,0 +1,99 @@
+"""Vektorisierter Aktien-Scan gegen die ursprüngliche Schleife pro Ticker"""
+import pytest
+
+from alpha_core.metrics import scan_stock_snapshot
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, STRATEGIES
+
+
+def baseline_stock_scan(tickers, f, af):
+    """Referenz: Filter-Schleife aus fetch_stock_data vor der Vektorisierung"""
+    results, skipped_no_price, skipped_filter = [], 0, 0
+    for t in tickers:
+        day = t.get("day", {}) or {}
+        prev = t.get("prevDay", {}) or {}
+        last = t.get("lastTrade", {}) or {}
+        minute_data = t.get("min", {}) or {}
+
+        price = day.get("c") or last.get("p") or minute_data.get("c") or prev.get("c") or 0
+        if price <= 0:
+            skipped_no_price += 1
+            continue
+        open_price = day.get("o") or price
+        high = day.get("h") or price
+        low = day.get("l") or price
+        close = day.get("c") or price
+        prev_high = prev.get("h") or 0
+        prev_low = prev.get("l") or 0
+        prev_close = prev.get("c") or 0
+
+        gap_pct = 0
+        if prev_high > 0 and prev_low > 0:
+            if open_price > prev_high:
+                gap_pct = ((open_price - prev_high) / prev_high) * 100
+            elif open_price < prev_low:
+                gap_pct = ((open_price - prev_low) / prev_low) * 100
+
+        candle_range = high - low if high > low else 0.0001
+        upper_wick_pct = ((high - max(open_price, close)) / candle_range) * 100
+        lower_wick_pct = ((min(open_price, close) - low) / candle_range) * 100
+
+        change = t.get("todaysChangePerc")
+        if change is None:
+            change = ((price - prev_close) / prev_close) * 100 if prev_close > 0 else 0
+        change = change or 0
+
+        vol = day.get("v") or minute_data.get("v") or 0
+        prev_vol = prev.get("v") or 0
+        rvol = round(vol / prev_vol, 2) if prev_vol > 0 and vol > 0 else 1.0
+        rvol = min(rvol, 999.0)
+        prev_open = prev.get("o") or 0
+        vortag_chg = round(((prev_close - prev_open) / prev_open) * 100, 2) if prev_open > 0 else 0
+        close_pos = 0.5 if high == low else (close - low) / (high - low)
+
+        values = {"Change %": change, "Vortag %": vortag_chg, "Preis": price, "Close Position": close_pos,
+                  "Gap %": gap_pct, "Upper Wick %": upper_wick_pct, "Lower Wick %": lower_wick_pct}
+        match = True
+        if "RVOL" in f:
+            rvol_min, rvol_max = f["RVOL"]
+            if af.get("rvol_override_min"): rvol_min = af["rvol_override_min"]
+            if af.get("rvol_override_max"): rvol_max = af["rvol_override_max"]
+            if not (rvol_min <= rvol <= rvol_max): match = False
+        for column, value in values.items():
+            if column in f and not (f[column][0] <= value <= f[column][1]): match = False
+        if af.get("preis_min", 0) > 0 and price < af["preis_min"]: match = False
+        if af.get("preis_max", 100000) < 100000 and price > af["preis_max"]: match = False
+        if af.get("nur_gewinner") and change <= 0: match = False
+        if af.get("nur_verlierer") and change >= 0: match = False
+        if not match:
+            skipped_filter += 1
+            continue
+
+        results.append({
+            "Ticker": t.get("ticker", ""), "Name": "",
+            "Preis": round(price, 4), "Chg%": round(change, 2),
+            "RVOL": rvol, "Vortag%": vortag_chg,
+            "ClosePos": round(close_pos, 2),
+            "Alpha": round((rvol * 12) + (abs(vortag_chg) * 10) + (abs(change) * 8), 2),
+            "Gap%": round(gap_pct, 2),
+            "UpperWick%": round(upper_wick_pct, 1),
+            "LowerWick%": round(lower_wick_pct, 1),
+        })
+    return results, skipped_no_price, skipped_filter
+
+
+RANGE_STRATEGIES = [name for name, s in STRATEGIES.items() if "Insider" not in s["filters"]]
+ADDITIONAL = [
+    {},
+    DEFAULT_ADDITIONAL_FILTERS,
+    {"preis_min": 5, "preis_max": 100, "nur_gewinner": True},
+    {"nur_verlierer": True, "rvol_override_min": 0.5, "rvol_override_max": 3.0},
+]
+
+
+@pytest.mark.parametrize("strategy", RANGE_STRATEGIES)
+@pytest.mark.parametrize("additional", ADDITIONAL)
+def test_vectorized_matches_baseline(make_snapshot, strategy, additional):
+    tickers = make_snapshot(2000, seed=7)
+    filters = STRATEGIES[strategy]["filters"]
+    assert scan_stock_snapshot(tickers, filters, additional) == baseline_stock_scan(tickers, filters, additional)
+
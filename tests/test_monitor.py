@@ -0,0 +1,73 @@
+"""Watchlist-Monitor: erster Durchlauf setzt nur den Zustand, danach Kreuzungen und neue Treffer"""
+import pytest
+
+from alpha_core import monitor
+
+COIN = {"id": "abc-coin", "symbol": "abc", "name": "ABC", "current_price": 10.0, "last_updated": "t1",
+        "total_volume": 1e9, "market_cap": 1e9, "high_24h": 11.0, "low_24h": 9.0,
+        "price_change_percentage_24h": 1.0, "price_change_percentage_7d_in_currency": 1.0}
+ENTRIES = [{"market": "Krypto", "ticker": "ABC", "coin_id": "abc-coin"}]
+STRATEGIES = {"Krypto": {"Teuer": {"Preis": (10.2, 1000.0)}}, "Aktien": {}}
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Kurse + S/R ohne Netzwerk: Support 9.5, Widerstand 10.2 für jeden Coin"""
+    state = {"coins": [dict(COIN)], "sr_calls": []}
+    monkeypatch.setattr(monitor, "_seen", {})
+    monkeypatch.setattr(monitor, "fetch_raw", lambda entries, poly_key=None: ([], state["coins"] if entries else []))
+
+    def batch_sr_levels(rows, market_type, timeframe=None, poly_key=None, max_fetch=None):
+        state["sr_calls"].append([r["Ticker"] for r in rows])
+        return [(([9.5], [10.2]), {"period_high": 11.0}) for _ in rows]
+
+    monkeypatch.setattr(monitor, "batch_sr_levels", batch_sr_levels)
+    return state
+
+
+def update(feed, **changes):
+    feed["coins"] = [{**feed["coins"][0], **changes}]
+
+
+def test_first_cycle_only_sets_baseline(feed):
+    alerts, stats = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    assert alerts == []
+    assert stats["evaluated"] == 1
+
+
+def test_resistance_cross_and_strategy_entry(feed):
+    monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    update(feed, current_price=10.5, last_updated="t2")
+    alerts, _ = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+
+    kinds = sorted(a["type"] for a in alerts)
+    assert kinds == ["sr_cross", "strategy_entry"]
+    cross = next(a for a in alerts if a["type"] == "sr_cross")
+    assert (cross["level"], cross["level_kind"], cross["direction"]) == (10.2, "resistance", "up")
+
+
+def test_unchanged_quote_is_not_reevaluated(feed):
+    monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    alerts, stats = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    assert (alerts, stats["evaluated"]) == ([], 0)
+    assert len(feed["sr_calls"]) == 1
+
+
+def test_support_cross_down_without_repeat(feed):
+    monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    update(feed, current_price=9.4, last_updated="t2")
+    alerts, _ = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    assert [(a["level_kind"], a["direction"]) for a in alerts] == [("support", "down")]
+
+    # Bleibt der Kurs unter dem Support, kommt kein weiterer Alert
+    update(feed, current_price=9.3, last_updated="t3")
+    alerts, _ = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    assert alerts == []
+
+
+def test_removed_entry_starts_over(feed):
+    monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    monitor.evaluate([], strategies=STRATEGIES)
+    update(feed, current_price=10.5, last_updated="t2")
+    alerts, _ = monitor.evaluate(ENTRIES, strategies=STRATEGIES)
+    assert alerts == []
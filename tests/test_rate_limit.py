@@ -0,0 +1,50 @@
+"""TokenBucket: Aufrufe pro 60-s-Fenster bleiben innerhalb der Quote"""
+import bisect
+import types
+
+import pytest
+
+from alpha_core import rate_limit
+from alpha_core.rate_limit import COINGECKO_LIMITER, FINNHUB_LIMITER, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Simulierte Zeit: sleep springt vor statt zu warten"""
+    now = [1000.0]
+
+    def sleep(seconds):
+        # Echte Uhren laufen weiter; ohne Mindestschritt bleibt 1000.0 + 1e-14 == 1000.0 stehen
+        now[0] += max(seconds, 1e-6)
+
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=lambda: now[0], sleep=sleep))
+    return now
+
+
+def max_calls_in_window(stamps, seconds=60.0):
+    return max(bisect.bisect_left(stamps, t + seconds) - i for i, t in enumerate(stamps))
+
+
+@pytest.mark.parametrize("limiter, quota", [(FINNHUB_LIMITER, 60), (COINGECKO_LIMITER, 30)])
+def test_shared_limiters_fit_their_quota(limiter, quota):
+    assert limiter.window_limit() <= quota
+
+
+@pytest.mark.parametrize("rate, capacity", [(50, 10), (20, 10), (60, None)])
+def test_window_never_exceeds_capacity_plus_rate(clock, rate, capacity):
+    bucket = TokenBucket(rate_per_minute=rate, capacity=capacity)
+    stamps = []
+    for _ in range(5 * rate):
+        bucket.acquire()
+        stamps.append(clock[0])
+    # Voller Vorrat am Anfang: der Burst geht sofort durch, danach gleichmäßig im Takt
+    assert stamps[bucket.capacity - 1] == stamps[0]
+    assert max_calls_in_window(stamps) <= bucket.window_limit()
+
+
+def test_drain_throttles_all_callers(clock):
+    bucket = TokenBucket(rate_per_minute=60, capacity=10)
+    bucket.drain()
+    start = clock[0]
+    bucket.acquire()
+    assert clock[0] - start == pytest.approx(1.0)
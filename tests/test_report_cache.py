@@ -0,0 +1,76 @@
+"""Report-Cache: Verlauf liest nur passende Dateien, abgelaufene Chunks verschwinden"""
+import json
+import os
+
+import pytest
+
+from alpha_core import report_cache as rc
+
+
+@pytest.fixture
+def report_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc, "REPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(rc, "_memory", type(rc._memory)())
+    monkeypatch.setattr(rc, "_maintenance", {"at": 0.0, "migrated": False})
+    return tmp_path
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Zählt, welche Dateien geparst werden"""
+    opened = []
+    real_load = rc.json.load
+
+    def load(f):
+        opened.append(os.path.basename(f.name))
+        return real_load(f)
+
+    monkeypatch.setattr(rc.json, "load", load)
+    return opened
+
+
+def put(ticker, i, kind="report"):
+    fp = rc.fingerprint(kind, ticker, "Aktien", 100 + i)
+    rc.put_report(fp, f"{ticker} {i}", kind, ticker, "Aktien")
+    os.utime(rc._path(fp), (1_000_000 + i, 1_000_000 + i))
+    return fp
+
+
+def test_history_reads_only_files_of_the_ticker(report_dir, loads):
+    for i in range(40):
+        put("AAPL" if i % 10 == 0 else f"T{i}", i)
+    rc._memory.clear()
+
+    history = rc.report_history(ticker="AAPL", kind="report", limit=10)
+    assert [e["text"] for e in history] == ["AAPL 30", "AAPL 20", "AAPL 10", "AAPL 0"]
+    assert len(loads) == 4
+
+
+def test_memory_cache_is_bounded(report_dir, monkeypatch):
+    monkeypatch.setattr(rc, "MAX_MEMORY", 5)
+    for i in range(20):
+        put("AAPL", i)
+    assert len(rc._memory) == 5
+
+
+def test_expired_screen_chunks_are_pruned(report_dir):
+    old = put(None, 1, kind="screen")
+    report = put("AAPL", 2)
+    os.utime(rc._path(report), (1, 1))  # Reports bleiben im Verlauf, egal wie alt
+    rc._maintenance["at"] = 0.0  # PRUNE_INTERVAL seit dem letzten Aufräumen vorbei
+    put(None, 3, kind="screen")  # Schreiben löst das Aufräumen aus
+    assert not os.path.exists(rc._path(old))
+    assert os.path.exists(rc._path(report))
+
+
+def test_legacy_files_are_renamed_and_still_hit(report_dir):
+    fp = rc.fingerprint("report", "AAPL", "Aktien", 100)
+    legacy = fp.split(".")[-1]
+    entry = {"fingerprint": legacy, "kind": "report", "ticker": "AAPL", "market": "Aktien",
+             "created": 1.0, "text": "alt"}
+    with open(os.path.join(report_dir, f"{legacy}.json"), "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+    assert [e["text"] for e in rc.report_history(ticker="AAPL")] == ["alt"]
+    assert os.path.exists(rc._path(fp))
+    assert rc._load(fp)["text"] == "alt"
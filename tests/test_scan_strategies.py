@@ -0,0 +1,14 @@
+"""Ein Durchlauf für alle Strategien liefert dasselbe wie die Einzel-Scans"""
+from alpha_core.metrics import scan_stock_snapshot, scan_stock_strategies
+from alpha_core.strategies import DEFAULT_ADDITIONAL_FILTERS, STRATEGIES
+
+RANGE_STRATEGIES = [name for name, s in STRATEGIES.items() if "Insider" not in s["filters"]]
+
+
+def test_all_strategies_pass_matches_single_scans(make_snapshot):
+    tickers = make_snapshot(1000, seed=3)
+    strategies = {name: STRATEGIES[name]["filters"] for name in RANGE_STRATEGIES}
+    per_strategy, matrix = scan_stock_strategies(tickers, strategies, DEFAULT_ADDITIONAL_FILTERS)
+    for name, filters in strategies.items():
+        assert per_strategy[name] == scan_stock_snapshot(tickers, filters, DEFAULT_ADDITIONAL_FILTERS)
+    assert set(matrix["Ticker"]) == {r["Ticker"] for res in per_strategy.values() for r in res[0]}
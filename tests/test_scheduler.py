@@ -0,0 +1,34 @@
+"""Taktgeber: Jobs laufen in Daemon-Threads und nie doppelt"""
+import threading
+
+import pytest
+
+from alpha_core import scheduler
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    release = threading.Event()
+    threads = []
+
+    def job():
+        threads.append(threading.current_thread())
+        release.wait(5)
+
+    monkeypatch.setattr(scheduler, "_due", {})
+    monkeypatch.setattr(scheduler, "_errors", {})
+    monkeypatch.setattr(scheduler, "_running", set())
+    monkeypatch.setattr(scheduler, "_jobs", lambda: [("Langsam", 60, job)])
+    yield threads
+    release.set()
+
+
+def test_jobs_run_in_daemon_threads_without_duplicates(jobs):
+    assert scheduler._start_due_jobs() == ["Langsam"]
+    # Läuft noch: kein zweiter Start
+    assert scheduler._start_due_jobs() == []
+    for _ in range(500):
+        if jobs:
+            break
+        threading.Event().wait(0.01)
+    assert [t.daemon for t in jobs] == [True]
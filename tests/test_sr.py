@@ -0,0 +1,57 @@
+"""S/R: inkrementelles update_sr_state liefert dasselbe wie ein Neuaufbau"""
+import random
+
+import numpy as np
+import pytest
+
+from alpha_core.sr import build_sr_state, sr_levels_from_state, update_sr_state
+
+STEP = 4 * 60 * 60 * 1000
+
+
+def candles(n, seed=1, start=1_700_000_000_000):
+    rnd = random.Random(seed)
+    close, out = 100.0, []
+    for i in range(n):
+        o = close
+        close = max(1.0, close * (1 + rnd.gauss(0, 0.02)))
+        out.append([start + i * STEP, o, max(o, close) * (1 + rnd.random() * 0.01),
+                    min(o, close) * (1 - rnd.random() * 0.01), close])
+    return out
+
+
+def assert_same_state(incremental, full):
+    np.testing.assert_array_equal(incremental["swing_high"], full["swing_high"])
+    np.testing.assert_array_equal(incremental["swing_low"], full["swing_low"])
+    assert incremental["zone_counts"] == full["zone_counts"]
+    price = full["closes"][-1]
+    assert sr_levels_from_state(incremental, price) == sr_levels_from_state(full, price)
+
+
+@pytest.mark.parametrize("dropped, added", [(0, 1), (1, 1), (5, 5), (0, 20), (30, 12)])
+def test_incremental_update_matches_rebuild(dropped, added):
+    series = candles(200 + added, seed=dropped + added)
+    old = series[:200]
+    new = [list(c) for c in series[dropped:]]
+    # Laufende Kerze hat sich seit dem letzten Abruf verändert
+    new[200 - dropped - 1][2] *= 1.03
+    new[200 - dropped - 1][4] *= 1.01
+
+    state = update_sr_state(build_sr_state(old), new)
+    assert state is not None
+    assert_same_state(state, build_sr_state(new))
+
+
+def test_unchanged_data_keeps_state():
+    series = candles(150)
+    state = update_sr_state(build_sr_state(series), series)
+    assert_same_state(state, build_sr_state(series))
+
+
+def test_non_contiguous_data_needs_rebuild():
+    state = build_sr_state(candles(150))
+    assert update_sr_state(state, candles(150, start=1_600_000_000_000)) is None
+    assert update_sr_state(state, []) is None
+    shifted = candles(150)
+    shifted[10][4] *= 1.5  # Ältere Kerze rückwirkend geändert
+    assert update_sr_state(state, shifted) is None
@@ -0,0 +1,50 @@
+"""Batch-S/R: Abruf-Deckel bei Krypto, keine ±x%-Fallback-Levels als echte Abstände"""
+import pytest
+
+from alpha_core import sr
+
+
+def candles(n, step=4 * 60 * 60 * 1000):
+    """Zickzack-Kurs mit Swings"""
+    out = []
+    for i in range(n):
+        c = 100 + 10 * ((i % 20) - 10 if (i // 20) % 2 else 10 - (i % 20))
+        out.append([1_700_000_000_000 + i * step, c - 1, c + 2, c - 2, c])
+    return out
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """Krypto-Verlauf ohne Netzwerk: coin_id -> Kerzen (fehlt -> leer wie ein gescheiterter Abruf)"""
+    data, calls = {}, []
+
+    def fetch(coin_id, days, local_only=False):
+        calls.append((coin_id, local_only))
+        return data.get(coin_id)
+
+    monkeypatch.setattr(sr, "fetch_historical_data_crypto", fetch)
+    monkeypatch.setattr(sr, "_states", type(sr._states)())
+    return data, calls
+
+
+def rows(n):
+    return [{"Ticker": "SYM", "CoinID": f"c{i}", "Preis": 100.0} for i in range(n)]
+
+
+def test_failed_or_empty_history_gives_no_levels(history):
+    data, _ = history
+    data["c0"] = candles(120)
+    data["c1"] = []
+    levels = sr.batch_sr_levels(rows(3), "Krypto", max_fetch=3)
+
+    assert levels[0][1]  # Echter Verlauf -> Fibonacci-Info
+    assert levels[1] == (([], []), {})
+    assert levels[2] == (([], []), {})
+    enriched = sr.with_sr_distances(rows(3), levels)
+    assert [(r["S-Dist%"], r["R-Dist%"]) for r in enriched[1:]] == [(None, None), (None, None)]
+
+
+def test_fetches_are_capped_and_keyed_by_coin_id(history):
+    _, calls = history
+    sr.batch_sr_levels(rows(6), "Krypto", max_fetch=2)
+    assert sorted(calls) == [(f"c{i}", i >= 2) for i in range(6)]
@@ -0,0 +1,76 @@
+"""WebSocket-Stream: aktiv nur verbunden und mit frischen Events, Neustart aus REST nach Abbruch"""
+import json
+import threading
+import time
+
+import pytest
+
+from alpha_core import stream
+
+HANDSHAKE = [[{"ev": "status", "status": "connected"}], [{"ev": "status", "status": "auth_success"}]]
+
+
+class FakeSocket:
+    """Handshake, dann ein A-Event - danach bricht die Verbindung ab"""
+
+    def __init__(self):
+        self.messages = [json.dumps(m) for m in HANDSHAKE]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def recv(self):
+        return self.messages.pop(0)
+
+    def send(self, text):
+        pass
+
+    def __iter__(self):
+        now = int(time.time() * 1000)
+        yield json.dumps([{"ev": "A", "sym": "AAA", "c": 11.0, "s": now, "e": now}])
+        raise ConnectionError("Verbindung weg")
+
+
+@pytest.fixture
+def fresh_stream(monkeypatch):
+    monkeypatch.setattr(stream, "_book", {})
+    monkeypatch.setattr(stream, "_status", {"connected": False, "url": None, "events": 0, "last_event": None,
+                                            "error": None})
+    monkeypatch.setattr(stream, "_stop", threading.Event())
+    monkeypatch.setattr(stream, "_thread", threading.current_thread())
+
+
+def test_active_needs_connection_and_recent_event(fresh_stream):
+    stream.seed_book([{"ticker": "AAA", "day": {"c": 10.0}, "prevDay": {"c": 10.0}}])
+    stream.apply_aggregate({"sym": "AAA", "c": 10.5, "s": 1, "e": 1})
+    assert not stream.stream_active()  # Events da, aber nicht verbunden
+
+    stream._status["connected"] = True
+    assert stream.stream_active()
+
+    stream._status["last_event"] = time.time() - stream.STALE_AFTER - 1
+    assert not stream.stream_active()
+
+
+def test_reconnect_reseeds_book_and_reports_disconnected(fresh_stream, monkeypatch):
+    seeds, sockets = [], []
+
+    def seed():
+        seeds.append(len(seeds))
+        return [{"ticker": "AAA", "day": {"c": 10.0}, "prevDay": {"c": 10.0}}]
+
+    def connect(url, **kwargs):
+        if len(sockets) == 2:
+            stream._stop.set()
+        sockets.append(FakeSocket())
+        return sockets[-1]
+
+    waits = []
+    monkeypatch.setattr(stream._stop, "wait", lambda delay: waits.append(stream._status["connected"]))
+    stream._run_forever(connect, "ws://test", "key", seed)
+
+    assert len(seeds) == len(sockets) == 3
+    assert waits and not any(waits)  # Während des Wartens auf den Reconnect nie "verbunden"
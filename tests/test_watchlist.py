@@ -0,0 +1,58 @@
+"""Watchlist: Krypto per CoinGecko-ID, Migration alter Datenbanken"""
+import sqlite3
+
+import pytest
+
+from alpha_core import watchlist
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / "watchlist.sqlite")
+    monkeypatch.setattr(watchlist, "WATCHLIST_DB", path)
+    monkeypatch.setattr(watchlist, "_schema_ready", set())
+    return path
+
+
+def test_coins_with_same_symbol_are_separate(db):
+    assert watchlist.add_to_watchlist("UNI", "Krypto", {"CoinID": "uniswap", "Preis": 7.0})
+    assert watchlist.add_to_watchlist("UNI", "Krypto", {"CoinID": "universe-token", "Preis": 0.1})
+    assert not watchlist.add_to_watchlist("UNI", "Krypto", {"CoinID": "uniswap", "Preis": 8.0})
+    assert watchlist.add_to_watchlist("UNI", "Aktien", {"Preis": 50.0})
+    assert [(e["market"], e["coin_id"], e["price"]) for e in watchlist.load_watchlist()] == [
+        ("Krypto", "uniswap", 7.0), ("Krypto", "universe-token", 0.1), ("Aktien", None, 50.0)]
+
+    watchlist.remove_from_watchlist("UNI", "Krypto", "universe-token")
+    assert [watchlist.entry_key(e) for e in watchlist.load_watchlist()] == [("Krypto", "uniswap"), ("Aktien", "UNI")]
+
+
+def test_quotes_are_keyed_per_coin(db):
+    entries = [{"market": "Krypto", "ticker": "UNI", "coin_id": "uniswap", "price": 5.0, "added": ""},
+               {"market": "Krypto", "ticker": "UNI", "coin_id": "universe-token", "price": 0.2, "added": ""}]
+    quotes = {("Krypto", "uniswap"): {"price": 6.0, "change_pct": 1.0},
+              ("Krypto", "universe-token"): {"price": 0.1, "change_pct": -1.0}}
+    assert [r["P&L%"] for r in watchlist.with_pnl(entries, quotes)] == [20.0, -50.0]
+
+
+def test_legacy_table_is_migrated(db):
+    conn = sqlite3.connect(db)
+    conn.execute("""CREATE TABLE watchlist (market TEXT NOT NULL, ticker TEXT NOT NULL, coin_id TEXT,
+                    price REAL, added TEXT, data TEXT, PRIMARY KEY (market, ticker))""")
+    conn.executemany("INSERT INTO watchlist VALUES (?, ?, ?, ?, ?, ?)", [
+        ("Aktien", "AAPL", None, 190.0, "2024-01-01 10:00", "{}"),
+        ("Krypto", "UNI", "uniswap", 7.0, "2024-01-02 10:00", "{}"),
+        ("Krypto", "OLD", None, 1.0, "2024-01-03 10:00", "{}"),
+    ])
+    conn.commit()
+    conn.close()
+
+    assert [watchlist.entry_key(e) for e in watchlist.load_watchlist()] == [
+        ("Aktien", "AAPL"), ("Krypto", "uniswap"), ("Krypto", "OLD")]
+    # Der zweite UNI-Coin passt jetzt neben den migrierten
+    assert watchlist.add_to_watchlist("UNI", "Krypto", {"CoinID": "universe-token"})
+
+    # Nachgeschlagene ID schlüsselt den alten Eintrag um
+    watchlist._set_coin_id("OLD", "old-coin")
+    assert watchlist.entry_key(watchlist.load_watchlist()[2]) == ("Krypto", "old-coin")
+    watchlist.remove_from_watchlist("OLD", "Krypto", "old-coin")
+    assert len(watchlist.load_watchlist()) == 3